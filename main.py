@@ -22,6 +22,7 @@ def main():
         from src.core.file_monitor import FileMonitor
         from src.core.download_manager import DownloadManager
         from src.core.queue_manager import QueueManager
+        from src.core.file_handler import FileHandler
         # ===== IMPORT UPLOAD MODULES =====
         from src.core.upload_queue_manager import UploadQueueManager
         from src.core.upload_manager import UploadManager
@@ -54,13 +55,17 @@ def main():
         # ===== INISIALISASI QUEUE MANAGER =====
         queue_mgr = QueueManager()  # Untuk download
 
+        # File handler bersama (ukuran buffer IO dari config)
+        file_handler = FileHandler(chunk_size=config.io_buffer_size)
+
         # ===== INISIALISASI UPLOAD COMPONENTS =====
         upload_queue_mgr = UploadQueueManager()  # Queue untuk upload
         upload_mgr = UploadManager(
             max_workers_51=config.max_upload_51,
             max_workers_40=config.max_upload_40,
             queue_manager=upload_queue_mgr,
-            state_manager=state_mgr
+            state_manager=state_mgr,
+            file_handler=file_handler
         )
         upload_controller = UploadController(
             upload_manager=upload_mgr,
@@ -75,7 +80,9 @@ def main():
             max_parallel=config.max_download,
             max_retry=config.max_retry,
             queue_manager=queue_mgr,
-            state_manager=state_mgr
+            state_manager=state_mgr,
+            file_handler=file_handler,
+            config=config
         )
 
         # Inisialisasi file monitor (SMB)
@@ -6,8 +6,23 @@ Konstanta dan default settings untuk aplikasi
 # Default settings
 DEFAULT_MAX_DOWNLOAD = 4
 DEFAULT_MAX_RETRY = 3
-DEFAULT_CHUNK_SIZE = 256 * 1024 * 1024  # 8MB
-CHECKPOINT_PERCENT = 10  # Resume setiap 10%
+IO_BUFFER_SIZE = 1 << 20  # 1MB per syscall read/write
+CHECKPOINT_INTERVAL_BYTES = 64 << 20  # Checkpoint resume setiap 64MB
+PROGRESS_MIN_INTERVAL = 0.2  # Jeda minimal antar progress callback (detik)
+PROGRESS_SAMPLE_BYTES = 4 << 20  # Jam untuk throttle progress dibaca paling sering setiap 4MB
+STATE_SAVE_MIN_INTERVAL = 2.0  # Jeda minimal antar penulisan state file (detik)
+STATE_SAVE_CLOSE_TIMEOUT = 2.0  # Maksimal menunggu penulisan state saat aplikasi ditutup (detik)
+HISTORY_BATCH_MAX = 100  # Maksimal event history per satu kali tulis
+HISTORY_BATCH_WINDOW = 0.5  # Jendela pengumpulan event history (detik)
+UNBUFFERED_IO_THRESHOLD = 64 << 20  # File > 64MB di-copy tanpa cache (Windows)
+SMALL_FILE_THRESHOLD = 16 << 20  # File < 16MB di-copy sekali jalan tanpa progress per chunk
+CHUNKED_COPY_THRESHOLD = 2 << 30  # File >= 2GB di-copy dengan beberapa stream paralel
+CHUNKED_COPY_STREAMS = 4  # Jumlah stream (fd terpisah) per file
+DEFAULT_CHUNK_SIZE = IO_BUFFER_SIZE
+MIN_CHUNK_SIZE = 64 << 10  # Buffer terkecil untuk file kecil (64KB)
+MAX_CHUNK_SIZE = 16 << 20  # Buffer terbesar untuk file sangat besar (16MB)
+CHUNK_SIZE_DIVISOR = 512  # Ukuran buffer adaptif = ukuran file / 512 (dibatasi MIN..MAX)
+CHECKPOINT_PERCENT = 10  # Log progress setiap 10%
 
 # ===== KONSTANTA UNTUK UPLOAD =====
 DEFAULT_MAX_UPLOAD_51 = 2
@@ -39,7 +54,12 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 CONFIG_FILE = "config.json"
 STATE_FILE = "pipeline_state.json"
 HISTORY_FILE = "copy_history.txt"
+HISTORY_MAX_ENTRIES = 10000  # Entry history maksimal yang disimpan di memory oleh GUI
+HISTORY_DISPLAY_ROWS = 100  # Baris history maksimal di tabel GUI
+HISTORY_PARSE_POLL_MS = 50  # Interval cek hasil parse history dari thread parser (ms)
 LOG_FILE = "pipeline.log"
+LOG_READ_POLL_MS = 50  # Interval cek isi awal log dari thread pembaca (ms)
+LOG_REDRAW_DELAY_MS = 50  # Interval redraw log selama log baru terus masuk (ms)
 DATA_FOLDER = "data"  # <-- FOLDER DATA
 
 # SMB settings
@@ -47,4 +67,6 @@ SMB_POLLING_INTERVAL = 5  # detik, untuk fallback
 SMB_CHANGE_TIMEOUT = 30   # detik
 
 # UI settings
-REFRESH_INTERVAL = 1000  # ms (1 detik) untuk refresh GUI
\ No newline at end of file
+REFRESH_INTERVAL = 1000  # ms (1 detik) untuk refresh GUI
+REFRESH_INTERVAL_HIDDEN = 3000  # ms, refresh panel yang tidak terlihat (tab lain / window di-minimize)
+PROGRESS_FULL_REFRESH_MS = 5000  # ms, refresh speed/ETA job aktif walau tidak ada event progress
\ No newline at end of file
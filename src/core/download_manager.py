@@ -4,6 +4,7 @@ Manager untuk mengatur download workers
 """
 
 import threading
+import queue
 import time
 import logging
 from typing import List, Optional, Dict
@@ -13,10 +14,34 @@ from ..core.file_handler import FileHandler
 from ..core.queue_manager import QueueManager
 from ..utils.state_manager import StateManager
 from ..utils.history import HistoryLogger
-from ..constants.settings import DEFAULT_MAX_DOWNLOAD, DEFAULT_MAX_RETRY
+from ..utils.config_manager import ConfigManager
+from ..models.settings import Settings
+from ..constants.settings import (
+    DEFAULT_MAX_DOWNLOAD, DEFAULT_MAX_RETRY,
+    CHECKPOINT_INTERVAL_BYTES, STATE_SAVE_MIN_INTERVAL,
+    HISTORY_BATCH_MAX, HISTORY_BATCH_WINDOW
+)
 
 logger = logging.getLogger(__name__)
 
+class WorkerStatus:
+    """
+    Status satu worker, satu instance per worker dan diubah di tempat (tanpa alokasi per tick)
+    """
+    __slots__ = ('busy', 'current_job', 'progress', 'speed', 'eta', 'start_time')
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Kembalikan ke status idle"""
+        self.busy = False
+        self.current_job = None
+        self.progress = 0.0
+        self.speed = 0.0
+        self.eta = "-"
+        self.start_time = None
+
 class DownloadManager:
     """
     Kelas untuk mengelola download workers
@@ -58,7 +83,8 @@ class DownloadManager:
                  queue_manager: Optional[QueueManager] = None,
                  file_handler: Optional[FileHandler] = None,
                  state_manager: Optional[StateManager] = None,
-                 history_logger: Optional[HistoryLogger] = None):
+                 history_logger: Optional[HistoryLogger] = None,
+                 config: Optional[Settings] = None):
         """
         Inisialisasi DownloadManager
         
@@ -69,6 +95,7 @@ class DownloadManager:
             file_handler: FileHandler instance
             state_manager: StateManager instance
             history_logger: HistoryLogger instance
+            config: Settings yang sudah di-load (dipakai bersama oleh semua worker)
         """
         self.max_parallel = max_parallel
         self.max_retry = max_retry
@@ -78,15 +105,26 @@ class DownloadManager:
         self.file_handler = file_handler or FileHandler()
         self.state_manager = state_manager or StateManager()
         self.history_logger = history_logger or HistoryLogger()
+        self.config = config if config is not None else ConfigManager().load()
         
         # Workers
         self.workers: List[DownloadWorker] = []
-        self.worker_status: Dict[int, dict] = {}
+        self.worker_status: Dict[int, WorkerStatus] = {}
+        self._job_to_worker: Dict[str, int] = {}  # job_id -> worker_id
         
         # Control
         self.running = False
         self.lock = threading.Lock()
         
+        # Naik setiap kali status worker berubah (GUI melewati get_stats jika tidak berubah)
+        self._stats_version = 0
+        
+        # Writer: satu thread menulis history (batch) dan state (snapshot terbaru) ke disk
+        self._last_saved_bytes: Dict[str, int] = {}  # job_id -> copied_bytes saat state terakhir disimpan
+        self._events: queue.Queue = queue.Queue()
+        self._pending_snapshot: Optional[dict] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        
         # Callbacks
         self.progress_callbacks = []
         
@@ -99,10 +137,17 @@ class DownloadManager:
             return
         
         self.running = True
+        self._stats_version += 1
         
         # Load state untuk resume
         self._load_resume_state()
         
+        # Start writer history/state
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="StateWriter", daemon=True
+        )
+        self._writer_thread.start()
+        
         # Start workers
         for i in range(self.max_parallel):
             worker = DownloadWorker(
@@ -117,11 +162,7 @@ class DownloadManager:
             self.workers.append(worker)
             
             # Status awal
-            self.worker_status[i + 1] = {
-                'busy': False,
-                'current_job': None,
-                'start_time': None
-            }
+            self.worker_status[i + 1] = WorkerStatus()
         
         logger.info(f"Started {len(self.workers)} download workers")
     
@@ -129,17 +170,28 @@ class DownloadManager:
         """Stop semua workers"""
         logger.info("Stopping all workers...")
         self.running = False
+        self._stats_version += 1
         
-        for worker in self.workers:
+        workers = self.workers
+        for worker in workers:
             worker.stop()
         
+        # Bangunkan worker yang sedang menunggu job
+        self.queue_manager.wake_workers(len(workers))
+        
         # Tunggu workers selesai
-        for worker in self.workers:
+        for worker in workers:
             worker.join(timeout=5)
         
-        # Save state terakhir
+        # Save state terakhir, lalu tunggu writer menulis semua event yang tersisa
         self._save_state()
         
+        writer = self._writer_thread
+        if writer and writer.is_alive():
+            self._events.put(('stop', None))
+            writer.join(timeout=5)
+        self._writer_thread = None
+        
         logger.info("All workers stopped")
     
     def _load_resume_state(self):
@@ -167,13 +219,152 @@ class DownloadManager:
             logger.error(f"Error loading resume state: {e}")
     
     def _save_state(self):
-        """Save state semua jobs"""
+        """Ambil snapshot state semua jobs dan serahkan ke writer"""
         try:
             jobs = self.queue_manager.get_all_jobs()
-            self.state_manager.save(jobs)
-            # logger.debug("State saved")
+            snapshot = self.state_manager.build_snapshot(jobs)
         except Exception as e:
             logger.error(f"Error saving state: {e}")
+            return
+        
+        if not self._writer_running():
+            # Writer belum jalan (atau sudah berhenti), tulis langsung
+            self.state_manager.write_snapshot(snapshot)
+            return
+        
+        # Hanya snapshot terbaru yang disimpan, yang lama sudah tercakup
+        with self.lock:
+            previous = self._pending_snapshot
+            self._pending_snapshot = snapshot
+        if previous is None:
+            self._events.put(('state', None))
+    
+    def record_success(self, job: FileJob, filename: str, duration_seconds: float):
+        """
+        Catat download sukses ke history dan state (ditulis batch oleh writer)
+        
+        Args:
+            job: FileJob object
+            filename: Nama file sebenarnya di tujuan (mungkin sudah di-rename)
+            duration_seconds: Durasi copy
+        """
+        line = self.history_logger.format_success(
+            filename=filename,
+            size_bytes=job.size_bytes,
+            duration_seconds=duration_seconds,
+            retry_count=job.retry_count,
+            destination="70",
+            checksum=job.checksum,
+            hash_algo=job.hash_algo
+        )
+        self._post_history(line)
+        self._save_state()
+    
+    def record_failure(self, job: FileJob, error_msg: str):
+        """
+        Catat download gagal ke history (ditulis batch oleh writer)
+        
+        Args:
+            job: FileJob object
+            error_msg: Pesan error
+        """
+        line = self.history_logger.format_failed(
+            filename=job.name,
+            size_bytes=job.size_bytes,
+            error_msg=error_msg,
+            retry_count=job.retry_count + 1
+        )
+        self._post_history(line)
+    
+    def _post_history(self, line: str):
+        """Kirim satu entry history ke writer (atau tulis langsung jika writer tidak jalan)"""
+        if self._writer_running():
+            self._events.put(('history', line))
+        else:
+            self.history_logger.write_lines([line])
+    
+    def _writer_running(self) -> bool:
+        writer = self._writer_thread
+        return writer is not None and writer.is_alive()
+    
+    def _writer_loop(self):
+        """
+        Thread penulis: kumpulkan event maks. HISTORY_BATCH_MAX / HISTORY_BATCH_WINDOW detik,
+        lalu satu kali append history dan satu kali os.replace state
+        """
+        last_state_write = 0.0
+        running = True
+        
+        while running:
+            # Jika ada snapshot tertunda, bangun saat jeda minimal state habis
+            timeout = None
+            if self._pending_snapshot is not None:
+                timeout = max(0.0, last_state_write + STATE_SAVE_MIN_INTERVAL - time.monotonic())
+            
+            batch = []
+            try:
+                batch.append(self._events.get(timeout=timeout))
+                deadline = time.monotonic() + HISTORY_BATCH_WINDOW
+                while len(batch) < HISTORY_BATCH_MAX:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._events.get(timeout=remaining))
+            except queue.Empty:
+                pass
+            
+            lines = []
+            for kind, payload in batch:
+                if kind == 'history':
+                    lines.append(payload)
+                elif kind == 'stop':
+                    running = False
+            
+            if lines:
+                self.history_logger.write_lines(lines)
+            
+            # State ditulis maks. sekali per STATE_SAVE_MIN_INTERVAL (selalu saat stop)
+            if not running or time.monotonic() - last_state_write >= STATE_SAVE_MIN_INTERVAL:
+                with self.lock:
+                    snapshot, self._pending_snapshot = self._pending_snapshot, None
+                if snapshot is not None:
+                    self.state_manager.write_snapshot(snapshot)
+                    last_state_write = time.monotonic()
+        
+        logger.debug("State writer stopped")
+    
+    def _register_active(self, worker_id: int, job: FileJob):
+        """
+        Catat job yang sedang dikerjakan worker (dipanggil saat worker mengambil job)
+        
+        Args:
+            worker_id: ID worker
+            job: FileJob object
+        """
+        with self.lock:
+            self._job_to_worker[job.job_id] = worker_id
+            status = self.worker_status.get(worker_id)
+            if status is None:
+                status = self.worker_status[worker_id] = WorkerStatus()
+            status.busy = True
+            status.current_job = job
+            status.start_time = time.time()
+            self._stats_version += 1
+    
+    def _unregister_active(self, job: FileJob):
+        """
+        Hapus job dari daftar aktif (dipanggil saat job selesai/gagal)
+        
+        Args:
+            job: FileJob object
+        """
+        with self.lock:
+            worker_id = self._job_to_worker.pop(job.job_id, None)
+            self._last_saved_bytes.pop(job.job_id, None)
+            status = self.worker_status.get(worker_id) if worker_id is not None else None
+            if status is not None:
+                status.reset()
+            self._stats_version += 1
     
     def update_progress(self, job: FileJob):
         """
@@ -182,23 +373,20 @@ class DownloadManager:
         Args:
             job: FileJob object
         """
-        # Update worker status
-        for worker in self.workers:
-            if worker.get_current_job() == job:
-                self.worker_status[worker.worker_id] = {
-                    'busy': True,
-                    'current_job': job,
-                    'progress': job.progress,
-                    'speed': job.speed_mbps,
-                    'eta': job.eta_formatted
-                }
-                break
+        # Update worker status (lookup langsung, tanpa scan semua worker)
+        worker_id = self._job_to_worker.get(job.job_id)
+        if worker_id is not None:
+            status = self.worker_status[worker_id]
+            status.progress = job.progress
+            status.speed = job.speed_mbps
+            status.eta = job.eta_formatted
         
         # Notifikasi callbacks
         self._notify_progress(job)
         
-        # Save state setiap update (bisa di-throttle kalau perlu)
-        if int(job.progress) % 10 == 0:  # Setiap 10%
+        # Save state hanya setelah CHECKPOINT_INTERVAL_BYTES baru ter-copy
+        if job.copied_bytes - self._last_saved_bytes.get(job.job_id, 0) >= CHECKPOINT_INTERVAL_BYTES:
+            self._last_saved_bytes[job.job_id] = job.copied_bytes
             self._save_state()
     
     def _notify_progress(self, job: FileJob):
@@ -215,32 +403,34 @@ class DownloadManager:
     
     def get_stats(self) -> dict:
         """Dapatkan statistik download"""
-        with self.lock:
-            queue_stats = self.queue_manager.get_stats()
-            
-            # Hitung worker stats
-            busy_workers = sum(1 for w in self.workers if w.is_busy())
-            total_speed = 0
-            for worker in self.workers:
-                job = worker.get_current_job()
-                if job:
-                    total_speed += job.speed_mbps
-            
-            return {
-                'queue': queue_stats,
-                'workers': {
-                    'total': len(self.workers),
-                    'busy': busy_workers,
-                    'idle': len(self.workers) - busy_workers,
-                    'total_speed_mbps': total_speed
-                },
-                'max_parallel': self.max_parallel,
-                'running': self.running
-            }
+        queue_stats = self.queue_manager.get_stats()
+        
+        # Ambil referensi list sekali; list tidak pernah diubah di tempat (lihat set_max_parallel)
+        workers = self.workers
+        
+        # Hitung worker stats
+        busy_workers = sum(1 for w in workers if w.is_busy())
+        total_speed = 0
+        for worker in workers:
+            job = worker.get_current_job()
+            if job:
+                total_speed += job.speed_mbps
+        
+        return {
+            'queue': queue_stats,
+            'workers': {
+                'total': len(workers),
+                'busy': busy_workers,
+                'idle': len(workers) - busy_workers,
+                'total_speed_mbps': total_speed
+            },
+            'max_parallel': self.max_parallel,
+            'running': self.running
+        }
     
     def get_active_downloads(self) -> List[FileJob]:
         active = []
-        for worker in self.workers:
+        for worker in self.workers:  # referensi list diambil sekali
             job = worker.get_current_job()
             if job:
                 active.append(job)
@@ -255,37 +445,51 @@ class DownloadManager:
         Args:
             new_max: Jumlah worker baru
         """
-        if new_max == self.max_parallel:
-            return
-        
-        if new_max > self.max_parallel:
-            # Tambah worker
-            for i in range(self.max_parallel, new_max):
-                worker = DownloadWorker(
-                    worker_id=i + 1,
-                    queue_manager=self.queue_manager,
-                    download_manager=self
-                )
-                worker.start()
-                self.workers.append(worker)
-                
-            logger.info(f"Added {new_max - self.max_parallel} workers")
+        with self.lock:
+            if new_max == self.max_parallel:
+                return
             
-        else:
-            # Kurangi worker (stop yang idle)
+            # Copy-on-write: ubah salinan lokal, lalu tukar referensi sekali.
+            # Pembaca (get_stats, get_active_downloads) tidak perlu lock.
+            new_workers = list(self.workers)
             to_stop = []
-            for worker in self.workers[new_max:]:
-                if not worker.is_busy():
-                    worker.stop()
-                    to_stop.append(worker)
             
-            # Hapus dari list
-            for worker in to_stop:
-                self.workers.remove(worker)
+            if new_max > self.max_parallel:
+                # Tambah worker
+                for i in range(self.max_parallel, new_max):
+                    worker = DownloadWorker(
+                        worker_id=i + 1,
+                        queue_manager=self.queue_manager,
+                        download_manager=self,
+                        file_handler=self.file_handler,
+                        state_manager=self.state_manager,
+                        history_logger=self.history_logger
+                    )
+                    worker.start()
+                    new_workers.append(worker)
+                
+                logger.info(f"Added {new_max - self.max_parallel} workers")
+                
+            else:
+                # Kurangi worker (stop yang idle)
+                for worker in new_workers[new_max:]:
+                    if not worker.is_busy():
+                        worker.stop()
+                        to_stop.append(worker)
+                
+                stopped = set(to_stop)
+                new_workers = [w for w in new_workers if w not in stopped]
+                
+                logger.info(f"Removed {len(to_stop)} idle workers")
             
-            logger.info(f"Removed {len(to_stop)} idle workers")
+            self.workers = new_workers
+            self.max_parallel = new_max
+            self._stats_version += 1
+        
+        # Bangunkan worker yang di-stop (di luar lock)
+        if to_stop:
+            self.queue_manager.wake_workers(len(to_stop))
         
-        self.max_parallel = new_max
         logger.info(f"Max parallel changed to {new_max}")
 
 
@@ -7,12 +7,12 @@ import threading
 import time
 import logging
 import os
+import stat
 from typing import Optional
 from ..models.file_job import FileJob
 from ..core.file_handler import FileHandler
 from ..utils.state_manager import StateManager
 from ..utils.history import HistoryLogger
-from ..utils.config_manager import ConfigManager
 from ..constants.settings import STATUS_DOWNLOADING, STATUS_COMPLETED, STATUS_FAILED
 
 logger = logging.getLogger(__name__)
@@ -44,11 +44,15 @@ class DownloadWorker(threading.Thread):
         self.file_handler = file_handler or FileHandler()
         self.state_manager = state_manager or StateManager()
         self.history_logger = history_logger or HistoryLogger()
-        self.config_manager = ConfigManager()
         
         self.daemon = True
         self.running = True
         self.current_job: Optional[FileJob] = None
+        self.current_job_id: Optional[str] = None
+        
+        # Buffer IO milik worker, dipakai ulang untuk semua file (tanpa alokasi per chunk)
+        self._io_buf = bytearray(self.file_handler.chunk_size)
+        self._io_mv = memoryview(self._io_buf)
         
         logger.info(f"DownloadWorker-{worker_id} initialized")
     
@@ -58,16 +62,21 @@ class DownloadWorker(threading.Thread):
         
         while self.running:
             try:
-                # Ambil job berikutnya dari queue
+                # Ambil job berikutnya dari queue (blocking sampai ada job / dibangunkan saat stop)
                 job = self.queue_manager.get_next_job()
                 
                 if job:
                     self.current_job = job
-                    self._process_job(job)
-                    self.current_job = None
-                else:
-                    # Tidak ada job, sleep sebentar
-                    time.sleep(1)
+                    self.current_job_id = job.job_id
+                    self.download_manager._register_active(self.worker_id, job)
+                    try:
+                        self._process_job(job)
+                    finally:
+                        # current_job dikosongkan sebelum _stats_version dinaikkan, supaya GUI yang
+                        # melihat versi baru tidak lagi menemukan job ini di get_active_downloads()
+                        self.current_job = None
+                        self.current_job_id = None
+                        self.download_manager._unregister_active(job)
                     
             except Exception as e:
                 logger.error(f"DownloadWorker-{self.worker_id} error: {e}")
@@ -84,34 +93,33 @@ class DownloadWorker(threading.Thread):
         """
 
         # ========== DEBUG: CEK PATH ==========
-        logger.info(f"Worker-{self.worker_id} processing: {job.name}")
-        logger.info(f"Source path from job: {job.source_path}")
-        logger.info(f"Dest path from job: {job.dest_path}")
-        logger.info(f"Size: {job.size_bytes} bytes")
+        logger.info("Worker-%d processing: %s", self.worker_id, job.name)
+        logger.debug("pre_copy src=%s dst=%s size=%d", job.source_path, job.dest_path, job.size_bytes)
         
         # ========== CEK SOURCE PATH ==========
-        import os
         if not job.source_path or job.source_path == "":
             logger.error(f"Source path is EMPTY for {job.name}")
             self.queue_manager.fail_job(job, "Source path is empty", retry=False)
             return
             
-        if not os.path.exists(job.source_path):
+        # Satu stat untuk cek keberadaan + ukuran, hasilnya dipakai ulang oleh safe_copy
+        try:
+            src_stat = os.stat(job.source_path)
+        except OSError:
             logger.error(f"Source file does NOT exist: {job.source_path}")
             self.queue_manager.fail_job(job, f"Source file not found: {job.source_path}", retry=True)
             return
-        else:
-            logger.info(f"Source file exists, size: {os.path.getsize(job.source_path)} bytes")
+        job._src_stat = src_stat
+        logger.debug("Source file exists, size: %d bytes", src_stat.st_size)
         
         # ========== CEK DESTINATION PATH ==========
         if not job.dest_path or job.dest_path == "":
             logger.warning(f"Destination path is EMPTY for {job.name}, trying to set from config")
             
-            # Load config untuk dapat destination folder
-            config = self.config_manager.load()
-            if config.destination_70 and config.destination_70 != "":
-                import os
-                job.dest_path = os.path.join(config.destination_70, job.name)
+            # Pakai config bersama dari DownloadManager (tanpa baca ulang config.json)
+            destination_70 = self.download_manager.config.destination_70
+            if destination_70:
+                job.dest_path = os.path.join(destination_70, job.name)
                 logger.info(f"Set destination path from config: {job.dest_path}")
             else:
                 logger.error(f"Cannot set destination path: destination_70 is empty in config")
@@ -120,7 +128,10 @@ class DownloadWorker(threading.Thread):
         
         # ========== CEK FOLDER DESTINATION ==========
         dest_folder = os.path.dirname(job.dest_path)
-        if not os.path.exists(dest_folder):
+        try:
+            dest_stat = os.stat(dest_folder)
+        except FileNotFoundError:
+            dest_stat = None
             logger.warning(f"Destination folder does not exist: {dest_folder}")
             try:
                 os.makedirs(dest_folder, exist_ok=True)
@@ -131,14 +142,18 @@ class DownloadWorker(threading.Thread):
                 return
         
         # ========== CEK WRITE PERMISSION ==========
-        if not os.access(dest_folder, os.W_OK):
+        # Dari mode bits stat; os.access hanya dipanggil jika mode bits bilang read-only
+        if (dest_stat is not None and not (dest_stat.st_mode & stat.S_IWUSR)
+                and not os.access(dest_folder, os.W_OK)):
             logger.error(f"No write permission to destination folder: {dest_folder}")
             self.queue_manager.fail_job(job, f"No write permission to {dest_folder}", retry=False)
             return
         
-        logger.info(f"All path checks passed for {job.name}")
-        logger.info(f"Final source: {job.source_path}")
-        logger.info(f"Final dest: {job.dest_path}")
+        logger.debug("Path checks passed for %s: src=%s dst=%s", job.name, job.source_path, job.dest_path)
+        
+        # Checksum saat copy (jika diaktifkan di settings)
+        if not job.hash_algo and self.download_manager.config.hash_algo:
+            job.hash_algo = self.download_manager.config.hash_algo
         
         # Update state
         job.status = STATUS_DOWNLOADING
@@ -153,18 +168,20 @@ class DownloadWorker(threading.Thread):
         # Callback checkpoint
         def checkpoint_callback(job: FileJob):
             self.state_manager.update_job(job)
-            # logger.debug(f"Checkpoint saved for {job.name}: {job.progress:.1f}%")
+            # logger.debug("Checkpoint saved for %s: %.1f%%", job.name, job.progress)
         
         # Start time
         start_time = time.time()
         
         try:
             # Lakukan copy
-            logger.info(f"Starting copy for {job.name}")
+            logger.debug("Starting copy for %s", job.name)
             success = self.file_handler.safe_copy(
                 job=job,
                 progress_callback=progress_callback,
-                checkpoint_callback=checkpoint_callback
+                checkpoint_callback=checkpoint_callback,
+                scratch=self._io_mv,
+                move=True
             )
             
             duration = time.time() - start_time
@@ -175,33 +192,12 @@ class DownloadWorker(threading.Thread):
                 job.end_time = time.time()
                 actual_filename = os.path.basename(job.dest_path)
                 
-                # Catat history
-                self.history_logger.log_success(
-                    filename=actual_filename,
-                    size_bytes=job.size_bytes,
-                    duration_seconds=duration,
-                    retry_count=job.retry_count,
-                    destination="70"  # <-- TAMBAH DESTINATION
-                )
-                
-                # Update state
+                # Update state, lalu catat history + state (ditulis batch oleh writer DownloadManager)
                 self.state_manager.update_job(job)
+                self.download_manager.record_success(job, actual_filename, duration)
                 
                 # ===== PANGGIL UPLOAD CONTROLLER =====
                 try:
-                    # Import di sini untuk menghindari circular import
-                    from ..core.upload_controller import UploadController
-                    from ..utils.config_manager import ConfigManager
-                    
-                    # Buat controller sementara
-                    config_mgr = ConfigManager()
-                    upload_controller = UploadController(
-                        upload_manager=None,  # Akan di-set dari luar
-                        queue_manager=None,
-                        config_manager=config_mgr
-                    )
-                    
-                    # Panggil callback
                     # ===== PANGGIL UPLOAD CONTROLLER (PAKAI YANG SUDAH TERDAFTAR) =====
                     if hasattr(self.download_manager, 'upload_controller') and self.download_manager.upload_controller:
                         try:
@@ -217,10 +213,10 @@ class DownloadWorker(threading.Thread):
                     logger.error(f"Error triggering upload: {e}")
                 # =====================================
                 
-                # Hapus file sumber dari 12
-                logger.info(f"Deleting source file: {job.source_path}")
-
-                self.file_handler.delete_file(job.source_path)
+                # Hapus file sumber dari 12 (tidak perlu jika sudah dipindah dengan rename)
+                if not job._moved:
+                    logger.info(f"Deleting source file: {job.source_path}")
+                    self.file_handler.delete_file(job.source_path)
                 
                 logger.info(f"Worker-{self.worker_id} completed: {actual_filename} in {duration:.2f}s")
                 
@@ -238,12 +234,7 @@ class DownloadWorker(threading.Thread):
             duration = time.time() - start_time
             
             # Catat history (gagal)
-            self.history_logger.log_failed(
-                filename=job.name,
-                size_bytes=job.size_bytes,
-                error_msg=str(e),
-                retry_count=job.retry_count + 1
-            )
+            self.download_manager.record_failure(job, str(e))
             
             # Handle retry
             if job.retry_count < job.max_retry - 1:
@@ -4,14 +4,215 @@ File handler untuk operasi copy file dengan progress, delete, retry, dan auto-re
 """
 
 import os
+import sys
+import stat
 import time
+import threading
+import errno
+import zlib
+import shutil
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 from ..models.file_job import FileJob
-from ..constants.settings import CHUNK_SIZE, CHECKPOINT_PERCENT
+from .uring_copy import HAS_LIBURING, uring_copy
+from ..constants.settings import (
+    CHUNK_SIZE, CHECKPOINT_PERCENT, CHECKPOINT_INTERVAL_BYTES, UNBUFFERED_IO_THRESHOLD,
+    CHUNKED_COPY_THRESHOLD, CHUNKED_COPY_STREAMS, SMALL_FILE_THRESHOLD, PROGRESS_MIN_INTERVAL,
+    PROGRESS_SAMPLE_BYTES,
+    MIN_CHUNK_SIZE, MAX_CHUNK_SIZE, CHUNK_SIZE_DIVISOR
+)
 
 logger = logging.getLogger(__name__)
 
+IS_WINDOWS = sys.platform == 'win32'
+IS_LINUX = sys.platform.startswith('linux')
+
+# Maksimal bytes per panggilan sendfile (progress tetap jalan di tengah file besar)
+NATIVE_COPY_STEP = 64 * 1024 * 1024  # 64MB
+
+# Hint page cache untuk file yang hanya dibaca/ditulis sekali
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+_FADVISE_FLAGS = {
+    'sequential': getattr(os, 'POSIX_FADV_SEQUENTIAL', 0),
+    'dontneed': getattr(os, 'POSIX_FADV_DONTNEED', 0),
+}
+
+# copy_file_range tidak bisa dipakai (beda filesystem/kernel lama): turun ke splice, lalu sendfile
+HAS_COPY_FILE_RANGE = IS_LINUX and hasattr(os, 'copy_file_range')
+HAS_SPLICE = IS_LINUX and hasattr(os, 'splice')
+SPLICE_PIPE_SIZE = 1 << 20  # Kapasitas pipe untuk splice (maks. bytes per langkah)
+
+if IS_LINUX:
+    import fcntl
+_COPY_RANGE_FALLBACK_ERRNOS = (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP)
+
+# ===== WIN32 COPYFILEEXW =====
+if IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    # DWORD CALLBACK CopyProgressRoutine(TotalFileSize, TotalBytesTransferred, StreamSize,
+    #     StreamBytesTransferred, dwStreamNumber, dwCallbackReason, hSourceFile, hDestinationFile, lpData)
+    LPPROGRESS_ROUTINE = ctypes.WINFUNCTYPE(
+        wintypes.DWORD,
+        ctypes.c_longlong, ctypes.c_longlong, ctypes.c_longlong, ctypes.c_longlong,
+        wintypes.DWORD, wintypes.DWORD,
+        wintypes.HANDLE, wintypes.HANDLE, wintypes.LPVOID
+    )
+
+    _CopyFileExW = _kernel32.CopyFileExW
+    _CopyFileExW.argtypes = [
+        wintypes.LPCWSTR, wintypes.LPCWSTR, LPPROGRESS_ROUTINE,
+        wintypes.LPVOID, ctypes.POINTER(wintypes.BOOL), wintypes.DWORD
+    ]
+    _CopyFileExW.restype = wintypes.BOOL
+
+    _CopyFileW = _kernel32.CopyFileW
+    _CopyFileW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.BOOL]
+    _CopyFileW.restype = wintypes.BOOL
+
+    _MoveFileExW = _kernel32.MoveFileExW
+    _MoveFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD]
+    _MoveFileExW.restype = wintypes.BOOL
+
+    import msvcrt
+
+    _SetFilePointerEx = _kernel32.SetFilePointerEx
+    _SetFilePointerEx.argtypes = [
+        wintypes.HANDLE, ctypes.c_longlong, ctypes.POINTER(ctypes.c_longlong), wintypes.DWORD
+    ]
+    _SetFilePointerEx.restype = wintypes.BOOL
+
+    _SetEndOfFile = _kernel32.SetEndOfFile
+    _SetEndOfFile.argtypes = [wintypes.HANDLE]
+    _SetEndOfFile.restype = wintypes.BOOL
+else:
+    _CopyFileExW = None
+
+PROGRESS_CONTINUE = 0
+PROGRESS_CANCEL = 1
+COPY_FILE_NO_BUFFERING = 0x00001000
+FILE_BEGIN = 0
+MOVEFILE_REPLACE_EXISTING = 0x00000001
+MOVEFILE_WRITE_THROUGH = 0x00000008
+
+
+class _Crc32:
+    """Adaptor zlib.crc32 dengan interface hashlib (update / hexdigest)"""
+    
+    def __init__(self):
+        self.value = 0
+    
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+    
+    def hexdigest(self) -> str:
+        return f"{self.value:08x}"
+
+
+def _new_hasher(hash_algo: str):
+    """
+    Buat objek hash untuk dihitung di dalam loop copy
+    
+    Args:
+        hash_algo: 'crc32' atau nama algoritma hashlib ('sha256', 'md5', ...)
+    """
+    if hash_algo.lower() == 'crc32':
+        return _Crc32()
+    return hashlib.new(hash_algo)
+
+
+class _SpliceUnsupported(Exception):
+    """splice ditolak sebelum ada data yang dipindah (filesystem tidak mendukung)"""
+
+
+class _BufferPool:
+    """
+    Pool bytearray per ukuran, dipakai ulang antar copy (upload worker, stream paralel)
+    supaya tidak ada alokasi buffer besar setiap file
+    """
+    
+    MAX_PER_SIZE = 8
+    
+    def __init__(self):
+        self._free = {}  # size -> list of bytearray
+        self._lock = threading.Lock()
+    
+    def acquire(self, size: int) -> memoryview:
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                return memoryview(free.pop())
+        return memoryview(bytearray(size))
+    
+    def release(self, view: memoryview):
+        buf = view.obj
+        view.release()
+        with self._lock:
+            free = self._free.setdefault(len(buf), [])
+            if len(free) < self.MAX_PER_SIZE:
+                free.append(buf)
+
+
+class _CopyProgress:
+    """
+    Menyalurkan progress dan checkpoint dari semua jalur copy (native maupun Python)
+    """
+    
+    def __init__(self, job: FileJob,
+                 progress_callback: Optional[Callable[[int, float], None]],
+                 checkpoint_callback: Optional[Callable[[FileJob], None]]):
+        self.job = job
+        self.total_bytes = job.size_bytes
+        self.progress_callback = progress_callback
+        self.checkpoint_callback = checkpoint_callback
+        self.last_checkpoint = job.last_checkpoint  # bytes saat checkpoint terakhir
+        self.last_callback_ns = 0
+        self.callback_interval_ns = int(PROGRESS_MIN_INTERVAL * 1_000_000_000)
+        # Jam hanya dibaca setelah PROGRESS_SAMPLE_BYTES baru (bukan setiap chunk)
+        self.next_sample_bytes = job.copied_bytes
+        
+        # Batas log/checkpoint berikutnya dalam bytes (hot path hanya membandingkan integer)
+        self.log_step = max(1, self.total_bytes * CHECKPOINT_PERCENT // 100)
+        self.next_log_bytes = (job.copied_bytes // self.log_step + 1) * self.log_step
+        self.next_checkpoint_bytes = self.last_checkpoint + CHECKPOINT_INTERVAL_BYTES
+    
+    def _percent(self, copied_bytes: int) -> float:
+        total_bytes = self.total_bytes
+        return (copied_bytes / total_bytes) * 100 if total_bytes else 100.0
+    
+    def update(self, copied_bytes: int):
+        """Laporkan jumlah bytes yang sudah di-copy"""
+        job = self.job
+        
+        # Progress callback di-throttle (maks. sekali per PROGRESS_MIN_INTERVAL), update terakhir selalu dikirim
+        if self.progress_callback and (copied_bytes >= self.next_sample_bytes or copied_bytes >= self.total_bytes):
+            self.next_sample_bytes = copied_bytes + PROGRESS_SAMPLE_BYTES
+            now_ns = time.monotonic_ns()
+            if now_ns - self.last_callback_ns >= self.callback_interval_ns or copied_bytes >= self.total_bytes:
+                self.last_callback_ns = now_ns
+                self.progress_callback(copied_bytes, self._percent(copied_bytes))
+        
+        # Log progress setiap CHECKPOINT_PERCENT
+        if copied_bytes >= self.next_log_bytes:
+            self.next_log_bytes = (copied_bytes // self.log_step + 1) * self.log_step
+            logger.info("%s: %.1f%% (%.2fGB/%.2fGB)", job.name, self._percent(copied_bytes),
+                        copied_bytes / (1024**3), job.size_gb)
+        
+        # Cek checkpoint (setiap CHECKPOINT_INTERVAL_BYTES, terlepas dari ukuran buffer IO)
+        if copied_bytes >= self.next_checkpoint_bytes and self.checkpoint_callback:
+            job.copied_bytes = copied_bytes
+            job.progress = self._percent(copied_bytes)
+            job.last_checkpoint = copied_bytes
+            self.checkpoint_callback(job)
+            self.last_checkpoint = copied_bytes
+            self.next_checkpoint_bytes = copied_bytes + CHECKPOINT_INTERVAL_BYTES
+            logger.debug("Checkpoint %s: %.0fMB", job.name, copied_bytes / (1024**2))
+
 class FileHandler:
     """
     Kelas untuk menangani operasi file (copy, delete, retry) dengan auto-rename untuk duplikat
@@ -22,11 +223,28 @@ class FileHandler:
         Inisialisasi FileHandler
         
         Args:
-            chunk_size: Ukuran chunk untuk copy (default 256MB)
+            chunk_size: Ukuran buffer per read/write syscall (default IO_BUFFER_SIZE, 1MB)
         """
         self.chunk_size = chunk_size
+        self._buffers = _BufferPool()
         logger.debug(f"FileHandler initialized with chunk_size={chunk_size/(1024**2):.0f}MB")
     
+    def _pick_chunk(self, size: int) -> int:
+        """
+        Ukuran buffer adaptif sesuai ukuran file
+        
+        File kecil memakai buffer kecil (hemat memori, cache lebih efektif),
+        file besar sampai MAX_CHUNK_SIZE. Tidak pernah melebihi self.chunk_size.
+        
+        Args:
+            size: Ukuran file dalam bytes
+            
+        Returns:
+            Ukuran buffer dalam bytes
+        """
+        chunk = max(MIN_CHUNK_SIZE, min(size // CHUNK_SIZE_DIVISOR, MAX_CHUNK_SIZE))
+        return min(self.chunk_size, chunk)
+    
     def get_unique_dest_path(self, dest_folder: str, filename: str) -> str:
         """
         Dapatkan path destination unik dengan menambahkan nomor jika file sudah ada
@@ -48,29 +266,34 @@ class FileHandler:
         if not os.path.exists(dest_path):
             return dest_path
         
-        # File sudah ada, cari nomor yang tersedia
+        # File sudah ada: baca isi folder sekali, lalu cari nomor yang tersedia di memory
+        # (satu readdir, bukan satu stat per nomor; penting di share SMB yang ramai)
+        with os.scandir(dest_folder) as entries:
+            existing = {os.path.normcase(entry.name) for entry in entries}
+        
+        # Format: nama (1).ext, nama (2).ext, dst - prefix/suffix disiapkan sekali di luar loop
+        prefix = os.path.normcase(f"{base} (")
+        suffix = os.path.normcase(f"){ext}")
         counter = 1
-        while True:
-            # Format: nama (1).ext, nama (2).ext, dst
-            new_filename = f"{base} ({counter}){ext}"
-            new_path = os.path.join(dest_folder, new_filename)
-            
-            if not os.path.exists(new_path):
-                logger.info(f"File already exists, using: {new_filename}")
-                return new_path
-            
+        while f"{prefix}{counter}{suffix}" in existing:
             counter += 1
+        
+        new_filename = f"{base} ({counter}){ext}"
+        logger.info(f"File already exists, using: {new_filename}")
+        return os.path.join(dest_folder, new_filename)
     
     def copy_with_progress(self, job: FileJob, 
                            progress_callback: Optional[Callable[[int, float], None]] = None,
-                           checkpoint_callback: Optional[Callable[[FileJob], None]] = None) -> bool:
+                           checkpoint_callback: Optional[Callable[[FileJob], None]] = None,
+                           scratch: Optional[memoryview] = None) -> bool:
         """
         Copy file dengan progress monitoring dan retry untuk permission denied
         
         Args:
             job: FileJob object
             progress_callback: Callback untuk update progress (bytes_copied, percent)
-            checkpoint_callback: Callback untuk checkpoint (setiap 10%)
+            checkpoint_callback: Callback untuk checkpoint (setiap CHECKPOINT_INTERVAL_BYTES)
+            scratch: Buffer milik worker untuk loop read/write (optional, dialokasikan jika None)
             
         Returns:
             True jika sukses, False jika gagal
@@ -84,53 +307,39 @@ class FileHandler:
                 # Buat folder tujuan jika belum ada
                 os.makedirs(os.path.dirname(job.dest_path), exist_ok=True)
                 
-                logger.info(f"Copying to: {job.dest_path}")
+                logger.debug("Copying to: %s", job.dest_path)
+                
+                # Resume hanya valid jika file tujuan memang berisi bagian yang sudah di-copy
+                if job.copied_bytes > 0:
+                    try:
+                        dest_size = os.stat(job.dest_path).st_size
+                    except FileNotFoundError:
+                        dest_size = 0
+                    if dest_size < job.copied_bytes:
+                        logger.warning(f"Partial file for {job.name} is missing or shorter than checkpoint, "
+                                       f"restarting from 0")
+                        job.copied_bytes = 0
+                        job.last_checkpoint = 0
                 
-                # Buka file sumber dan tujuan
-                with open(job.source_path, 'rb') as src_file:
-                    with open(job.dest_path, 'wb') as dst_file:
-                        
-                        # Jika resume, seek ke posisi terakhir
-                        if job.copied_bytes > 0:
-                            src_file.seek(job.copied_bytes)
-                            dst_file.seek(job.copied_bytes)
-                            logger.info(f"Resuming {job.name} from {job.copied_bytes/(1024**2):.2f}MB")
-                        
-                        total_bytes = job.size_bytes
-                        copied_bytes = job.copied_bytes
-                        last_checkpoint = job.last_checkpoint
-                        last_log_percent = 0
-                        
-                        while copied_bytes < total_bytes:
-                            # Baca chunk
-                            chunk = src_file.read(self.chunk_size)
-                            if not chunk:
-                                break
-                            
-                            # Tulis chunk
-                            dst_file.write(chunk)
-                            copied_bytes += len(chunk)
-                            
-                            # Update progress
-                            percent = (copied_bytes / total_bytes) * 100
-                            
-                            if progress_callback:
-                                progress_callback(copied_bytes, percent)
-                            
-                            # Log progress setiap 10%
-                            if int(percent) >= last_log_percent + 10:
-                                last_log_percent = int(percent)
-                                logger.info(f"{job.name}: {percent:.1f}% ({copied_bytes/(1024**3):.2f}GB/{job.size_gb:.2f}GB)")
-                            
-                            # Cek checkpoint (setiap 10%)
-                            current_checkpoint = int(percent // CHECKPOINT_PERCENT) * CHECKPOINT_PERCENT
-                            if current_checkpoint > last_checkpoint and checkpoint_callback:
-                                job.copied_bytes = copied_bytes
-                                job.progress = percent
-                                job.last_checkpoint = current_checkpoint
-                                checkpoint_callback(job)
-                                last_checkpoint = current_checkpoint
-                                logger.debug(f"Checkpoint {job.name}: {current_checkpoint}%")
+                total_bytes = job.size_bytes
+                tracker = _CopyProgress(job, progress_callback, checkpoint_callback)
+                
+                # Pilih jalur copy: native (kernel) dulu, loop Python hanya untuk fallback / sisa resume
+                hash_algo = getattr(job, 'hash_algo', None)
+                if hash_algo:
+                    # Checksum dihitung dari buffer read, jadi harus lewat loop user-space
+                    self._copy_stream(job, tracker, _new_hasher(hash_algo), scratch)
+                elif job.copied_bytes == 0 and total_bytes < SMALL_FILE_THRESHOLD:
+                    self._copy_small(job, tracker)
+                elif (job.copied_bytes == 0 and total_bytes >= CHUNKED_COPY_THRESHOLD
+                        and hasattr(os, 'pwrite')):
+                    self._copy_parallel(job, tracker)
+                elif IS_WINDOWS and job.copied_bytes == 0:
+                    self._copy_file_ex(job, tracker)
+                elif IS_LINUX and hasattr(os, 'sendfile'):
+                    self._copy_sendfile(job, tracker, scratch)
+                else:
+                    self._copy_stream(job, tracker, scratch=scratch)
                 
                 # Jika sampai sini, copy berhasil
                 duration = time.time() - start_time
@@ -177,9 +386,539 @@ class FileHandler:
         
         return False
     
+    def _copy_stream(self, job: FileJob, tracker: _CopyProgress, hasher=None,
+                     scratch: Optional[memoryview] = None):
+        """
+        Copy dengan loop read/write Python (fallback, sisa resume, dan copy dengan checksum)
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress/checkpoint
+            hasher: Objek hash (optional), di-update dengan setiap buffer yang dibaca
+            scratch: Buffer milik worker (optional)
+        """
+        resume = job.copied_bytes > 0
+        
+        # Buffer milik worker jika cukup besar, selain itu pinjam dari pool
+        chunk_size = self._pick_chunk(job.size_bytes)
+        pooled = None
+        if scratch is None or len(scratch) < chunk_size:
+            pooled = scratch = self._buffers.acquire(chunk_size)
+        try:
+            self._copy_stream_loop(job, tracker, hasher, scratch[:chunk_size], resume)
+        finally:
+            if pooled is not None:
+                self._buffers.release(pooled)
+    
+    def _copy_stream_loop(self, job: FileJob, tracker: _CopyProgress, hasher,
+                          view: memoryview, resume: bool):
+        """
+        Loop readinto/write untuk _copy_stream
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress/checkpoint
+            hasher: Objek hash (optional)
+            view: Buffer yang dipakai ulang untuk setiap chunk
+            resume: True jika melanjutkan dari job.copied_bytes
+        """
+        # File besar dibaca sekuensial (FILE_FLAG_SEQUENTIAL_SCAN di Windows)
+        src_flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+        if job.size_bytes > UNBUFFERED_IO_THRESHOLD:
+            src_flags |= getattr(os, 'O_SEQUENTIAL', 0)
+        
+        with open(os.open(job.source_path, src_flags), 'rb') as src_file:
+            # Saat resume, jangan truncate bagian yang sudah di-copy
+            with open(job.dest_path, 'r+b' if resume else 'wb') as dst_file:
+                src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+                self._fadvise(src_fd, 'sequential')
+                self._fadvise(dst_fd, 'sequential')
+                
+                # Jika resume, seek ke posisi terakhir
+                if resume:
+                    if hasher is not None:
+                        # Bagian yang sudah di-copy tetap harus ikut di-hash
+                        self._hash_prefix(src_file, job.copied_bytes, hasher, view)
+                    src_file.seek(job.copied_bytes)
+                    dst_file.seek(job.copied_bytes)
+                    dst_file.truncate()
+                    logger.info(f"Resuming {job.name} from {job.copied_bytes/(1024**2):.2f}MB")
+                else:
+                    self._preallocate(dst_file.fileno(), job.size_bytes)
+                
+                total_bytes = job.size_bytes
+                copied_bytes = job.copied_bytes
+                
+                # Binding lokal untuk loop per chunk (job.* hanya ditulis tracker saat checkpoint)
+                readinto = src_file.readinto
+                write = dst_file.write
+                update = tracker.update
+                hash_update = hasher.update if hasher is not None else None
+                view_len = len(view)
+                
+                while copied_bytes < total_bytes:
+                    # Baca chunk
+                    n = readinto(view)
+                    if not n:
+                        break
+                    
+                    # Tulis chunk (slice hanya untuk chunk terakhir yang tidak penuh)
+                    chunk = view if n == view_len else view[:n]
+                    write(chunk)
+                    if hash_update is not None:
+                        hash_update(chunk)
+                    copied_bytes += n
+                    
+                    update(copied_bytes)
+                
+                # Source lebih pendek dari perkiraan: buang sisa pre-allocation agar verifikasi gagal
+                if copied_bytes < total_bytes:
+                    dst_file.truncate()
+                
+                # File tidak akan dibaca lagi: lepas dari page cache
+                dst_file.flush()
+                self._fadvise(src_fd, 'dontneed')
+                self._fadvise(dst_fd, 'dontneed')
+                
+                if hasher is not None:
+                    job.checksum = hasher.hexdigest()
+    
+    def _hash_prefix(self, src_file, length: int, hasher, view: memoryview):
+        """
+        Hash bagian awal source yang sudah di-copy sebelumnya (saat resume dengan checksum)
+        
+        Args:
+            src_file: File object source (posisi di 0)
+            length: Jumlah bytes yang di-hash
+            hasher: Objek hash
+            view: Buffer yang dipakai ulang
+        """
+        remaining = length
+        while remaining > 0:
+            n = src_file.readinto(view[:min(len(view), remaining)])
+            if not n:
+                break
+            hasher.update(view[:n])
+            remaining -= n
+    
+    def _copy_small(self, job: FileJob, tracker: _CopyProgress):
+        """
+        Copy file kecil dalam satu panggilan native, progress hanya dilaporkan sekali di akhir
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress
+        """
+        if IS_WINDOWS:
+            if not _CopyFileW(job.source_path, job.dest_path, False):
+                raise ctypes.WinError(ctypes.get_last_error())
+        else:
+            # Di Linux shutil.copyfile memakai sendfile di dalam kernel
+            shutil.copyfile(job.source_path, job.dest_path)
+        
+        job.copied_bytes = job.size_bytes
+        tracker.update(job.size_bytes)
+    
+    def _copy_parallel(self, job: FileJob, tracker: _CopyProgress):
+        """
+        Copy file besar dengan beberapa stream paralel (fd terpisah per thread)
+        
+        File dibagi menjadi stripe NATIVE_COPY_STEP yang diambil bergiliran oleh tiap stream.
+        Yang dilaporkan sebagai copied_bytes hanya prefix yang sudah utuh, jadi checkpoint
+        tetap aman dipakai untuk resume.
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress/checkpoint
+        """
+        total_bytes = job.size_bytes
+        stripe = NATIVE_COPY_STEP
+        stripe_count = (total_bytes + stripe - 1) // stripe
+        streams = min(CHUNKED_COPY_STREAMS, stripe_count)
+        
+        # Siapkan file tujuan dengan ukuran penuh supaya tiap stream bisa menulis di offset-nya
+        dst_fd = os.open(job.dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            self._preallocate(dst_fd, total_bytes)
+            os.ftruncate(dst_fd, total_bytes)
+        finally:
+            os.close(dst_fd)
+        
+        logger.info(f"Parallel copy {job.name}: {streams} streams, {stripe_count} stripes")
+        
+        lock = threading.Lock()
+        failed = threading.Event()
+        next_stripe = [0]
+        prefix = [0]  # jumlah stripe berurutan dari awal yang sudah selesai
+        finished = set()
+        
+        def claim_stripe() -> Optional[int]:
+            with lock:
+                if failed.is_set() or next_stripe[0] >= stripe_count:
+                    return None
+                index = next_stripe[0]
+                next_stripe[0] += 1
+                return index
+        
+        def finish_stripe(index: int):
+            with lock:
+                finished.add(index)
+                advanced = False
+                while prefix[0] in finished:
+                    finished.discard(prefix[0])
+                    prefix[0] += 1
+                    advanced = True
+                if advanced:
+                    copied_bytes = min(prefix[0] * stripe, total_bytes)
+                    job.copied_bytes = copied_bytes
+                    tracker.update(copied_bytes)
+        
+        def run_stream():
+            try:
+                src_fd = os.open(job.source_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+                try:
+                    dst_fd = os.open(job.dest_path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+                    scratch = self._buffers.acquire(self.chunk_size)
+                    try:
+                        while True:
+                            index = claim_stripe()
+                            if index is None:
+                                return
+                            start = index * stripe
+                            end = min(start + stripe, total_bytes)
+                            self._copy_range(src_fd, dst_fd, start, end, scratch)
+                            # Stripe selesai: lepas dari page cache
+                            self._fadvise(src_fd, 'dontneed', start, end - start)
+                            self._fadvise(dst_fd, 'dontneed', start, end - start)
+                            finish_stripe(index)
+                    finally:
+                        self._buffers.release(scratch)
+                        os.close(dst_fd)
+                finally:
+                    os.close(src_fd)
+            except BaseException:
+                failed.set()
+                raise
+        
+        with ThreadPoolExecutor(max_workers=streams, thread_name_prefix="CopyStream") as pool:
+            futures = [pool.submit(run_stream) for _ in range(streams)]
+        
+        for future in futures:
+            future.result()
+    
+    def _fadvise(self, fd: int, advice: str, offset: int = 0, length: int = 0):
+        """
+        Hint page cache (Linux): 'sequential' saat mulai copy, 'dontneed' setelah selesai
+        supaya file video yang hanya dibaca sekali tidak mengusir cache aplikasi lain.
+        Tidak tersedia / gagal = diabaikan.
+        
+        Args:
+            fd: File descriptor
+            advice: 'sequential' atau 'dontneed'
+            offset: Offset awal rentang (default 0)
+            length: Panjang rentang (default 0 = sampai akhir file)
+        """
+        if not HAS_FADVISE:
+            return
+        try:
+            os.posix_fadvise(fd, offset, length, _FADVISE_FLAGS[advice])
+        except OSError:
+            pass
+    
+    def _preallocate(self, fd: int, size: int):
+        """
+        Alokasikan ukuran penuh file tujuan dalam satu panggilan (kurangi fragmentasi).
+        Gagal pre-allocate tidak fatal, copy tetap jalan.
+        
+        Args:
+            fd: File descriptor destination (baru dibuat, posisi di 0)
+            size: Ukuran akhir file
+        """
+        if size <= 0:
+            return
+        
+        try:
+            if IS_WINDOWS:
+                handle = msvcrt.get_osfhandle(fd)
+                if not _SetFilePointerEx(handle, size, None, FILE_BEGIN) or not _SetEndOfFile(handle):
+                    raise ctypes.WinError(ctypes.get_last_error())
+                # Kembalikan posisi tulis ke awal file
+                if not _SetFilePointerEx(handle, 0, None, FILE_BEGIN):
+                    raise ctypes.WinError(ctypes.get_last_error())
+            elif hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, size)
+        except OSError as e:
+            logger.debug(f"Pre-allocation skipped ({e})")
+    
+    def _copy_range(self, src_fd: int, dst_fd: int, start: int, end: int,
+                    scratch: Optional[memoryview] = None):
+        """
+        Copy satu rentang byte [start, end) antar fd tanpa mengubah posisi fd lain
+        
+        Args:
+            src_fd: File descriptor source (milik stream ini)
+            dst_fd: File descriptor destination (milik stream ini)
+            start: Offset awal
+            end: Offset akhir (eksklusif)
+            scratch: Buffer milik stream untuk fallback pread/pwrite (optional)
+        """
+        offset = start
+        
+        if HAS_COPY_FILE_RANGE:
+            # Offset eksplisit di kedua sisi, posisi fd tidak berubah
+            try:
+                while offset < end:
+                    sent = os.copy_file_range(src_fd, dst_fd, end - offset, offset, offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError as e:
+                if e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                    raise
+            if offset >= end:
+                return
+        
+        if IS_LINUX and hasattr(os, 'sendfile'):
+            # sendfile menulis di posisi dst_fd saat ini, fd ini khusus untuk stream ini
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            try:
+                while offset < end:
+                    sent = os.sendfile(dst_fd, src_fd, offset, end - offset)
+                    if sent == 0:
+                        raise IOError(f"Unexpected end of file at offset {offset}")
+                    offset += sent
+                return
+            except OSError as e:
+                if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                    raise
+                # Filesystem tidak mendukung sendfile, lanjut dengan pread/pwrite
+        
+        # preadv mengisi buffer stream yang sama (tanpa alokasi per chunk, GIL lepas selama syscall)
+        if scratch is None:
+            scratch = memoryview(bytearray(self.chunk_size))
+        while offset < end:
+            length = min(len(scratch), end - offset)
+            if hasattr(os, 'preadv'):
+                n = os.preadv(src_fd, [scratch[:length]], offset)
+                data = scratch[:n]
+            else:
+                data = memoryview(os.pread(src_fd, length, offset))
+                n = len(data)
+            if not n:
+                raise IOError(f"Unexpected end of file at offset {offset}")
+            while data:
+                written = os.pwrite(dst_fd, data, offset)
+                data = data[written:]
+                offset += written
+    
+    def _copy_sendfile(self, job: FileJob, tracker: _CopyProgress,
+                       scratch: Optional[memoryview] = None):
+        """
+        Copy di dalam kernel (Linux), tanpa buffer di user-space
+        
+        Pakai os.copy_file_range dulu (bisa reflink / server-side copy di filesystem
+        yang sama). Jika ditolak (mis. SMB → lokal, beda filesystem), sisa file di-copy
+        dengan io_uring jika liburing tersedia (read/write lewat buffer, tapi overlap),
+        lalu os.splice lewat pipe, lalu os.sendfile jika splice juga tidak didukung.
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress/checkpoint
+            scratch: Buffer milik worker, hanya dipakai jika jatuh ke loop Python
+        """
+        resume = job.copied_bytes > 0
+        
+        def on_progress(copied_bytes: int):
+            job.copied_bytes = copied_bytes
+            tracker.update(copied_bytes)
+        
+        src_fd = os.open(job.source_path, os.O_RDONLY)
+        try:
+            flags = os.O_WRONLY | os.O_CREAT
+            if not resume:
+                flags |= os.O_TRUNC
+            dst_fd = os.open(job.dest_path, flags, 0o666)
+            self._fadvise(src_fd, 'sequential')
+            self._fadvise(dst_fd, 'sequential')
+            try:
+                # Jika resume, seek kedua fd ke posisi terakhir
+                offset = job.copied_bytes
+                if resume:
+                    os.lseek(src_fd, offset, os.SEEK_SET)
+                    os.lseek(dst_fd, offset, os.SEEK_SET)
+                    os.ftruncate(dst_fd, offset)
+                    logger.info(f"Resuming {job.name} from {offset/(1024**2):.2f}MB")
+                else:
+                    self._preallocate(dst_fd, job.size_bytes)
+                
+                total_bytes = job.size_bytes
+                use_range = HAS_COPY_FILE_RANGE
+                use_uring = HAS_LIBURING  # Hanya setelah copy_file_range tidak bisa dipakai
+                pipe = None
+                while offset < total_bytes:
+                    count = min(NATIVE_COPY_STEP, total_bytes - offset)
+                    if use_range:
+                        try:
+                            sent = os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+                        except OSError as e:
+                            if e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                                raise
+                            sent = 0
+                        if sent == 0:
+                            # Tidak didukung (atau kernel lama mengembalikan 0): ganti ke splice/sendfile
+                            use_range = False
+                            pipe = self._open_splice_pipe() if HAS_SPLICE else None
+                            os.lseek(dst_fd, offset, os.SEEK_SET)
+                            continue
+                        offset += sent
+                        job.copied_bytes = offset
+                        tracker.update(offset)
+                        continue
+                    if use_uring:
+                        use_uring = False
+                        if uring_copy(src_fd, dst_fd, offset, total_bytes,
+                                      self._pick_chunk(total_bytes), on_progress):
+                            return
+                        # io_uring tidak diizinkan kernel / container: belum ada IO, lanjut splice/sendfile
+                        logger.debug(f"io_uring not usable for {job.name}, using splice/sendfile")
+                        continue
+                    if pipe is not None:
+                        try:
+                            sent = self._splice_step(src_fd, dst_fd, pipe, offset, count)
+                        except _SpliceUnsupported as e:
+                            # Belum ada data yang dipindah: lanjut dengan sendfile
+                            logger.debug(f"splice not supported for {job.name} ({e}), using sendfile")
+                            self._close_splice_pipe(pipe)
+                            pipe = None
+                            continue
+                        if sent == 0:
+                            break
+                        offset += sent
+                        job.copied_bytes = offset
+                        tracker.update(offset)
+                        continue
+                    try:
+                        sent = os.sendfile(dst_fd, src_fd, offset, count)
+                    except OSError as e:
+                        # Filesystem tidak mendukung sendfile: lanjutkan dengan loop Python
+                        if e.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                            logger.debug(f"sendfile not supported for {job.name} ({e}), falling back")
+                            job.copied_bytes = offset
+                            os.ftruncate(dst_fd, offset)
+                            break
+                        raise
+                    if sent == 0:
+                        break
+                    offset += sent
+                    job.copied_bytes = offset
+                    tracker.update(offset)
+                else:
+                    return
+            finally:
+                if pipe is not None:
+                    self._close_splice_pipe(pipe)
+                self._fadvise(dst_fd, 'dontneed')
+                os.close(dst_fd)
+        finally:
+            self._fadvise(src_fd, 'dontneed')
+            os.close(src_fd)
+        
+        # Sampai sini hanya jika sendfile tidak didukung atau sumber lebih pendek dari perkiraan
+        if job.copied_bytes < job.size_bytes:
+            self._copy_stream(job, tracker, scratch=scratch)
+    
+    def _open_splice_pipe(self) -> Optional[tuple]:
+        """
+        Buat pipe untuk splice (kapasitas SPLICE_PIPE_SIZE jika kernel mengizinkan)
+        
+        Returns:
+            (read_fd, write_fd) atau None jika pipe tidak bisa dibuat
+        """
+        try:
+            r, w = os.pipe()
+        except OSError as e:
+            logger.debug(f"Cannot create splice pipe ({e})")
+            return None
+        try:
+            fcntl.fcntl(w, getattr(fcntl, 'F_SETPIPE_SZ', 1031), SPLICE_PIPE_SIZE)
+        except OSError:
+            pass  # Tetap jalan dengan kapasitas default (64KB)
+        return r, w
+    
+    def _close_splice_pipe(self, pipe: tuple):
+        for fd in pipe:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def _splice_step(self, src_fd: int, dst_fd: int, pipe: tuple, offset: int, count: int) -> int:
+        """
+        Pindahkan maksimal count bytes dari src ke dst di offset yang sama lewat pipe
+        (source → pipe → destination, semuanya di dalam kernel)
+        
+        Args:
+            src_fd: File descriptor source
+            dst_fd: File descriptor destination
+            pipe: (read_fd, write_fd) dari _open_splice_pipe
+            offset: Offset di source dan destination
+            count: Maksimal bytes (dibatasi kapasitas pipe)
+            
+        Returns:
+            Jumlah bytes yang dipindah (0 = akhir file)
+        """
+        r, w = pipe
+        try:
+            n = os.splice(src_fd, w, count, offset_src=offset)
+        except OSError as e:
+            if e.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise _SpliceUnsupported(e) from e
+            raise
+        
+        # Kosongkan pipe ke destination (bisa butuh lebih dari satu panggilan)
+        moved = 0
+        while moved < n:
+            written = os.splice(r, dst_fd, n - moved, offset_dst=offset + moved)
+            if written == 0:
+                raise IOError(f"splice wrote 0 bytes at offset {offset + moved}")
+            moved += written
+        return n
+    
+    def _copy_file_ex(self, job: FileJob, tracker: _CopyProgress):
+        """
+        Copy dengan CopyFileExW (Windows), seluruh transfer dilakukan oleh OS
+        
+        Args:
+            job: FileJob object
+            tracker: _CopyProgress untuk laporan progress/checkpoint
+        """
+        callback_error = []
+        
+        def progress_routine(total_size, transferred, stream_size, stream_transferred,
+                             stream_number, reason, h_src, h_dst, data):
+            try:
+                job.copied_bytes = transferred
+                tracker.update(transferred)
+                return PROGRESS_CONTINUE
+            except Exception as e:
+                callback_error.append(e)
+                return PROGRESS_CANCEL
+        
+        # Simpan referensi callback selama CopyFileExW berjalan
+        routine = LPPROGRESS_ROUTINE(progress_routine)
+        flags = COPY_FILE_NO_BUFFERING if job.size_bytes > UNBUFFERED_IO_THRESHOLD else 0
+        
+        ok = _CopyFileExW(job.source_path, job.dest_path, routine, None, None, flags)
+        if callback_error:
+            raise callback_error[0]
+        if not ok:
+            raise ctypes.WinError(ctypes.get_last_error())
+    
     def safe_copy(self, job: FileJob, 
                   progress_callback: Optional[Callable] = None,
-                  checkpoint_callback: Optional[Callable] = None) -> bool:
+                  checkpoint_callback: Optional[Callable] = None,
+                  scratch: Optional[memoryview] = None,
+                  move: bool = False) -> bool:
         """
         Safe copy dengan verifikasi ukuran file dan auto-rename untuk duplikat
         
@@ -187,18 +926,25 @@ class FileHandler:
             job: FileJob object
             progress_callback: Callback progress
             checkpoint_callback: Callback checkpoint
+            scratch: Buffer milik worker untuk loop read/write (optional)
+            move: Jika True dan source/destination satu volume, pindahkan dengan rename
+                  (source tidak ada lagi setelahnya). Hanya untuk download, bukan upload.
             
         Returns:
             True jika sukses
         """
-        # Validasi awal
-        if not os.path.exists(job.source_path):
-            logger.error(f"Source file does not exist: {job.source_path}")
-            job.last_error = "Source file does not exist"
-            return False
+        # Validasi awal (pakai stat dari worker jika ada, hemat satu round trip SMB)
+        src_stat = getattr(job, '_src_stat', None)
+        if src_stat is None:
+            try:
+                src_stat = os.stat(job.source_path)
+            except OSError:
+                logger.error(f"Source file does not exist: {job.source_path}")
+                job.last_error = "Source file does not exist"
+                return False
         
         # Cek ukuran file sumber
-        actual_size = os.path.getsize(job.source_path)
+        actual_size = src_stat.st_size
         if actual_size != job.size_bytes:
             logger.warning(f"Source file size changed: expected {job.size_bytes}, got {actual_size}")
             job.size_bytes = actual_size  # Update ukuran
@@ -207,8 +953,12 @@ class FileHandler:
         dest_folder = os.path.dirname(job.dest_path)
         original_filename = os.path.basename(job.dest_path)
         
-        # Dapatkan path unik (dengan nomor jika sudah ada)
-        unique_dest_path = self.get_unique_dest_path(dest_folder, original_filename)
+        # Dapatkan path unik (dengan nomor jika sudah ada).
+        # Saat resume, file tujuan yang sudah ada adalah hasil copy sebelumnya - jangan di-rename
+        if job.copied_bytes > 0 and os.path.exists(job.dest_path):
+            unique_dest_path = job.dest_path
+        else:
+            unique_dest_path = self.get_unique_dest_path(dest_folder, original_filename)
         
         # Jika berbeda dengan path asli, update job
         renamed = False
@@ -219,30 +969,70 @@ class FileHandler:
             renamed = True
             logger.info(f"Destination renamed to avoid conflict: {old_filename} → {new_filename}")
         
-        # Copy dengan progress
-        success = self.copy_with_progress(job, progress_callback, checkpoint_callback)
+        # Satu volume: rename (O(1) metadata), selain itu copy dengan progress
+        if move and job.copied_bytes == 0 and self._try_move(job, src_stat, progress_callback):
+            success = True
+        else:
+            success = self.copy_with_progress(job, progress_callback, checkpoint_callback, scratch)
         
         if not success:
             return False
         
-        # Verifikasi ukuran file hasil copy
-        if os.path.exists(job.dest_path):
-            dest_size = os.path.getsize(job.dest_path)
-            if dest_size != job.size_bytes:
-                logger.error(f"Verification failed: {job.name} - destination size {dest_size} != source size {job.size_bytes}")
-                job.last_error = "Size mismatch after copy"
-                return False
-            else:
-                # Gunakan nama file yang sebenarnya (mungkin sudah di-rename)
-                actual_filename = os.path.basename(job.dest_path)
-                logger.info(f"Verification passed: {actual_filename} ({job.size_gb:.2f}GB)")
-                if renamed:
-                    logger.info(f"File saved as: {actual_filename}")
-        else:
+        # Verifikasi ukuran file hasil copy (satu stat, satu round trip SMB)
+        try:
+            dest_size = os.stat(job.dest_path).st_size
+        except FileNotFoundError:
             logger.error(f"Destination file not found after copy: {job.dest_path}")
             job.last_error = "Destination file missing after copy"
             return False
         
+        if dest_size != job.size_bytes:
+            logger.error(f"Verification failed: {job.name} - destination size {dest_size} != source size {job.size_bytes}")
+            job.last_error = "Size mismatch after copy"
+            return False
+        
+        # Gunakan nama file yang sebenarnya (mungkin sudah di-rename)
+        actual_filename = os.path.basename(job.dest_path)
+        logger.info(f"Verification passed: {actual_filename} ({job.size_gb:.2f}GB)")
+        if renamed:
+            logger.info(f"File saved as: {actual_filename}")
+        
+        return True
+    
+    def _try_move(self, job: FileJob, src_stat: os.stat_result,
+                  progress_callback: Optional[Callable] = None) -> bool:
+        """
+        Pindahkan file dengan rename jika source dan destination ada di volume yang sama
+        
+        Args:
+            job: FileJob object (dest_path sudah unik)
+            src_stat: Hasil os.stat source
+            progress_callback: Callback progress (dipanggil sekali dengan 100%)
+            
+        Returns:
+            True jika file sudah dipindah, False jika harus di-copy
+        """
+        try:
+            if src_stat.st_dev != os.stat(os.path.dirname(job.dest_path)).st_dev:
+                return False
+            
+            if IS_WINDOWS:
+                if not _MoveFileExW(job.source_path, job.dest_path,
+                                    MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH):
+                    raise ctypes.WinError(ctypes.get_last_error())
+            else:
+                os.rename(job.source_path, job.dest_path)
+        except OSError as e:
+            logger.debug(f"Rename not possible for {job.name} ({e}), copying instead")
+            return False
+        
+        logger.info(f"Moved (same volume): {job.name} -> {job.dest_path}")
+        job.copied_bytes = job.size_bytes
+        job.progress = 100
+        job.end_time = time.time()
+        job._moved = True
+        if progress_callback:
+            progress_callback(job.size_bytes, 100.0)
         return True
     
     def delete_file(self, path: str, max_retries: int = 3) -> bool:
@@ -256,15 +1046,15 @@ class FileHandler:
         Returns:
             True jika sukses, False jika gagal
         """
-        if not os.path.exists(path):
-            logger.warning(f"File not found for deletion: {path}")
-            return True
-        
         for attempt in range(max_retries):
             try:
                 os.remove(path)
                 logger.info(f"Deleted: {path}")
                 return True
+            
+            except FileNotFoundError:
+                logger.warning(f"File not found for deletion: {path}")
+                return True
                 
             except PermissionError:
                 logger.warning(f"Permission error deleting {path}, file mungkin masih digunakan. "
@@ -289,13 +1079,13 @@ class FileHandler:
             True jika valid
         """
         try:
-            # Cek apakah file tujuan ada
-            if not os.path.exists(job.dest_path):
+            # Cek apakah file tujuan ada dan ukurannya (satu stat)
+            try:
+                actual_size = os.stat(job.dest_path).st_size
+            except FileNotFoundError:
                 logger.error(f"Destination file not found: {job.dest_path}")
                 return False
             
-            # Cek ukuran
-            actual_size = os.path.getsize(job.dest_path)
             if actual_size != job.size_bytes:
                 logger.error(f"Size mismatch: {job.name} - expected {job.size_bytes}, got {actual_size}")
                 return False
@@ -319,16 +1109,17 @@ class FileHandler:
             Dictionary info file atau None jika error
         """
         try:
-            if not os.path.exists(path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
                 return None
             
-            stat = os.stat(path)
             return {
-                'size': stat.st_size,
-                'modified': stat.st_mtime,
-                'created': stat.st_ctime,
-                'is_file': os.path.isfile(path),
-                'is_dir': os.path.isdir(path)
+                'size': st.st_size,
+                'modified': st.st_mtime,
+                'created': st.st_ctime,
+                'is_file': stat.S_ISREG(st.st_mode),
+                'is_dir': stat.S_ISDIR(st.st_mode)
             }
             
         except Exception as e:
@@ -2,6 +2,10 @@
 """
 File monitor untuk mendeteksi file baru di folder 12 menggunakan SMB
 Dengan rename test untuk deteksi file siap
+
+Jika watchdog terpasang, folder lokal dipantau lewat event OS (inotify di Linux,
+ReadDirectoryChangesW di Windows). Polling tetap dipakai untuk share SMB (UNC)
+dan sebagai scan pengaman berkala.
 """
 
 import os
@@ -12,11 +16,63 @@ from typing import List, Optional, Callable, Dict
 from datetime import datetime
 from ..models.file_job import FileJob
 from ..core.queue_manager import QueueManager
-from ..utils.validators import is_video_file
-from ..constants.settings import SMB_POLLING_INTERVAL
+from ..constants.settings import SMB_POLLING_INTERVAL, SMB_CHANGE_TIMEOUT
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    HAS_WATCHDOG = False
 
 logger = logging.getLogger(__name__)
 
+# Jeda minimal antar pengecekan ukuran satu file yang sedang distabilkan (detik)
+STABLE_CHECK_INTERVAL = 1.0
+
+# Umur minimal mtime folder sebelum boleh dipakai untuk skip scan (resolusi mtime SMB/FAT 2 detik)
+FOLDER_MTIME_GRACE_NS = 2_000_000_000
+
+
+def _file_ext(name: str) -> str:
+    """
+    Ekstensi lowercase dari nama file ('' jika tidak ada), lebih ringan dari os.path.splitext
+    
+    Args:
+        name: Nama file (tanpa folder)
+    """
+    dot = name.rfind('.')
+    return name[dot:].lower() if dot > 0 else ''
+
+
+class _FolderEventHandler(FileSystemEventHandler):
+    """
+    Meneruskan event file dari watchdog ke FileMonitor (dipanggil di thread observer)
+    """
+    
+    def __init__(self, monitor: 'FileMonitor'):
+        super().__init__()
+        self.monitor = monitor
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self.monitor._on_fs_event(event.src_path)
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.monitor._on_fs_event(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.monitor._on_fs_event(event.dest_path)
+    
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.monitor._on_fs_event(event.src_path)
+
+
 class FileMonitor:
     """
     Kelas untuk memonitor folder 12 dan mendeteksi file baru
@@ -36,8 +92,8 @@ class FileMonitor:
             queue_manager: QueueManager instance
             polling_interval: Interval polling dalam detik (fallback)
         """
-        self.source_folders = source_folders
-        self.extensions = extensions
+        self.source_folders = list(source_folders)  # Salinan: diubah lewat add/remove/set_source_folders
+        self.extensions = extensions  # Property: sekaligus membangun _ext_set
         self.queue_manager = queue_manager
         self.polling_interval = polling_interval
         
@@ -50,9 +106,19 @@ class FileMonitor:
         # State untuk file yang sedang aktif di-copy (tracking progress)
         self.active_copies: Dict[str, dict] = {}  # {file_path: info}
         
+        # mtime folder saat scan terakhir (folder tidak berubah = tidak perlu listing ulang)
+        self._folder_mtime: Dict[str, int] = {}  # {folder: st_mtime_ns}
+        
         self.running = False
         self.monitor_thread = None
         
+        # Event OS (watchdog): path yang berubah, dikumpulkan dari thread observer
+        self._observer = None
+        self._watches: Dict[str, object] = {}  # {os.path.normpath(folder): ObservedWatch}
+        self._event_paths: set = set()
+        self._event_lock = threading.Lock()
+        self._wake = threading.Event()
+        
         # Callbacks
         self.detection_callbacks = []
         
@@ -61,6 +127,17 @@ class FileMonitor:
             logger.info(f"  - Monitoring: {folder}")
         logger.info(f"  - Extensions: {extensions}")
     
+    @property
+    def extensions(self) -> List[str]:
+        """Daftar ekstensi file yang diproses"""
+        return self._extensions
+    
+    @extensions.setter
+    def extensions(self, extensions: List[str]):
+        """Set daftar ekstensi; _ext_set (dipakai saat scan / event) ikut dibangun ulang"""
+        self._extensions = extensions
+        self._ext_set = frozenset(ext.lower() for ext in extensions)
+    
     def start(self):
         """Start monitoring"""
         if self.running:
@@ -69,6 +146,11 @@ class FileMonitor:
         
         self.running = True
         
+        self._wake.clear()
+        
+        # Event OS dipasang sebelum scan awal supaya tidak ada file yang terlewat di antaranya
+        self._start_observer()
+        
         # Initialize seen files
         for folder in self.source_folders:
             self.seen_files[folder] = set()
@@ -83,34 +165,178 @@ class FileMonitor:
     def stop(self):
         """Stop monitoring"""
         self.running = False
+        self._wake.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        self._stop_observer()
         logger.info("FileMonitor stopped")
     
+    # ===== EVENT OS (WATCHDOG) =====
+    
+    def _start_observer(self):
+        """Pasang observer watchdog untuk semua folder lokal (jika tersedia)"""
+        if not HAS_WATCHDOG:
+            logger.info("watchdog not installed, using polling for all folders")
+            return
+        
+        try:
+            self._observer = Observer()
+            self._observer.start()
+        except Exception as e:
+            logger.warning(f"Cannot start file system observer ({e}), using polling")
+            self._observer = None
+            return
+        
+        for folder in self.source_folders:
+            self._watch_folder(folder)
+    
+    def _stop_observer(self):
+        """Hentikan observer watchdog"""
+        observer = self._observer
+        self._observer = None
+        self._watches.clear()
+        if observer is not None:
+            try:
+                observer.stop()
+                observer.join(timeout=5)
+            except Exception as e:
+                logger.error(f"Error stopping observer: {e}")
+    
+    def _is_network_path(self, folder: str) -> bool:
+        """Share SMB (UNC) tidak mengirim event dengan andal, tetap di-poll"""
+        return folder.startswith('\\\\') or folder.startswith('//')
+    
+    def _is_watched(self, folder: str) -> bool:
+        """True jika folder mendapat event OS (tidak perlu di-poll)"""
+        return os.path.normpath(folder) in self._watches
+    
+    def _watch_folder(self, folder: str):
+        """
+        Daftarkan satu folder ke observer
+        
+        Args:
+            folder: Path folder
+        """
+        if self._observer is None or self._is_watched(folder):
+            return
+        if self._is_network_path(folder) or not os.path.isdir(folder):
+            logger.info(f"  - Polling: {folder}")
+            return
+        
+        try:
+            self._watches[os.path.normpath(folder)] = self._observer.schedule(
+                _FolderEventHandler(self), folder, recursive=False
+            )
+            logger.info(f"  - Watching (OS events): {folder}")
+        except Exception as e:
+            logger.warning(f"Cannot watch {folder} ({e}), using polling")
+    
+    def _unwatch_folder(self, folder: str):
+        """
+        Lepas satu folder dari observer
+        
+        Args:
+            folder: Path folder
+        """
+        watch = self._watches.pop(os.path.normpath(folder), None)
+        if watch is not None and self._observer is not None:
+            try:
+                self._observer.unschedule(watch)
+            except Exception as e:
+                logger.debug(f"Error unscheduling {folder}: {e}")
+    
+    def _on_fs_event(self, path: str):
+        """
+        Dipanggil dari thread observer: catat path lalu bangunkan monitor loop
+        
+        Args:
+            path: Path file yang dibuat/diubah/dipindah/dihapus
+        """
+        with self._event_lock:
+            self._event_paths.add(path)
+        self._wake.set()
+    
+    def _process_fs_events(self):
+        """Proses path dari event OS (di thread monitor)"""
+        with self._event_lock:
+            if not self._event_paths:
+                return
+            paths = self._event_paths
+            self._event_paths = set()
+        
+        # Event membawa path ter-normalisasi, folder di settings bisa saja berakhiran separator
+        folders = {os.path.normpath(folder): folder for folder in self.source_folders}
+        
+        for item_path in paths:
+            key = os.path.normpath(os.path.dirname(item_path))
+            folder = folders.get(key)
+            if folder is None or key not in self._watches:
+                continue
+            
+            item = os.path.basename(item_path)
+            if _file_ext(item) not in self._ext_set:
+                continue
+            
+            seen = self.seen_files.setdefault(folder, set())
+            if not os.path.isfile(item_path):
+                # File dihapus / dipindah keluar
+                seen.discard(item)
+                continue
+            
+            if item not in seen:
+                seen.add(item)
+                self._track_new_file(folder, item, item_path)
+    
+    # ===== MONITOR LOOP =====
+    
     def _monitor_loop(self):
         """Main monitoring loop"""
         logger.info(f"Monitor loop started (interval: {self.polling_interval}s)")
         
+        # start() baru saja scan semua folder, jadi scan berikutnya satu interval lagi
+        next_poll = time.monotonic() + self.polling_interval  # scan folder yang tidak di-watch (SMB)
+        next_full_scan = time.monotonic() + SMB_CHANGE_TIMEOUT  # scan pengaman folder yang di-watch
+        
         while self.running:
+            now = time.monotonic()
             try:
-                # Scan folder untuk file baru
-                for folder in self.source_folders:
-                    self._scan_folder(folder)
+                # Scan folder untuk file baru (hanya yang perlu di-poll, atau saat scan pengaman)
+                poll_due = now >= next_poll
+                full_due = now >= next_full_scan
+                if poll_due or full_due:
+                    for folder in list(self.source_folders):
+                        if full_due or not self._is_watched(folder):
+                            self._scan_folder(folder)
+                    if poll_due:
+                        next_poll = now + self.polling_interval
+                    if full_due:
+                        next_full_scan = now + SMB_CHANGE_TIMEOUT
+                
+                # File baru dari event OS
+                self._process_fs_events()
                 
                 # Cek kestabilan file (metode lama - untuk kompatibilitas)
-                self._check_stable_files()
+                if self.stable_files:
+                    self._check_stable_files()
                 
                 # Update progress untuk file yang sedang di-copy (metode baru)
-                self._update_copy_progress()
+                if self.active_copies:
+                    self._update_copy_progress()
                 
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
             
-            # Sleep
-            for _ in range(self.polling_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Tunggu: 1 detik selama ada file yang dipantau, selain itu sampai event OS
+            # atau jadwal scan berikutnya
+            if self.stable_files or self.active_copies:
+                timeout = 1.0
+            else:
+                has_polled = any(not self._is_watched(folder) for folder in self.source_folders)
+                next_due = min(next_poll, next_full_scan) if has_polled else next_full_scan
+                timeout = max(0.0, next_due - time.monotonic())
+            
+            self._wake.wait(timeout)
+            self._wake.clear()
     
     def _scan_folder(self, folder: str, initial: bool = False):
         """
@@ -121,13 +347,30 @@ class FileMonitor:
             initial: True jika scan pertama kali
         """
         try:
-            if not os.path.exists(folder):
+            # mtime folder berubah setiap ada file ditambah/dihapus/di-rename
+            try:
+                folder_mtime = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
                 logger.warning(f"Folder not found: {folder}")
+                self._folder_mtime.pop(folder, None)
                 return
             
-            # Dapatkan semua file
+            if not initial and self._folder_mtime.get(folder) == folder_mtime:
+                return
+            
+            # Jangan cache mtime yang terlalu baru: resolusi mtime (FAT/SMB) bisa kasar,
+            # file yang dibuat di detik yang sama bisa tidak mengubah mtime
+            if time.time_ns() - folder_mtime > FOLDER_MTIME_GRACE_NS:
+                self._folder_mtime[folder] = folder_mtime
+            else:
+                self._folder_mtime.pop(folder, None)
+            
+            # Dapatkan semua file (scandir: tipe entry ikut dari readdir, tanpa stat tambahan)
             try:
-                all_items = os.listdir(folder)
+                entries = os.scandir(folder)
+            except FileNotFoundError:
+                logger.warning(f"Folder not found: {folder}")
+                return
             except PermissionError:
                 logger.error(f"Permission denied accessing folder: {folder}")
                 return
@@ -136,42 +379,27 @@ class FileMonitor:
                 return
             
             current_files = set()
+            ext_set = self._ext_set
+            seen = self.seen_files.setdefault(folder, set())
             
-            for item in all_items:
-                item_path = os.path.join(folder, item)
-                
-                # Skip folder
-                if os.path.isdir(item_path):
-                    continue
-                
-                # Cek ekstensi
-                if not is_video_file(item, self.extensions):
-                    continue
-                
-                current_files.add(item)
-                
-                # Cek file baru (belum pernah dilihat)
-                if folder not in self.seen_files:
-                    self.seen_files[folder] = set()
-                
-                if not initial and item not in self.seen_files[folder]:
-                    # File baru terdeteksi
-                    try:
-                        file_size = os.path.getsize(item_path)
-                        logger.info(f"📂 New file detected: {item} ({file_size/(1024**3):.2f}GB) in {folder}")
-                        
-                        # Masukkan ke active_copies untuk tracking dengan rename test
-                        self.active_copies[item_path] = {
-                            'filename': item,
-                            'first_seen': time.time(),
-                            'last_size': file_size,
-                            'last_active': time.time(),
-                            'folder': folder,
-                            'status': 'copying'
-                        }
-                        
-                    except Exception as e:
-                        logger.error(f"Error getting size for new file {item}: {e}")
+            with entries:
+                for entry in entries:
+                    item = entry.name
+                    
+                    # Cek ekstensi dulu (tanpa syscall)
+                    if _file_ext(item) not in ext_set:
+                        continue
+                    
+                    # Skip folder
+                    if entry.is_dir():
+                        continue
+                    
+                    current_files.add(item)
+                    
+                    # Cek file baru (belum pernah dilihat)
+                    if not initial and item not in seen:
+                        # File baru terdeteksi
+                        self._track_new_file(folder, item, entry.path, entry)
             
             # Update seen files
             self.seen_files[folder] = current_files
@@ -179,22 +407,62 @@ class FileMonitor:
         except Exception as e:
             logger.error(f"Error scanning folder {folder}: {e}")
     
+    def _track_new_file(self, folder: str, item: str, item_path: str,
+                        entry: Optional[os.DirEntry] = None):
+        """
+        Masukkan file baru ke active_copies untuk tracking dengan rename test
+        
+        Args:
+            folder: Folder sumber
+            item: Nama file
+            item_path: Path lengkap file
+            entry: DirEntry dari scandir (optional, stat-nya di-cache di Windows)
+        """
+        if item_path in self.active_copies:
+            return
+        
+        try:
+            file_size = entry.stat().st_size if entry is not None else os.path.getsize(item_path)
+            logger.info(f"📂 New file detected: {item} ({file_size/(1024**3):.2f}GB) in {folder}")
+            
+            self.active_copies[item_path] = {
+                'filename': item,
+                'first_seen': time.time(),
+                'last_size': file_size,
+                'last_active': time.time(),
+                'folder': folder,
+                'status': 'copying'
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting size for new file {item}: {e}")
+    
     def _check_stable_files(self):
         """
         Cek file yang sudah stabil (tidak berubah ukurannya) - METODE LAMA
         Untuk kompatibilitas ke belakang
         """
+        if not self.stable_files:
+            return
+        
         to_remove = []
+        now = time.time()
         
         for file_path, info in self.stable_files.items():
+            # Baru dicek kurang dari STABLE_CHECK_INTERVAL yang lalu, tidak perlu stat lagi
+            if info.get('next_check_at', 0) > now:
+                continue
+            info['next_check_at'] = now + STABLE_CHECK_INTERVAL
+            
             try:
-                if not os.path.exists(file_path):
+                try:
+                    current_size = os.stat(file_path).st_size
+                except FileNotFoundError:
                     logger.debug(f"File removed before stabilization: {info['filename']}")
                     to_remove.append(file_path)
                     continue
                 
-                current_size = os.path.getsize(file_path)
-                time_since_first = time.time() - info['first_seen']
+                time_since_first = now - info['first_seen']
                 info['checked_count'] = info.get('checked_count', 0) + 1
                 
                 logger.debug(f"Checking {info['filename']}: size={current_size}, last_size={info['last_size']}, time={time_since_first:.1f}s")
@@ -359,16 +627,38 @@ class FileMonitor:
         if folder not in self.source_folders:
             self.source_folders.append(folder)
             self.seen_files[folder] = set()
+            self._watch_folder(folder)
+            self._wake.set()
             logger.info(f"Added source folder: {folder}")
     
     def remove_source_folder(self, folder: str):
         """Hapus folder sumber"""
         if folder in self.source_folders:
             self.source_folders.remove(folder)
+            self._unwatch_folder(folder)
             if folder in self.seen_files:
                 del self.seen_files[folder]
+            self._folder_mtime.pop(folder, None)
             logger.info(f"Removed source folder: {folder}")
     
+    def set_source_folders(self, folders: List[str]):
+        """
+        Ganti daftar folder sumber (misal dari Settings)
+        
+        Folder yang dihapus dilepas dari observer, folder baru di-watch; folder yang tetap
+        tidak disentuh (seen files-nya tidak hilang).
+        
+        Args:
+            folders: Daftar folder sumber baru
+        """
+        for folder in [folder for folder in self.source_folders if folder not in folders]:
+            self.remove_source_folder(folder)
+        for folder in folders:
+            self.add_source_folder(folder)
+        
+        # Urutan mengikuti settings
+        self.source_folders = list(folders)
+    
     def update_extensions(self, extensions: List[str]):
         """Update daftar ekstensi"""
         self.extensions = extensions
@@ -396,6 +686,7 @@ class FileMonitor:
             'folders_monitored': len(self.source_folders),
             'files_seen': total_files_seen,
             'active_copies': len(self.active_copies),
+            'watched_folders': len(self._watches),
             'extensions': self.extensions,
             'running': self.running
         }
@@ -403,6 +694,7 @@ class FileMonitor:
     def force_scan(self):
         """Force scan semua folder"""
         logger.info("Forcing scan...")
+        self._folder_mtime.clear()
         for folder in self.source_folders:
             self._scan_folder(folder)
         self._check_stable_files()
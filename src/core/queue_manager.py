@@ -4,15 +4,25 @@ Queue manager untuk antrian FIFO
 """
 
 import queue
+import itertools
 import threading
+import time
 import logging
-from typing import List, Optional, Callable
-from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, List, Optional, Callable
 from ..models.file_job import FileJob
 from ..constants.settings import STATUS_WAITING, STATUS_DOWNLOADING, STATUS_COMPLETED, STATUS_FAILED
 
 logger = logging.getLogger(__name__)
 
+# Penanda untuk membangunkan worker yang sedang menunggu di get_next_job (saat stop)
+_SENTINEL = object()
+
+# Prioritas item di queue (kecil = diambil lebih dulu); urutan sama diurutkan FIFO lewat counter
+_PRIORITY_WAKE = -1  # Sentinel stop
+_PRIORITY_RETRY = 0  # Job yang di-retry, didahulukan dari file baru
+_PRIORITY_NEW = 1
+
 class QueueManager:
     """
     Kelas untuk mengelola antrian FIFO
@@ -20,15 +30,22 @@ class QueueManager:
     
     def __init__(self):
         """Inisialisasi QueueManager"""
-        self.queue = queue.Queue()  # FIFO queue
+        # Handoff ke worker: (prioritas, urutan, job); retry masuk di depan file baru
+        self.queue = queue.PriorityQueue()
+        self._seq = itertools.count()
         self.jobs = {}  # Dictionary semua jobs: {filename: FileJob}
-        self.active_jobs = []  # List jobs yang sedang diproses
-        self.waiting_jobs = []  # List jobs yang menunggu
-        self.completed_jobs = []  # List jobs yang selesai
-        self.failed_jobs = []  # List jobs yang gagal
+        # Bookkeeping O(1): dict/OrderedDict sebagai "ordered set" (urutan tetap), set untuk sisanya
+        self.active_jobs: Dict[str, None] = {}  # Jobs yang sedang diproses (urutan mulai)
+        self.waiting_jobs: OrderedDict = OrderedDict()  # Jobs yang menunggu (urutan FIFO)
+        self._waiting_retries: Dict[str, None] = {}  # Retry di depan waiting_jobs (urutan retry)
+        self.completed_jobs = set()  # Jobs yang selesai
+        self.failed_jobs = set()  # Jobs yang gagal
+        
+        # queue_position hanya dihitung ulang saat dibaca dan ada job yang keluar dari antrian
+        self._positions_dirty = False
         
         self.lock = threading.Lock()
-        self.callbacks = []  # Untuk notifikasi perubahan
+        self.callbacks = ()  # Untuk notifikasi perubahan (tuple, diganti utuh saat register)
         
         logger.info("QueueManager initialized")
     
@@ -42,58 +59,83 @@ class QueueManager:
         Returns:
             Posisi dalam antrian
         """
+        # Cek apakah sudah ada
+        # if job.name in self.jobs:
+        #     logger.warning(f"Job {job.name} already exists in queue")
+        #     return self.get_position(job.name)
+        
+        # Set status dan timestamp
+        job.status = STATUS_WAITING
+        job.detected_time_ns = job.detected_time_ns or time.time_ns()
+        
+        # Lock hanya untuk bookkeeping dict
         with self.lock:
-            # Cek apakah sudah ada
-            # if job.name in self.jobs:
-            #     logger.warning(f"Job {job.name} already exists in queue")
-            #     return self.get_position(job.name)
-            
-            # Set status dan timestamp
-            job.status = STATUS_WAITING
-            job.detected_time = job.detected_time or datetime.now()
-            
-            # Simpan job
             self.jobs[job.name] = job
-            self.waiting_jobs.append(job.name)
-            
-            # Masukkan ke queue
-            self.queue.put(job)
-            
-            # Update posisi
-            self._update_positions()
-            
-            logger.info(f"Job added to queue: {job.name} (size: {job.size_gb:.2f}GB)")
-            self._notify_callbacks('added', job)
+            if job.name in self.waiting_jobs:
+                # Nama yang sama ditambah lagi: pindah ke belakang
+                del self.waiting_jobs[job.name]
+                self._waiting_retries.pop(job.name, None)
+                self._positions_dirty = True
+            self.waiting_jobs[job.name] = None
             
-            return self.get_position(job.name)
+            # Job baru selalu di belakang antrian
+            position = len(self.waiting_jobs)
+            job.queue_position = position
+        
+        # Masukkan ke queue (sesudah bookkeeping, supaya worker selalu menemukan job di dict)
+        self.queue.put((_PRIORITY_NEW, next(self._seq), job))
+        
+        logger.info(f"Job added to queue: {job.name} (size: {job.size_gb:.2f}GB)")
+        self._notify_callbacks('added', job)
+        
+        return position
     
-    def get_next_job(self) -> Optional[FileJob]:
+    def get_next_job(self, timeout: float = 30) -> Optional[FileJob]:
         """
         Ambil job berikutnya dari antrian (blocking)
         
+        Args:
+            timeout: Maksimal detik menunggu job baru
+            
         Returns:
-            FileJob object atau None jika queue kosong
+            FileJob object atau None jika queue kosong / worker dibangunkan untuk stop
         """
         try:
-            job = self.queue.get(timeout=1)
-            
-            with self.lock:
-                if job.name in self.jobs:
-                    job.status = STATUS_DOWNLOADING
-                    self.active_jobs.append(job.name)
-                    if job.name in self.waiting_jobs:
-                        self.waiting_jobs.remove(job.name)
-                    
-                    logger.info(f"Job started: {job.name}")
-                    self._notify_callbacks('started', job)
-                    
-                    return job
-                else:
-                    logger.warning(f"Job {job.name} not found in jobs dict")
-                    return None
-                    
+            _, _, job = self.queue.get(timeout=timeout)
         except queue.Empty:
             return None
+        
+        if job is _SENTINEL:
+            return None
+        
+        with self.lock:
+            if job.name not in self.jobs:
+                logger.warning(f"Job {job.name} not found in jobs dict")
+                return None
+            
+            job.status = STATUS_DOWNLOADING
+            self.active_jobs[job.name] = None
+            if job.name in self.waiting_jobs:
+                # Job keluar dari antrian: posisi job di belakangnya bergeser
+                del self.waiting_jobs[job.name]
+                self._waiting_retries.pop(job.name, None)
+                self._positions_dirty = True
+            job.queue_position = None
+        
+        logger.info(f"Job started: {job.name}")
+        self._notify_callbacks('started', job)
+        
+        return job
+    
+    def wake_workers(self, count: int):
+        """
+        Bangunkan worker yang sedang menunggu job (dipanggil saat worker dihentikan)
+        
+        Args:
+            count: Jumlah worker yang perlu dibangunkan
+        """
+        for _ in range(count):
+            self.queue.put((_PRIORITY_WAKE, next(self._seq), _SENTINEL))
     
     def complete_job(self, job: FileJob, success: bool = True):
         """
@@ -111,24 +153,17 @@ class QueueManager:
             # Update status
             if success:
                 job.status = STATUS_COMPLETED
-                self.completed_jobs.append(job.name)
+                self.completed_jobs.add(job.name)
                 logger.info(f"Job completed: {job.name}")
             else:
                 job.status = STATUS_FAILED
-                self.failed_jobs.append(job.name)
+                self.failed_jobs.add(job.name)
                 logger.warning(f"Job failed: {job.name}")
             
             # Hapus dari active
-            if job.name in self.active_jobs:
-                self.active_jobs.remove(job.name)
-            
-            # Update posisi
-            self._update_positions()
-            
-            # Mark as done di queue
-            self.queue.task_done()
-            
-            self._notify_callbacks('completed' if success else 'failed', job)
+            self.active_jobs.pop(job.name, None)
+        
+        self._notify_callbacks('completed' if success else 'failed', job)
     
     def fail_job(self, job: FileJob, error: str, retry: bool = True):
         """
@@ -142,25 +177,33 @@ class QueueManager:
         with self.lock:
             job.retry_count += 1
             job.last_error = error
+            requeue = retry and job.retry_count < job.max_retry
             
-            if retry and job.retry_count < job.max_retry:
-                # Kembalikan ke antrian untuk retry
+            if requeue:
+                # Kembalikan ke depan antrian untuk retry (tidak menunggu di belakang file baru),
+                # di belakang retry lain yang sudah menunggu: sama dengan urutan (prioritas, seq) di queue
                 job.status = STATUS_WAITING
-                self.waiting_jobs.append(job.name)
-                self.queue.put(job)
-                logger.warning(f"Job {job.name} will retry ({job.retry_count}/{job.max_retry})")
+                self.waiting_jobs[job.name] = None
+                self.waiting_jobs.move_to_end(job.name, last=False)
+                for name in reversed(self._waiting_retries):
+                    self.waiting_jobs.move_to_end(name, last=False)
+                self._waiting_retries[job.name] = None
+                self._positions_dirty = True
             else:
                 # Gagal permanen
                 job.status = STATUS_FAILED
-                self.failed_jobs.append(job.name)
-                logger.error(f"Job failed permanently: {job.name} - {error}")
+                self.failed_jobs.add(job.name)
             
             # Hapus dari active
-            if job.name in self.active_jobs:
-                self.active_jobs.remove(job.name)
-            
-            self._update_positions()
-            self._notify_callbacks('failed', job)
+            self.active_jobs.pop(job.name, None)
+        
+        if requeue:
+            self.queue.put((_PRIORITY_RETRY, next(self._seq), job))
+            logger.warning(f"Job {job.name} will retry ({job.retry_count}/{job.max_retry})")
+        else:
+            logger.error(f"Job failed permanently: {job.name} - {error}")
+        
+        self._notify_callbacks('failed', job)
     
     def get_job(self, filename: str) -> Optional[FileJob]:
         """Dapatkan job berdasarkan nama file"""
@@ -174,19 +217,24 @@ class QueueManager:
     def get_active_jobs(self) -> List[FileJob]:
         """Dapatkan jobs yang sedang aktif"""
         with self.lock:
-            return [self.jobs[name] for name in self.active_jobs if name in self.jobs]
+            get = self.jobs.get
+            return [job for job in map(get, self.active_jobs) if job is not None]
     
     def get_waiting_jobs(self) -> List[FileJob]:
-        """Dapatkan jobs yang menunggu"""
+        """Dapatkan jobs yang menunggu (posisi antrian dihitung di sini, bukan di setiap transisi)"""
         with self.lock:
-            return [self.jobs[name] for name in self.waiting_jobs if name in self.jobs]
+            self._refresh_positions()
+            get = self.jobs.get
+            return [job for job in map(get, self.waiting_jobs) if job is not None]
     
     def get_position(self, filename: str) -> int:
-        """Dapatkan posisi job dalam antrian (tanpa lock)"""
-        # Tanpa lock dulu untuk testing
-        if filename in self.waiting_jobs:
-            return self.waiting_jobs.index(filename) + 1
-        return 0
+        """Dapatkan posisi job dalam antrian (0 jika tidak sedang menunggu)"""
+        with self.lock:
+            if filename not in self.waiting_jobs:
+                return 0
+            self._refresh_positions()
+            job = self.jobs.get(filename)
+            return (job.queue_position or 0) if job is not None else 0
         
     def queue_size(self) -> int:
         """Jumlah job dalam antrian (waiting)"""
@@ -196,18 +244,28 @@ class QueueManager:
         """Jumlah job aktif"""
         return len(self.active_jobs)
     
+    def _refresh_positions(self):
+        """Hitung ulang queue_position hanya jika ada job yang keluar dari antrian (lock dipegang caller)"""
+        if self._positions_dirty:
+            self._update_positions()
+            self._positions_dirty = False
+    
     def _update_positions(self):
         """Update posisi semua job dalam antrian"""
-        for i, name in enumerate(self.waiting_jobs):
-            if name in self.jobs:
-                self.jobs[name].queue_position = i + 1
+        get = self.jobs.get
+        for i, name in enumerate(self.waiting_jobs, 1):
+            job = get(name)
+            if job is not None:
+                job.queue_position = i
     
     def register_callback(self, callback: Callable):
         """Register callback untuk notifikasi perubahan"""
-        self.callbacks.append(callback)
+        # Copy-on-write: pembaca tidak perlu lock atau salinan list
+        with self.lock:
+            self.callbacks = self.callbacks + (callback,)
     
     def _notify_callbacks(self, event: str, job: FileJob):
-        """Notifikasi ke semua callback"""
+        """Notifikasi ke semua callback (dipanggil di luar lock)"""
         for callback in self.callbacks:
             try:
                 callback(event, job)
@@ -218,9 +276,8 @@ class QueueManager:
         """Hapus jobs yang sudah completed/failed dari memory"""
         with self.lock:
             # Hapus dari jobs dict
-            for name in self.completed_jobs + self.failed_jobs:
-                if name in self.jobs:
-                    del self.jobs[name]
+            for name in self.completed_jobs | self.failed_jobs:
+                self.jobs.pop(name, None)
             
             # Clear lists
             self.completed_jobs.clear()
@@ -89,7 +89,6 @@ class UploadWorker51(threading.Thread):
         logger.info(f"Size: {job.file_size} bytes")
         
         # ========== CEK SOURCE PATH ==========
-        import os
         if not job.source_path or job.source_path == "":
             logger.error(f"Source path is EMPTY for {job.file_name}")
             self.queue_manager.fail_job(job, "Source path is empty", retry=False)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Copy file dengan io_uring (liburing, opsional, hanya Linux)
+
+Setiap chunk dikirim sebagai pasangan read → write yang di-link (IOSQE_IO_LINK),
+jadi satu io_uring_submit cukup untuk satu chunk dan kernel langsung menulis
+setelah read selesai. URING_QUEUE_DEPTH pasangan berjalan bersamaan, sehingga
+read chunk berikutnya overlap dengan write chunk sebelumnya.
+"""
+
+import os
+import sys
+import logging
+from typing import Callable
+
+try:
+    from liburing import (
+        Ring, Cqe, IOSQE_ASYNC, IOSQE_IO_LINK,
+        io_uring_queue_init, io_uring_queue_exit, io_uring_get_sqe, io_uring_submit,
+        io_uring_prep_read, io_uring_prep_write, io_uring_sqe_set_data64, io_uring_sqe_set_flags,
+        io_uring_wait_cqe, io_uring_cqe_seen
+    )
+    HAS_LIBURING = sys.platform.startswith('linux')
+except ImportError:
+    HAS_LIBURING = False
+
+logger = logging.getLogger(__name__)
+
+# Jumlah pasangan read/write yang in-flight (masing-masing memakai satu buffer)
+URING_QUEUE_DEPTH = 8
+
+
+def uring_copy(src_fd: int, dst_fd: int, start: int, end: int, chunk_size: int,
+               on_progress: Callable[[int], None]) -> bool:
+    """
+    Copy rentang [start, end) dari src_fd ke dst_fd di offset yang sama
+
+    Args:
+        src_fd: File descriptor source
+        dst_fd: File descriptor destination (sudah di-truncate/preallocate oleh caller)
+        start: Offset awal (posisi resume)
+        end: Offset akhir (ukuran file)
+        chunk_size: Ukuran buffer per chunk
+        on_progress: Dipanggil dengan jumlah bytes yang sudah utuh ditulis dari awal file
+
+    Returns:
+        False jika io_uring tidak bisa dipakai (belum ada IO yang dilakukan),
+        True jika copy selesai. Error IO dilempar sebagai OSError/IOError.
+    """
+    if not HAS_LIBURING:
+        return False
+
+    ring = Ring()
+    try:
+        io_uring_queue_init(URING_QUEUE_DEPTH * 2, ring)
+    except OSError as e:
+        # Kernel / container tidak mengizinkan io_uring
+        logger.debug(f"io_uring not available ({e})")
+        return False
+
+    # Buffer dipakai kernel sampai CQE-nya diambil: saat error, semua CQE yang tersisa
+    # ditunggu dulu (_drain) sebelum ring ditutup dan buffer dilepas
+    buffers = [bytearray(chunk_size) for _ in range(URING_QUEUE_DEPTH)]
+    slots = {}  # slot -> (offset, buffer)
+    completed = {}  # offset -> panjang, write yang selesai di luar urutan
+
+    next_offset = start
+    prefix = start
+    inflight = 0  # Pasangan read/write yang belum selesai
+    prepared = 0  # SQE yang sudah disiapkan tapi belum di-submit
+    pending = 0  # CQE yang masih akan datang dari kernel
+
+    def submit_chunk(slot: int):
+        nonlocal next_offset, prepared
+        length = min(chunk_size, end - next_offset)
+        buf = buffers[slot] if length == chunk_size else bytearray(length)
+        slots[slot] = (next_offset, buf)
+
+        # Read dengan IO_LINK: write baru jalan setelah read penuh (short read membatalkan write)
+        sqe = io_uring_get_sqe(ring)
+        io_uring_prep_read(sqe, src_fd, buf, next_offset)
+        io_uring_sqe_set_data64(sqe, slot << 1)
+        io_uring_sqe_set_flags(sqe, IOSQE_ASYNC | IOSQE_IO_LINK)
+
+        sqe = io_uring_get_sqe(ring)
+        io_uring_prep_write(sqe, dst_fd, buf, next_offset)
+        io_uring_sqe_set_data64(sqe, (slot << 1) | 1)
+
+        next_offset += length
+        prepared += 2
+
+    def submit():
+        nonlocal prepared, pending
+        io_uring_submit(ring)
+        pending += prepared
+        prepared = 0
+
+    cqe = Cqe()
+    try:
+        for slot in range(URING_QUEUE_DEPTH):
+            if next_offset >= end:
+                break
+            submit_chunk(slot)
+            inflight += 1
+        submit()
+
+        while inflight:
+            io_uring_wait_cqe(ring, cqe)
+            entry = cqe[0]
+            res, user_data = entry.res, entry.user_data
+            io_uring_cqe_seen(ring, entry)
+            pending -= 1
+
+            slot, is_write = user_data >> 1, user_data & 1
+            offset, buf = slots[slot]
+            if res < 0:
+                raise OSError(-res, os.strerror(-res))
+            if res != len(buf):
+                raise IOError(f"Short {'write' if is_write else 'read'} at offset {offset}")
+
+            if not is_write:
+                # Write pasangannya sudah di-link, tinggal tunggu completion-nya
+                continue
+
+            # Write selesai: majukan prefix yang sudah utuh, lalu pakai slot untuk chunk berikutnya
+            inflight -= 1
+            completed[offset] = res
+            while prefix in completed:
+                prefix += completed.pop(prefix)
+            on_progress(prefix)
+
+            if next_offset < end:
+                submit_chunk(slot)
+                inflight += 1
+                submit()
+    except BaseException:
+        # Pasangan lain masih berjalan dan kernel masih menulis ke buffer-nya
+        _drain(ring, cqe, pending)
+        raise
+    finally:
+        io_uring_queue_exit(ring)
+
+    return True
+
+
+def _drain(ring, cqe, pending: int):
+    """
+    Tunggu semua CQE yang tersisa (write yang di-link ke read gagal ikut selesai dengan -ECANCELED)
+
+    Args:
+        ring: Ring io_uring
+        cqe: Objek Cqe untuk menampung hasil
+        pending: Jumlah CQE yang masih akan datang
+    """
+    while pending:
+        try:
+            io_uring_wait_cqe(ring, cqe)
+        except InterruptedError:
+            continue
+        except OSError as e:
+            logger.error(f"Cannot drain io_uring completions ({e}), {pending} still pending")
+            return
+        io_uring_cqe_seen(ring, cqe[0])
+        pending -= 1
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Font bersama untuk widget GUI
+
+Widget yang dibuat berulang (label per job di panel progress) memakai objek Font
+yang sama, bukan tuple font yang di-resolve Tk setiap kali widget dibuat.
+"""
+
+import tkinter as tk
+from tkinter import font as tkfont
+from typing import NamedTuple
+
+# Font label per job di panel progress download / upload
+JOB_NAME_FONT = ('Arial', 9, 'bold')
+JOB_INFO_FONT = ('Arial', 8)
+JOB_EMPTY_FONT = ('Arial', 9, 'italic')
+
+_fonts = {}  # (interpreter Tk, spec) -> tkfont.Font
+_job_fonts = {}  # interpreter Tk -> JobFonts
+
+
+class JobFonts(NamedTuple):
+    """Font label per job (nama file, info speed/size/eta, pesan kosong)"""
+    name: tkfont.Font
+    info: tkfont.Font
+    empty: tkfont.Font
+
+
+def get_font(widget: tk.Misc, spec: tuple) -> tkfont.Font:
+    """
+    Ambil objek Font untuk spec, dibuat sekali per interpreter Tk
+
+    Args:
+        widget: Widget apa saja milik aplikasi (untuk menentukan root Tk)
+        spec: Tuple font Tk, misal ('Arial', 9, 'bold')
+
+    Returns:
+        tkfont.Font yang bisa dipakai ulang di opsi font= widget
+    """
+    key = (widget.tk, spec)
+    font = _fonts.get(key)
+    if font is None:
+        font = tkfont.Font(root=widget, font=spec)
+        _fonts[key] = font
+    return font
+
+
+def job_fonts(widget: tk.Misc) -> JobFonts:
+    """
+    Font label per job, di-resolve sekali per interpreter Tk lalu dipakai ulang semua panel
+
+    Args:
+        widget: Widget apa saja milik aplikasi (untuk menentukan root Tk)
+
+    Returns:
+        JobFonts
+    """
+    fonts = _job_fonts.get(widget.tk)
+    if fonts is None:
+        fonts = JobFonts(
+            get_font(widget, JOB_NAME_FONT),
+            get_font(widget, JOB_INFO_FONT),
+            get_font(widget, JOB_EMPTY_FONT),
+        )
+        _job_fonts[widget.tk] = fonts
+    return fonts
@@ -9,15 +9,63 @@ from tkinter import ttk, messagebox
 import os
 import time
 import re
+import mmap
+import queue
 import logging  
 import shutil
+import threading
+from collections import deque
 from datetime import datetime
+from typing import Tuple
 from ..utils.history import HistoryLogger
-from ..utils.path_utils import get_data_path
-from ..constants.settings import REFRESH_INTERVAL, HISTORY_FILE
+from ..utils.path_utils import get_data_path, open_file
+from ..constants.settings import (
+    REFRESH_INTERVAL, HISTORY_FILE, HISTORY_MAX_ENTRIES, HISTORY_DISPLAY_ROWS,
+    HISTORY_PARSE_POLL_MS
+)
 
 logger = logging.getLogger(__name__)
 
+# Satu baris history: TIMESTAMP(2 kolom) FILENAME... SIZE GB STATUS DURATION RETRY [DEST]
+# Filename boleh berisi spasi; size = angka pertama yang diikuti "GB".
+# Pattern bytes: dicocokkan langsung ke mmap file, hanya field yang cocok yang di-decode
+_LINE_RE = re.compile(
+    rb'\s*(\S+ \S+)\s+(.+?)\s+([\d.,()]*\d[\d.,()]*)\s+GB\s+(\S+)\s+(\S+)\s+(\S+)(?:\s+(\S+))?'
+)
+
+
+# Baris dari HistoryLogger._format_entry sudah fixed-width (filename dipotong ke 38 karakter):
+# TIMESTAMP(20) FILENAME(40) SIZE(11) " GB " STATUS(10) DURATION(10) RETRY(5) DEST(5).
+# Baris ASCII dengan panjang persis ini cukup di-slice; selain itu lewat _LINE_RE
+_FIXED_LINE_LEN = 110
+_FIXED_GB_SLICE = slice(73, 77)
+
+# Tag warna baris treeview per status
+_STATUS_TAGS = {
+    'SUCCESS': ('success_row',),
+    'FAILED': ('failed_row',),
+}
+
+def _parse_epoch(timestamp: str) -> float:
+    """
+    Konversi timestamp history "YYYY-MM-DD HH:MM:SS" (waktu lokal) ke epoch
+    
+    Args:
+        timestamp: String timestamp dari file history
+        
+    Returns:
+        Epoch detik, atau inf jika format tidak dikenal (entry dianggap setelah clear)
+    """
+    try:
+        return time.mktime((
+            int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+            int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]),
+            0, 0, -1
+        ))
+    except (ValueError, OverflowError):
+        return float('inf')
+
+
 class HistoryPanel(ttk.Frame):
     """
     Panel untuk menampilkan history file yang sudah dicopy/dihapus
@@ -36,8 +84,28 @@ class HistoryPanel(ttk.Frame):
         self.history_logger = history_logger
         self.after_id = None
         self.last_clear_time = time.time()
-        self.all_entries = []
-        self.filtered_entries = []
+        
+        # Entry history (lama → baru); file history hanya di-append, jadi cukup baca bagian baru
+        self.all_entries = deque(maxlen=HISTORY_MAX_ENTRIES)
+        self.displayed_count = 0  # Jumlah entry yang lolos filter (setelah clear)
+        
+        # Statistik berjalan atas isi all_entries (diupdate saat entry masuk/terbuang)
+        self._success_count = 0
+        self._failed_count = 0
+        self._total_gb = 0.0
+        self._dest_counts = {'70': 0, '51': 0, '40': 0}
+        self._view_key = None  # (filter status, filter dest, last_clear_time) tampilan tree saat ini
+        
+        # Posisi baca file history (hanya dipakai thread parser)
+        self._history_offset = 0  # Posisi byte yang sudah dibaca
+        self._history_mtime = 0.0
+        self._history_ino = 0  # Inode file yang sedang dibaca (beda = file dibuat ulang)
+        
+        # Baca + parse file di thread parser, Tk thread hanya update widget
+        self._parse_requests = queue.SimpleQueue()  # True = parse, None = berhenti
+        self._parse_results = queue.SimpleQueue()  # (reset, entries)
+        self._pending_parses = 0
+        self._drain_id = None
         
         # Path untuk disk usage - menggunakan path_utils
         self.history_path = get_data_path(HISTORY_FILE)
@@ -46,6 +114,9 @@ class HistoryPanel(ttk.Frame):
         self.dest_40_path = r"D:/Test watch folder/destination 40"
         
         self._create_widgets()
+        
+        self._parse_thread = threading.Thread(target=self._parser_loop, daemon=True, name="HistoryParser")
+        self._parse_thread.start()
         self._refresh_display()
     
     def _get_disk_usage(self, path):
@@ -163,55 +234,110 @@ class HistoryPanel(ttk.Frame):
         self.storage_text.config(state='disabled')
     
     def _refresh_display(self):
-        """Refresh tampilan history"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Baca history dari file
-        self.all_entries = self._parse_history_file()
-        
-        # Filter berdasarkan status
-        filter_by = self.filter_var.get()
-        if filter_by != "All":
-            self.filtered_entries = [e for e in self.all_entries if e['status'] == filter_by]
-        else:
-            self.filtered_entries = self.all_entries.copy()
+        """Minta thread parser membaca entry baru, hasilnya diterapkan di _drain_results"""
+        # Dipanggil juga dari filter/tombol: batalkan jadwal lama agar hanya ada satu rantai refresh
+        if self.after_id:
+            self.after_cancel(self.after_id)
+            self.after_id = None
         
-        # Filter berdasarkan destination
-        dest_filter = self.dest_filter_var.get()
-        if dest_filter != "All":
-            self.filtered_entries = [e for e in self.filtered_entries if e.get('dest', '') == dest_filter]
+        # Parse yang masih berjalan sudah cukup; hasilnya diterapkan dengan filter terbaru
+        if not self._pending_parses:
+            self._pending_parses += 1
+            self._parse_requests.put(True)
+        if self._drain_id is None:
+            self._drain_id = self.after(HISTORY_PARSE_POLL_MS, self._drain_results)
         
-        # Filter berdasarkan waktu (hanya yang setelah last_clear_time)
-        display_entries = []
-        for entry in self.filtered_entries:
+        # Refresh lagi nanti
+        self.after_id = self.after(REFRESH_INTERVAL * 5, self._refresh_display)
+    
+    def _parser_loop(self):
+        """Loop thread parser: baca bagian baru file history setiap ada permintaan"""
+        while self._parse_requests.get() is not None:
+            self._parse_results.put(self._parse_history_file())
+    
+    def _drain_results(self):
+        """Ambil hasil parse dari thread parser lalu update tampilan (di Tk thread)"""
+        self._drain_id = None
+        
+        received = False
+        rebuild = False
+        new_entries = []
+        while True:
             try:
-                entry_time = datetime.strptime(entry['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
-                if entry_time > self.last_clear_time:
-                    display_entries.append(entry)
-            except:
-                display_entries.append(entry)
-        
-        # Insert entries ke treeview dengan warna sesuai status
-        for entry in display_entries[-100:]:
-            # Tentukan tag berdasarkan status
-            if entry['status'] == 'SUCCESS':
-                tags = ('success_row',)
-            elif entry['status'] == 'FAILED':
-                tags = ('failed_row',)
-            else:
-                tags = ()
+                reset, entries = self._parse_results.get_nowait()
+            except queue.Empty:
+                break
             
-            self.tree.insert('', 'end', values=(
-                entry['timestamp'],
-                entry['filename'],
-                entry['size'],
-                entry['status'],
-                entry['duration'],
-                entry['retry'],
-                entry.get('dest', '-')
-            ), tags=tags)
+            received = True
+            self._pending_parses -= 1
+            if reset:
+                # File diganti/dipotong: seluruh isi dibaca ulang
+                self._clear_entries()
+                new_entries = []
+                rebuild = True
+            self._add_entries(entries)
+            new_entries.extend(entries)
+        
+        if self._pending_parses > 0:
+            self._drain_id = self.after(HISTORY_PARSE_POLL_MS, self._drain_results)
+        
+        if received:
+            self._apply_entries(new_entries, rebuild)
+    
+    def _clear_entries(self):
+        """Kosongkan all_entries beserta statistik berjalannya"""
+        self.all_entries.clear()
+        self._success_count = 0
+        self._failed_count = 0
+        self._total_gb = 0.0
+        for dest in self._dest_counts:
+            self._dest_counts[dest] = 0
+    
+    def _count_entry(self, entry: dict, delta: int):
+        """
+        Tambah/kurangi statistik berjalan untuk satu entry
+        
+        Args:
+            entry: Entry history
+            delta: +1 saat entry masuk, -1 saat entry terbuang dari all_entries
+        """
+        status = entry['status']
+        if status == 'SUCCESS':
+            self._success_count += delta
+            self._total_gb += delta * self._parse_size(entry['size'])
+        elif status == 'FAILED':
+            self._failed_count += delta
+        
+        dest = entry.get('dest')
+        if dest in self._dest_counts:
+            self._dest_counts[dest] += delta
+    
+    def _add_entries(self, entries: list):
+        """Tambahkan entry ke all_entries, statistik entry yang terbuang (maxlen) dikurangi"""
+        all_entries = self.all_entries
+        maxlen = all_entries.maxlen
+        count_entry = self._count_entry
+        
+        for entry in entries:
+            if len(all_entries) == maxlen:
+                count_entry(all_entries[0], -1)
+            all_entries.append(entry)
+            count_entry(entry, 1)
+    
+    def _apply_entries(self, new_entries: list, rebuild: bool):
+        """
+        Terapkan entry baru ke tree, stats, dan storage
+        
+        Args:
+            new_entries: Entry baru (lama → baru) yang sudah ada di self.all_entries
+            rebuild: True jika tree harus diisi ulang dari awal
+        """
+        view_key = (self.filter_var.get(), self.dest_filter_var.get(), self.last_clear_time)
+        if rebuild or view_key != self._view_key:
+            self._view_key = view_key
+            self._rebuild_tree()
+        else:
+            self._append_to_tree(new_entries)
         
         # Update stats display
         self._update_stats_display()
@@ -225,25 +351,86 @@ class HistoryPanel(ttk.Frame):
             self.clear_info_label.config(text=f"Clear sejak: {clear_time_str}")
         else:
             self.clear_info_label.config(text="")
+    
+    def _matches_view(self, entry: dict) -> bool:
+        """Cek apakah entry lolos filter status, destination, dan waktu clear"""
+        filter_by, dest_filter, _ = self._view_key
+        if filter_by != "All" and entry['status'] != filter_by:
+            return False
+        if dest_filter != "All" and entry.get('dest', '') != dest_filter:
+            return False
+        return self._is_after_clear(entry)
+    
+    def _insert_rows(self, entries, index):
+        """
+        Insert beberapa entry ke treeview dengan warna sesuai status
         
-        # Refresh lagi nanti
-        self.after_id = self.after(REFRESH_INTERVAL * 5, self._refresh_display)
+        Args:
+            entries: Iterable entry, di-insert berurutan
+            index: Posisi insert ('end' atau 0 untuk paling atas)
+        """
+        insert = self.tree.insert
+        for entry in entries:
+            insert('', index, values=(
+                entry['timestamp'],
+                entry['filename'],
+                entry['size'],
+                entry['status'],
+                entry['duration'],
+                entry['retry'],
+                entry.get('dest', '-')
+            ), tags=_STATUS_TAGS.get(entry['status'], ()))
+    
+    def _rebuild_tree(self):
+        """Isi ulang seluruh tree (saat filter berubah, clear, atau file history diganti)"""
+        # Jalan dari yang terbaru: hanya HISTORY_DISPLAY_ROWS pertama yang disimpan, sisanya dihitung
+        newest = []
+        count = 0
+        matches_view = self._matches_view
+        for entry in reversed(self.all_entries):
+            if matches_view(entry):
+                if count < HISTORY_DISPLAY_ROWS:
+                    newest.append(entry)
+                count += 1
+        self.displayed_count = count
+        
+        # Kolom disembunyikan selama delete+insert massal agar Tk tidak menghitung
+        # ulang layout baris per insert; dikembalikan sekali di akhir
+        self.tree.configure(displaycolumns=())
+        try:
+            self.tree.delete(*self.tree.get_children())
+            # Terbaru di atas
+            self._insert_rows(newest, 'end')
+        finally:
+            self.tree.configure(displaycolumns='#all')
+    
+    def _append_to_tree(self, new_entries: list):
+        """Tambahkan entry baru di atas tree, buang baris terlama jika melebihi batas"""
+        added = [e for e in new_entries if self._matches_view(e)]
+        if not added:
+            return
+        
+        self.displayed_count += len(added)
+        # Yang lebih lama dari batas baris akan langsung terbuang, tidak perlu di-insert
+        self._insert_rows(added[-HISTORY_DISPLAY_ROWS:], 0)
+        
+        children = self.tree.get_children()
+        if len(children) > HISTORY_DISPLAY_ROWS:
+            self.tree.delete(*children[HISTORY_DISPLAY_ROWS:])
     
     def _update_stats_display(self):
         """Update panel statistik dengan format vertikal"""
         # Hitung statistik
         total = len(self.all_entries)
-        displayed = len([e for e in self.filtered_entries 
-                        if self._is_after_clear(e)])
-        
-        success = len([e for e in self.all_entries if e['status'] == 'SUCCESS'])
-        failed = len([e for e in self.all_entries if e['status'] == 'FAILED'])
+        displayed = self.displayed_count
         
-        to_70 = len([e for e in self.all_entries if e.get('dest') == '70'])
-        to_51 = len([e for e in self.all_entries if e.get('dest') == '51'])
-        to_40 = len([e for e in self.all_entries if e.get('dest') == '40'])
+        success = self._success_count
+        failed = self._failed_count
+        total_gb = self._total_gb
         
-        total_gb = sum(self._parse_size(e['size']) for e in self.all_entries if e['status'] == 'SUCCESS')
+        to_70 = self._dest_counts['70']
+        to_51 = self._dest_counts['51']
+        to_40 = self._dest_counts['40']
         
         # Format teks vertikal
         stats_text = f"""
@@ -258,7 +445,7 @@ Server 40: {to_40}
 Success: {success}
 Failed: {failed}
 
-Total: {total_gb:.2f} GB
+Total: {max(total_gb, 0.0):.2f} GB
         """
         
         # Update text widget
@@ -307,89 +494,127 @@ Total: {total_gb:.2f} GB
     
     def _is_after_clear(self, entry):
         """Cek apakah entry setelah last_clear_time"""
-        try:
-            entry_time = datetime.strptime(entry['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
-            return entry_time > self.last_clear_time
-        except:
-            return True
+        return entry['_epoch'] > self.last_clear_time
     
-    def _parse_history_file(self) -> list:
+    def _parse_history_file(self) -> Tuple[bool, list]:
         """
-        Parse file history dengan format baru (termasuk destination)
-        """
-        entries = []
+        Baca bagian baru file history (format baru, termasuk destination)
+        
+        Dipanggil dari thread parser. File history hanya di-append, jadi posisi
+        terakhir disimpan dan hanya byte sesudahnya yang di-parse.
         
+        Returns:
+            Tuple (reset, entries): reset True jika file diganti/dipotong dan
+            entries adalah seluruh isi file; entries urut lama → baru
+        """
         try:
-            if not os.path.exists(self.history_path):
+            try:
+                st = os.stat(self.history_path)
+            except FileNotFoundError:
                 self._create_empty_history()
-                return []
+                reset = self._history_offset > 0
+                self._history_offset = 0
+                self._history_mtime = 0.0
+                self._history_ino = 0
+                return reset, []
             
-            with open(self.history_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            # File lain (dibuat ulang), lebih kecil, atau mtime mundur: baca ulang dari awal
+            reset = (st.st_size < self._history_offset or st.st_mtime < self._history_mtime
+                     or (self._history_offset > 0 and st.st_ino != self._history_ino))
+            if reset:
+                self._history_offset = 0
+            self._history_mtime = st.st_mtime
+            self._history_ino = st.st_ino
             
-            # Skip header (first 5 lines)
-            for line in lines[5:]:
-                line = line.strip()
-                if not line or line.startswith('-') or line.startswith('='):
-                    continue
-                
-                # Split line menjadi parts
-                parts = line.split()
-                if len(parts) < 8:  # Minimal 8 kolom
-                    continue
-                
-                # Timestamp selalu di posisi 0 dan 1
-                timestamp = f"{parts[0]} {parts[1]}"
-                
-                # Cari posisi size (kolom dengan angka decimal)
-                size_idx = -1
-                for i, part in enumerate(parts):
-                    if i > 1 and part.replace('.', '').replace(',', '').replace('(','').replace(')','').isdigit():
-                        if i+1 < len(parts) and parts[i+1] == 'GB':
-                            size_idx = i
-                            break
-                
-                if size_idx == -1:
-                    continue
-                
-                # Filename adalah semua parts antara timestamp dan size
-                filename_parts = parts[2:size_idx]
-                filename = ' '.join(filename_parts)
-                
-                # Size dan unit
-                size = f"{parts[size_idx]} {parts[size_idx+1]}"
-                
-                # Status (setelah size+unit)
-                status_idx = size_idx + 2
-                status = parts[status_idx] if status_idx < len(parts) else "-"
-                
-                # Duration (setelah status)
-                duration_idx = status_idx + 1
-                duration = parts[duration_idx] if duration_idx < len(parts) else "-"
-                
-                # Retry (setelah duration)
-                retry_idx = duration_idx + 1
-                retry = parts[retry_idx] if retry_idx < len(parts) else "-"
-                
-                # Destination (setelah retry)
-                dest_idx = retry_idx + 1
-                dest = parts[dest_idx] if dest_idx < len(parts) else "70"
-                
-                entries.append({
-                    'timestamp': timestamp,
-                    'filename': filename,
-                    'size': size,
-                    'status': status,
-                    'duration': duration,
-                    'retry': retry,
-                    'dest': dest
-                })
+            if st.st_size == self._history_offset:
+                return reset, []
+            
+            with open(self.history_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
+                    # Baris terakhir yang belum lengkap (masih ditulis) dibaca di refresh berikutnya
+                    end = mm.rfind(b'\n', self._history_offset) + 1
+                    if not end:
+                        return reset, []
+                    
+                    start = self._history_offset
+                    if start == 0:
+                        # Skip header (first 5 lines)
+                        for _ in range(5):
+                            start = mm.find(b'\n', start, end) + 1
+                            if not start:
+                                start = end
+                                break
+                    
+                    entries = self._parse_buffer(mm, start, end)
             
-            return entries[::-1]  # Balik urutan (terbaru di atas)
+            self._history_offset = end
+            return reset, entries
             
         except Exception as e:
             logger.error(f"Error parsing history: {e}")
-            return []
+            return False, []
+    
+    def _parse_buffer(self, buf, start: int, end: int) -> list:
+        """
+        Parse baris-baris history langsung dari buffer bytes (urutan sama dengan file)
+        
+        Baris fixed-width dari HistoryLogger cukup di-slice per kolom. Baris lain
+        (filename non-ASCII, format lama) dicocokkan dengan regex langsung di buffer;
+        hanya field dari baris yang cocok yang di-decode ke str.
+        
+        Args:
+            buf: Buffer isi file (mmap/bytes)
+            start: Offset awal baris pertama
+            end: Offset sesudah newline terakhir
+            
+        Returns:
+            Deque entry dict (maksimal HISTORY_MAX_ENTRIES terbaru)
+        """
+        # Saat baca ulang file besar, entry lama langsung terbuang (sama dengan batas all_entries)
+        entries = deque(maxlen=HISTORY_MAX_ENTRIES)
+        
+        match = _LINE_RE.match
+        find = buf.find
+        
+        while start < end:
+            nl = find(b'\n', start, end)
+            if nl < 0:
+                nl = end
+            line_end = nl - 1 if nl > start and buf[nl - 1] == 0x0D else nl  # Tanpa \r (CRLF)
+            line_start = start
+            start = nl + 1
+            
+            if (line_end - line_start == _FIXED_LINE_LEN and buf[line_start] != 0x20
+                    and buf[line_start:line_end][_FIXED_GB_SLICE] == b' GB '):
+                # Fast path: kolom di posisi tetap
+                line = buf[line_start:line_end].decode('ascii', errors='replace')
+                timestamp = line[0:20].rstrip()
+                filename = line[21:61].rstrip()
+                size = line[62:73].lstrip()
+                status = line[77:87].rstrip()
+                duration = line[88:98].rstrip()
+                retry = line[99:104].rstrip()
+                dest = line[105:110].rstrip()
+            else:
+                m = match(buf, line_start, line_end)
+                if m is None:
+                    continue
+                timestamp, filename, size, status, duration, retry, dest = [
+                    g.decode('utf-8', errors='replace') if g is not None else None for g in m.groups()
+                ]
+            
+            entries.append({
+                'timestamp': timestamp,
+                'filename': filename,
+                'size': f"{size} GB",
+                'status': status,
+                'duration': duration,
+                'retry': retry,
+                'dest': dest or "70",
+                '_epoch': _parse_epoch(timestamp)  # Dihitung sekali, dipakai filter clear
+            })
+        
+        return entries
     
     def _create_empty_history(self):
         """Buat file history kosong dengan header"""
@@ -406,14 +631,11 @@ Total: {total_gb:.2f} GB
             logger.error(f"Error creating history file: {e}")
     
     def _parse_size(self, size_str: str) -> float:
-        """Parse size string to GB"""
+        """Parse size string to GB (format selalu "<angka> GB")"""
         try:
-            parts = size_str.split()
-            if len(parts) >= 1:
-                return float(parts[0])
-            return 0
-        except:
-            return 0
+            return float(size_str.partition(' ')[0])
+        except ValueError:
+            return 0.0
     
     def _clear_display(self):
         """Clear tampilan history"""
@@ -425,11 +647,7 @@ Total: {total_gb:.2f} GB
         """Buka file history"""
         try:
             if os.path.exists(self.history_path):
-                if os.name == 'nt':  # Windows
-                    os.startfile(self.history_path)
-                else:
-                    import subprocess
-                    subprocess.call(['xdg-open', self.history_path])
+                open_file(self.history_path)
             else:
                 messagebox.showinfo("Info", "History file not found yet")
         except Exception as e:
@@ -484,4 +702,7 @@ Total: {total_gb:.2f} GB
         """Cleanup saat panel di-destroy"""
         if self.after_id:
             self.after_cancel(self.after_id)
+        if self._drain_id:
+            self.after_cancel(self._drain_id)
+        self._parse_requests.put(None)  # Hentikan thread parser
         super().destroy()
\ No newline at end of file
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """
 Log panel untuk menampilkan activity log
+
+Isi awal diambil dari ekor file log (sekali, di thread terpisah). Setelah itu log baru
+diterima langsung dari modul logging lewat handler di root logger, tanpa membaca file.
 """
 
 import tkinter as tk
@@ -9,12 +12,58 @@ import logging
 import os
 import time
 import re
+import mmap
+import queue
+import threading
+from collections import deque
+from itertools import islice
 from datetime import datetime
+from typing import Optional
 from ..utils.logger import get_logger
-from ..constants.settings import REFRESH_INTERVAL, LOG_FILE
+from ..utils.path_utils import get_data_path, open_file
+from ..constants.settings import (
+    REFRESH_INTERVAL, LOG_FILE, LOG_READ_POLL_MS, LOG_REDRAW_DELAY_MS, LOG_FORMAT, LOG_DATE_FORMAT
+)
 
 logger = get_logger(__name__)
 
+# Baris log (LOG_FORMAT): "YYYY-MM-DD HH:MM:SS [LEVEL] pesan", level opsional; satu kali match
+_LINE_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s*(?:\[(INFO|WARNING|ERROR|DEBUG|CRITICAL)\])?\s*(.*)')
+
+# Teks level yang di-insert per tag (tanpa f-string per baris)
+_LEVEL_TEXT = {level: f"[{level}] " for level in ('INFO', 'WARNING', 'ERROR', 'DEBUG', 'CRITICAL')}
+
+
+def _parse_line(line: str) -> tuple:
+    """
+    Parse satu baris log sekali saat dibaca
+    
+    Args:
+        line: Baris log (tanpa newline)
+        
+    Returns:
+        Tuple (raw, timestamp, level, rest); timestamp None jika baris tanpa timestamp
+    """
+    m = _LINE_RE.match(line)
+    if m is None:
+        return (line, None, None, line)
+    timestamp, level, rest = m.groups()
+    return (line, timestamp, level, rest)
+
+class _PanelLogHandler(logging.Handler):
+    """
+    Meneruskan log record ke LogPanel lewat queue (dipanggil di thread yang melakukan logging)
+    """
+    
+    def __init__(self, records: queue.SimpleQueue):
+        super().__init__()
+        self.records = records
+    
+    def emit(self, record):
+        # Tanpa format di sini: thread worker tidak ikut menanggung biaya tampilan
+        self.records.put(record)
+
+
 class LogPanel(ttk.LabelFrame):
     """
     Panel untuk menampilkan activity log
@@ -30,12 +79,31 @@ class LogPanel(ttk.LabelFrame):
         super().__init__(parent, text="📝 Activity Log", padding=5)
         
         self.after_id = None
-        self.log_lines = []
         self.max_lines = 1000  # Maksimal baris yang ditampilkan
+        self.log_lines = deque(maxlen=self.max_lines)  # Tuple (raw, timestamp, level, rest)
+        
+        self._log_path = get_data_path(LOG_FILE)  # Path tetap, dihitung sekali
+        
+        # Log baru langsung dari modul logging (record di-format di Tk thread saat refresh)
+        self._records = queue.SimpleQueue()
+        self._log_handler = _PanelLogHandler(self._records)
+        self._formatter = logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT)
+        
+        # Isi awal dari file log, dibaca sekali di thread terpisah
+        self._initial_result = queue.SimpleQueue()
+        self._initial_loaded = False
+        self._shown_line_count = 0  # Angka "Lines:" yang sedang tampil
+        
+        # Baris dari add_message, digabung jadi satu redraw saat idle
+        self._pending_lines = []
+        self._flush_id = None
         self.auto_scroll = True
         self.last_clear_time = time.time()  # <-- INI KUNCINYA!
         
         self._create_widgets()
+        self._update_clear_info()
+        
+        self._start_log_capture()
         self._refresh_display()
     
     def _create_widgets(self):
@@ -56,7 +124,7 @@ class LogPanel(ttk.LabelFrame):
         self.clear_info_label = ttk.Label(toolbar, text="", font=('Arial', 8, 'italic'))
         self.clear_info_label.pack(side='right', padx=5)
         
-        self.status_label = ttk.Label(toolbar, text="", font=('Arial', 8))
+        self.status_label = ttk.Label(toolbar, text="Lines: 0", font=('Arial', 8))
         self.status_label.pack(side='right', padx=5)
         
         # Frame untuk text dan scrollbar
@@ -90,7 +158,7 @@ class LogPanel(ttk.LabelFrame):
         self.text_widget.tag_configure('DEBUG', foreground='#569cd6')
         self.text_widget.tag_configure('CRITICAL', foreground='#f44747', background='#2d2d2d')
         self.text_widget.tag_configure('TIMESTAMP', foreground='#808080')
-        self.text_widget.tag_configure('DEFAULT', foreground='#d4d4d4')
+        # Teks biasa tanpa tag: warnanya sudah fg widget
     
     def _on_scroll(self, *args):
         """Handler saat scroll"""
@@ -101,79 +169,209 @@ class LogPanel(ttk.LabelFrame):
         else:
             self.auto_scroll_var.set(False)
     
+    def _start_log_capture(self):
+        """Pasang handler di root logger lalu baca isi file log sebelum titik itu (di thread lain)"""
+        log_path = self._log_path
+        
+        logging.getLogger().addHandler(self._log_handler)
+        
+        # Record sesudah handler terpasang datang lewat handler; file cukup dibaca sampai ukuran ini
+        try:
+            limit = os.stat(log_path).st_size
+        except OSError:
+            limit = 0
+        
+        threading.Thread(
+            target=lambda: self._initial_result.put(self._read_log_file(log_path, limit)),
+            daemon=True, name="LogReader"
+        ).start()
+    
     def _refresh_display(self):
-        """Refresh tampilan log"""
+        """Tampilkan log record baru yang masuk lewat handler sejak refresh terakhir"""
+        # Dipanggil juga dari tombol Refresh/Clear: jaga agar hanya ada satu jadwal refresh
+        if self.after_id:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+        
+        active = False
         try:
-            # Baca file log dengan filter waktu
-            new_lines = self._read_log_file()
-            
-            if new_lines != self.log_lines:
-                self.log_lines = new_lines
-                self._update_display()
-            
-            # Update status
-            self.status_label.config(text=f"Lines: {len(self.log_lines)}")
-            
-            # Update info clear
-            if self.last_clear_time > 0:
-                from datetime import datetime
-                clear_time_str = datetime.fromtimestamp(self.last_clear_time).strftime("%H:%M:%S")
-                self.clear_info_label.config(text=f"Clear sejak: {clear_time_str}")
-            else:
-                self.clear_info_label.config(text="")
-            
+            active = self._drain_records()
         except Exception as e:
             logger.error(f"Error refreshing log: {e}")
         
-        # Schedule refresh berikutnya
-        self.after_id = self.after(REFRESH_INTERVAL, self._refresh_display)
+        # Selama isi awal belum siap atau log sedang mengalir, cek lebih sering
+        # (burst log digabung jadi satu redraw per interval); saat sepi kembali ke REFRESH_INTERVAL
+        if not self._initial_loaded:
+            interval = LOG_READ_POLL_MS
+        elif active:
+            interval = LOG_REDRAW_DELAY_MS
+        else:
+            interval = REFRESH_INTERVAL
+        self.after_id = self.after(interval, self._refresh_display)
+    
+    def _drain_records(self) -> bool:
+        """
+        Ambil isi awal (sekali) dan semua record dari handler, lalu update tampilan
+        
+        Returns:
+            True jika ada record baru dari handler
+        """
+        new_lines = []
+        
+        if not self._initial_loaded:
+            try:
+                new_lines = self._initial_result.get_nowait()
+            except queue.Empty:
+                # Record baru ditahan di queue supaya urutannya tetap sesudah isi file
+                return False
+            self._initial_loaded = True
+        
+        records = []
+        get = self._records.get_nowait
+        while True:
+            try:
+                records.append(get())
+            except queue.Empty:
+                break
+        
+        # Hanya max_lines terakhir yang akan tampil, record lebih lama tidak perlu di-format
+        for record in records[-self.max_lines:]:
+            new_lines.extend(self._record_lines(record))
+        
+        if new_lines:
+            new_lines = new_lines[-self.max_lines:]
+            self.log_lines.extend(new_lines)
+            self._update_display(new_lines)
+        return bool(records)
+    
+    def _record_lines(self, record: logging.LogRecord) -> list:
+        """
+        Ubah satu log record menjadi tuple baris (tanpa regex)
+        
+        Args:
+            record: LogRecord dari handler
+            
+        Returns:
+            List tuple (raw, timestamp, level, rest); baris lanjutan (traceback) tanpa timestamp
+        """
+        timestamp = self._formatter.formatTime(record, LOG_DATE_FORMAT)
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = str(record.msg)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        
+        first, *more = message.strip().splitlines() or ['']
+        level = record.levelname
+        if level in _LEVEL_TEXT:
+            lines = [(f"{timestamp} [{level}] {first}", timestamp, level, first)]
+        else:
+            rest = f"[{level}] {first}"
+            lines = [(f"{timestamp} {rest}", timestamp, None, rest)]
+        
+        # Indentasi traceback dipertahankan, sama seperti baris dari file
+        for line in more:
+            lines.append((line, None, None, line))
+        return lines
+    
+    def _update_clear_info(self):
+        """Update info waktu clear terakhir (hanya berubah saat clear)"""
+        if self.last_clear_time > 0:
+            clear_time_str = datetime.fromtimestamp(self.last_clear_time).strftime("%H:%M:%S")
+            self.clear_info_label.config(text=f"Clear sejak: {clear_time_str}")
+        else:
+            self.clear_info_label.config(text="")
     
     def _force_refresh(self):
         """Force refresh log"""
         self._refresh_display()
     
-    def _read_log_file(self) -> list:
+    def _read_log_file(self, log_path: str, limit: int) -> list:
         """
-        Baca file log, buat jika belum ada
+        Baca ekor file log sampai offset limit (lewat mmap), buat file jika belum ada
+        
+        Dipanggil sekali dari thread LogReader untuk isi awal panel.
+        
+        Args:
+            log_path: Path file log
+            limit: Ukuran file saat handler dipasang (sesudahnya datang lewat handler)
+            
+        Returns:
+            List tuple baris (maksimal max_lines terakhir)
         """
         try:
-            from ..utils.path_utils import get_data_path
-            from ..constants.settings import LOG_FILE
-            
-            log_path = get_data_path(LOG_FILE)
-            
             # ===== BUAT FILE LOG KOSONG JIKA BELUM ADA =====
             if not os.path.exists(log_path):
                 try:
                     os.makedirs(os.path.dirname(log_path), exist_ok=True)
                     with open(log_path, 'w', encoding='utf-8') as f:
                         f.write(f"# Log file created at {datetime.now()}\n")
-                    return ["📁 File log baru dibuat"]
+                    return [_parse_line("📁 File log baru dibuat")]
                 except:
-                    return ["⚠️ Tidak dapat membuat file log"]
+                    return [_parse_line("⚠️ Tidak dapat membuat file log")]
             
-            with open(log_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if limit <= 0:
+                return []
             
-            if len(lines) > self.max_lines:
-                lines = lines[-self.max_lines:]
+            # mmap: hanya ekor file (max_lines baris terakhir) yang disalin dan di-decode
+            with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), limit, access=mmap.ACCESS_READ) as mm:
+                # Baris terakhir yang belum lengkap sudah ikut datang lewat handler
+                end = mm.rfind(b'\n') + 1
+                if end == 0:
+                    return []
+                
+                # Mundur max_lines newline dari akhir untuk menemukan awal ekor
+                start = end - 1
+                for _ in range(self.max_lines):
+                    start = mm.rfind(b'\n', 0, start)
+                    if start < 0:
+                        break
+                data = mm[start + 1:end]
             
-            return [line.strip() for line in lines]
+            lines = data.decode('utf-8', errors='replace').splitlines()
+            
+            # Baris di luar max_lines terakhir akan terbuang dari deque, tidak perlu di-parse
+            skip = max(len(lines) - self.max_lines, 0)
+            return [_parse_line(line) for line in islice(lines, skip, None)]
             
         except Exception as e:
-            return [f"Error reading log: {e}"]
+            return [_parse_line(f"Error reading log: {e}")]
     
-    def _update_display(self):
-        """Update text widget dengan log terbaru"""
+    def _update_display(self, new_lines: Optional[list] = None):
+        """
+        Update text widget dengan log terbaru
+        
+        Args:
+            new_lines: Tuple baris yang baru ditambahkan ke log_lines (hanya ini yang di-insert).
+                None = isi ulang seluruh widget dari log_lines (misal setelah clear).
+        """
         # Enable editing
         self.text_widget.config(state='normal')
         
-        # Clear
-        self.text_widget.delete('1.0', tk.END)
+        if new_lines is None:
+            # Clear lalu isi ulang semua
+            self.text_widget.delete('1.0', tk.END)
+            lines = self.log_lines
+        else:
+            # Hanya baris baru (sudah maksimal max_lines)
+            lines = new_lines
+        
+        # Insert lines with colors: semua potongan (teks, tag) dalam satu perintah Tcl
+        parts = []
+        render = self._render_line_parts
+        for line in lines:
+            parts.extend(render(line))
+        if parts:
+            self.text_widget.insert(tk.END, *parts)
         
-        # Insert lines with colors
-        for line in self.log_lines:
-            self._insert_colored_line(line)
+        # Buang baris teratas yang melebihi max_lines (widget berakhir dengan satu baris kosong)
+        if new_lines is not None:
+            excess = int(self.text_widget.index('end-1c').split('.')[0]) - 1 - self.max_lines
+            if excess > 0:
+                self.text_widget.delete('1.0', f'{excess + 1}.0')
         
         # Auto-scroll ke bawah jika diaktifkan
         if self.auto_scroll_var.get():
@@ -181,49 +379,47 @@ class LogPanel(ttk.LabelFrame):
         
         # Disable editing
         self.text_widget.config(state='disabled')
+        
+        # Update status (setelah mencapai max_lines jumlahnya tetap, label tidak perlu di-set)
+        line_count = len(self.log_lines)
+        if line_count != self._shown_line_count:
+            self._shown_line_count = line_count
+            self.status_label.config(text=f"Lines: {line_count}")
     
-    def _insert_colored_line(self, line: str):
+    def _render_line_parts(self, line: tuple) -> list:
         """
-        Insert satu line dengan warna berdasarkan level
+        Potongan teks + tag warna untuk satu line, untuk Text.insert(END, teks, tag, teks, tag, ...)
         
         Args:
-            line: Log line
+            line: Tuple (raw, timestamp, level, rest) dari _parse_line
+            
+        Returns:
+            List berselang-seling teks dan tag (kosong untuk baris kosong);
+            tag '' berarti tanpa tag (warna fg widget)
         """
-        if not line:
-            return
+        raw, timestamp, level, rest = line
+        if not raw:
+            return []
         
-        # Parse timestamp (format: YYYY-MM-DD HH:MM:SS)
-        timestamp_match = re.match(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
+        if not timestamp:
+            return [rest + '\n', '']
         
-        if timestamp_match:
-            timestamp = timestamp_match.group(1)
-            rest = line[len(timestamp):].strip()
-            
-            # Insert timestamp
-            self.text_widget.insert(tk.END, timestamp + ' ', 'TIMESTAMP')
-            
-            # Cari level log
-            level_match = re.search(r'\[(INFO|WARNING|ERROR|DEBUG|CRITICAL)\]', rest)
-            if level_match:
-                level = level_match.group(1)
-                level_part = f"[{level}]"
-                
-                # Insert level dengan warna
-                self.text_widget.insert(tk.END, f"[{level}] ", level)
-                
-                # Insert sisanya (setelah level)
-                rest_after_level = rest[len(level_part):].strip()
-                self.text_widget.insert(tk.END, rest_after_level + '\n', 'DEFAULT')
-            else:
-                self.text_widget.insert(tk.END, rest + '\n', 'DEFAULT')
-        else:
-            self.text_widget.insert(tk.END, line + '\n', 'DEFAULT')
+        if level:
+            return [timestamp + ' ', 'TIMESTAMP', _LEVEL_TEXT[level], level, rest + '\n', '']
+        
+        return [timestamp + ' ', 'TIMESTAMP', rest + '\n', '']
     
     def _clear_log(self):
         """Clear tampilan log - log lama hilang, log baru tetap masuk"""
         # Set waktu clear ke sekarang
         self.last_clear_time = time.time()
         
+        # Buang baris yang sudah tampil; log baru tetap masuk lewat handler
+        self._pending_lines.clear()
+        self.log_lines.clear()
+        self._update_display()
+        self._update_clear_info()
+        
         # Refresh display
         self._refresh_display()
         
@@ -234,17 +430,10 @@ class LogPanel(ttk.LabelFrame):
     def _open_log_file(self):
         """Buka file log"""
         try:
-            from ..utils.path_utils import get_data_path
-            from ..constants.settings import LOG_FILE
-            
-            log_path = get_data_path(LOG_FILE)
+            log_path = self._log_path
             
             if os.path.exists(log_path):
-                if os.name == 'nt':
-                    os.startfile(log_path)
-                else:
-                    import subprocess
-                    subprocess.call(['xdg-open', log_path])
+                open_file(log_path)
             else:
                 logger.error(f"Log file not found: {log_path}")
         except Exception as e:
@@ -258,18 +447,26 @@ class LogPanel(ttk.LabelFrame):
             message: Pesan
             level: Level log (INFO, WARNING, ERROR)
         """
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_line = f"{timestamp} [{level}] {message}"
-        
-        self.log_lines.append(log_line)
-        if len(self.log_lines) > self.max_lines:
-            self.log_lines = self.log_lines[-self.max_lines:]
+        self._pending_lines.append(_parse_line(f"{timestamp} [{level}] {message}"))
         
-        self._update_display()
+        # Beberapa pesan dalam satu event handler cukup satu redraw
+        if self._flush_id is None:
+            self._flush_id = self.after_idle(self._flush_pending)
+    
+    def _flush_pending(self):
+        """Tampilkan baris dari add_message yang terkumpul sejak redraw terakhir"""
+        self._flush_id = None
+        lines, self._pending_lines = self._pending_lines, []
+        if lines:
+            self.log_lines.extend(lines)  # deque membuang baris terlama sendiri
+            self._update_display(lines)
     
     def destroy(self):
         """Cleanup saat panel di-destroy"""
         if self.after_id:
             self.after_cancel(self.after_id)
+        if self._flush_id:
+            self.after_cancel(self._flush_id)
+        logging.getLogger().removeHandler(self._log_handler)
         super().destroy()
\ No newline at end of file
@@ -7,10 +7,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
 import os
+import threading
 from ..utils.logger import get_logger
 from ..utils.config_manager import ConfigManager
 from ..utils.state_manager import StateManager
 from ..utils.history import HistoryLogger
+from ..utils.path_utils import open_file
 from ..core.queue_manager import QueueManager
 from ..core.download_manager import DownloadManager
 from ..core.upload_manager import UploadManager
@@ -24,7 +26,7 @@ from ..gui.history_panel import HistoryPanel
 from ..gui.upload_panel_51 import UploadPanel51
 from ..gui.upload_panel_40 import UploadPanel40
 from ..gui.settings_window import SettingsWindow
-from ..constants.settings import REFRESH_INTERVAL
+from ..constants.settings import REFRESH_INTERVAL, REFRESH_INTERVAL_HIDDEN, STATE_SAVE_CLOSE_TIMEOUT
 
 logger = get_logger(__name__)
 
@@ -73,6 +75,16 @@ class MainWindow:
         self.stats_var = tk.StringVar(value="")
         self.after_id = None
         
+        # Cache get_stats download (lihat DownloadManager._stats_version)
+        self._last_stats_version = None
+        self._download_stats = None
+        
+        # Teks terakhir per label status (widget hanya di-config jika teks berubah)
+        self._shown_text = {}
+        self._activity_running = False
+        self._last_snapshot = None  # Angka status terakhir yang sudah ditampilkan
+        self._window_visible = True  # False saat window di-minimize
+        
         # Setup closing protocol
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
@@ -142,6 +154,11 @@ class MainWindow:
         
         # ===== TAB 3: ACTIVITY LOG =====
         self._create_log_tab()
+        
+        # Panel yang tidak terlihat di-refresh lebih jarang
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self.root.bind('<Unmap>', lambda e: self._on_root_map(e, False), '+')
+        self.root.bind('<Map>', lambda e: self._on_root_map(e, True), '+')
     
     def _create_queue_tab(self):
         """Buat tab Queue dengan 3 panel vertikal"""
@@ -241,13 +258,22 @@ class MainWindow:
         self.upload40_panel.grid(row=1, column=0, sticky='nsew')
     
     def _create_history_tab(self):
-        """Buat tab History (sama seperti Fase 1)"""
-        history_tab = ttk.Frame(self.notebook)
-        self.notebook.add(history_tab, text="📜 HISTORY")
-        
-        history_tab.grid_rowconfigure(0, weight=1)
-        history_tab.grid_columnconfigure(0, weight=1)
+        """Buat tab History (panel dibuat saat tab pertama kali dibuka)"""
+        self._history_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self._history_tab, text="📜 HISTORY")
+        
+        self._history_tab.grid_rowconfigure(0, weight=1)
+        self._history_tab.grid_columnconfigure(0, weight=1)
+        self._history_loaded = False
+        self.history_panel = None  # Dibuat oleh _ensure_history_panel
+    
+    def _ensure_history_panel(self):
+        """Buat HistoryPanel jika belum (parse file history baru terjadi di sini)"""
+        if self._history_loaded:
+            return
+        self._history_loaded = True
         
+        history_tab = self._history_tab
         try:
             self.history_panel = HistoryPanel(history_tab, self.history_logger)
             self.history_panel.grid(row=0, column=0, sticky='nsew', padx=5, pady=5)
@@ -329,57 +355,87 @@ class MainWindow:
     
     def _refresh_all(self):
         """Refresh semua panel"""
-        if hasattr(self, 'download_panel'):
-            self.download_panel._refresh_display()
-        if hasattr(self, 'upload51_panel'):
-            self.upload51_panel._refresh_display()
-        if hasattr(self, 'upload40_panel'):
-            self.upload40_panel._refresh_display()
-        if hasattr(self, 'history_panel'):
+        self.download_queue._refresh_display()
+        self.download_progress._refresh_display()
+        self.upload51_panel._refresh_display()
+        self.upload40_panel._refresh_display()
+        if self.history_panel is not None:
             self.history_panel._refresh_display()
         self.log_panel.add_message("Manual refresh requested", "DEBUG")
     
     def _open_log_file(self):
         """Open log file"""
-        if hasattr(self, 'log_panel'):
-            self.log_panel._open_log_file()
+        self.log_panel._open_log_file()
     
     def _open_history_file(self):
         """Open history file"""
         try:
-            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            history_path = os.path.join(root_dir, 'copy_history.txt')
+            history_path = self.history_logger.history_path  # Sudah dihitung sekali oleh HistoryLogger
             if os.path.exists(history_path):
-                os.startfile(history_path)
+                open_file(history_path)
         except Exception as e:
             logger.error(f"Error opening history file: {e}")
     
     def _show_statistics(self):
         """Show statistics dialog"""
-        if hasattr(self, 'history_panel'):
+        self._ensure_history_panel()
+        if self.history_panel is not None:
             self.history_panel._show_stats()
     
+    def _on_root_map(self, event, visible: bool):
+        """
+        Handler <Map>/<Unmap> root window (minimize / restore)
+        
+        Args:
+            event: Tk event (binding root juga menerima event dari semua child widget)
+            visible: True untuk <Map>, False untuk <Unmap>
+        """
+        if event.widget is not self.root or visible == self._window_visible:
+            return
+        self._window_visible = visible
+        self._apply_refresh_cadence()
+        if visible:
+            self._update_status()
+    
+    def _on_tab_changed(self, event):
+        """Handler <<NotebookTabChanged>>: buat panel tab yang dibuka lalu atur cadence refresh"""
+        if self.notebook.select() == str(self._history_tab):
+            self._ensure_history_panel()
+        self._apply_refresh_cadence()
+    
+    def _apply_refresh_cadence(self):
+        """Refresh normal hanya untuk panel di tab yang terlihat, sisanya REFRESH_INTERVAL_HIDDEN"""
+        try:
+            queue_visible = self._window_visible and self.notebook.index('current') == 0
+        except tk.TclError:
+            return
+        
+        for name in ('download_queue', 'download_progress', 'upload51_panel', 'upload40_panel'):
+            panel = getattr(self, name, None)
+            if panel is not None:
+                panel.set_refresh_enabled(queue_visible)
+    
     def _update_status(self):
         """Update status bar dengan info download dan upload"""
+        # Dipanggil juga saat window di-restore: jaga agar hanya ada satu jadwal
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        
         try:
-            # Get stats
-            download_stats = self.download_mgr.get_stats()
+            # Get stats (download hanya jika status worker berubah, atau ada worker aktif karena speed berubah)
+            version = self.download_mgr._stats_version
+            if (version != self._last_stats_version
+                    or self._download_stats['workers']['busy']):
+                self._download_stats = self.download_mgr.get_stats()
+                self._last_stats_version = version
+            download_stats = self._download_stats
             upload_stats = self.upload_mgr.get_stats()
             queue_stats = self.queue_mgr.get_stats()
             
-            # Update status icon
-            if self.monitor.running:
-                self.status_icon.config(text="🟢")
-                status_text = "Monitoring"
-            else:
-                self.status_icon.config(text="🔴")
-                status_text = "Stopped"
-            
-            # Get monitor stats
-            monitor_stats = self.monitor.get_stats() if hasattr(self.monitor, 'get_stats') else {}
-            folders = monitor_stats.get('folders_monitored', 0)
-            
-            self.status_var.set(f"{status_text} | Folders: {folders}")
+            # Jumlah folder langsung dari monitor (get_stats() menghitung ulang semua file yang terlihat)
+            folders = len(getattr(self.monitor, 'source_folders', ()))
+            running = self.monitor.running
             
             # Update speed - dengan error handling
             try:
@@ -397,47 +453,78 @@ class MainWindow:
             except:
                 ul40_speed = 0
             
-            self.speed_label.config(
-                text=f"DL:{dl_speed:.1f} | UL51:{ul51_speed:.1f} | UL40:{ul40_speed:.1f} MB/s"
+            # Semua angka yang tampil di status bar / label stats. Sama dengan tick sebelumnya
+            # berarti tidak ada teks yang berubah: lewati semua f-string dan config
+            snapshot = (
+                running, folders, round(dl_speed, 1), round(ul51_speed, 1), round(ul40_speed, 1),
+                download_stats['workers']['busy'], queue_stats,
+                upload_stats['workers_51']['busy'], upload_stats['workers_40']['busy'],
+                upload_stats.get('queue'), upload_stats.get('max_workers_51'), upload_stats.get('max_workers_40')
             )
-            
-            # Update stats di panel
-            if hasattr(self, 'dl_active_label'):
+            if snapshot != self._last_snapshot:
+                self._last_snapshot = snapshot
+                
+                # Update status icon + text hanya jika berubah (set() selalu memicu relayout status bar)
+                status = f"{'Monitoring' if running else 'Stopped'} | Folders: {folders}"
+                if status != self._shown_text.get('status'):
+                    self._shown_text['status'] = status
+                    self.status_icon.config(text="🟢" if running else "🔴")
+                    self.status_var.set(status)
+                
+                self._set_label_text('speed', self.speed_label,
+                                     f"DL:{dl_speed:.1f} | UL51:{ul51_speed:.1f} | UL40:{ul40_speed:.1f} MB/s")
+                
+                # Update stats di panel
                 try:
-                    self.dl_active_label.config(text=f"Active: {download_stats['workers']['busy']}")
-                    self.dl_waiting_label.config(text=f"Waiting: {queue_stats['waiting']}")
-                    self.dl_total_label.config(text=f"Total: {queue_stats['total']}")
+                    self._set_label_text('dl_active', self.dl_active_label, f"Active: {download_stats['workers']['busy']}")
+                    self._set_label_text('dl_waiting', self.dl_waiting_label, f"Waiting: {queue_stats['waiting']}")
+                    self._set_label_text('dl_total', self.dl_total_label, f"Total: {queue_stats['total']}")
                 except:
                     pass
-            
-            if hasattr(self, 'ul51_active_label'):
+                
                 try:
-                    self.ul51_active_label.config(text=f"Active: {upload_stats['workers_51']['busy']}")
-                    self.ul51_waiting_label.config(text=f"Waiting: {upload_stats['queue']['51']['waiting']}")
-                    self.ul51_total_label.config(text=f"Max: {upload_stats['max_workers_51']}")
+                    self._set_label_text('ul51_active', self.ul51_active_label, f"Active: {upload_stats['workers_51']['busy']}")
+                    self._set_label_text('ul51_waiting', self.ul51_waiting_label, f"Waiting: {upload_stats['queue']['51']['waiting']}")
+                    self._set_label_text('ul51_total', self.ul51_total_label, f"Max: {upload_stats['max_workers_51']}")
                 except:
                     pass
-            
-            if hasattr(self, 'ul40_active_label'):
+                
                 try:
-                    self.ul40_active_label.config(text=f"Active: {upload_stats['workers_40']['busy']}")
-                    self.ul40_waiting_label.config(text=f"Waiting: {upload_stats['queue']['40']['waiting']}")
-                    self.ul40_total_label.config(text=f"Max: {upload_stats['max_workers_40']}")
+                    self._set_label_text('ul40_active', self.ul40_active_label, f"Active: {upload_stats['workers_40']['busy']}")
+                    self._set_label_text('ul40_waiting', self.ul40_waiting_label, f"Waiting: {upload_stats['queue']['40']['waiting']}")
+                    self._set_label_text('ul40_total', self.ul40_total_label, f"Max: {upload_stats['max_workers_40']}")
                 except:
                     pass
-            
-            # Activity bar
-            if download_stats['workers']['busy'] > 0 or upload_stats['workers_51']['busy'] > 0 or upload_stats['workers_40']['busy'] > 0:
-                self.activity_bar.start(10)
-            else:
-                self.activity_bar.stop()
+                
+                # Activity bar (start() saat sudah berjalan me-restart timer animasinya)
+                busy = download_stats['workers']['busy'] > 0 or upload_stats['workers_51']['busy'] > 0 or upload_stats['workers_40']['busy'] > 0
+                if busy != self._activity_running:
+                    self._activity_running = busy
+                    if busy:
+                        self.activity_bar.start(10)
+                    else:
+                        self.activity_bar.stop()
             
         except Exception as e:
             logger.debug(f"Non-critical error updating status: {e}")
             # Jangan sampai error ini mengganggu aplikasi
         
-        # Schedule next update
-        self.after_id = self.root.after(REFRESH_INTERVAL, self._update_status)
+        # Schedule next update (jarang saat window di-minimize)
+        interval = REFRESH_INTERVAL if self._window_visible else REFRESH_INTERVAL_HIDDEN
+        self.after_id = self.root.after(interval, self._update_status)
+    
+    def _set_label_text(self, key: str, label, text: str):
+        """
+        Config text label hanya jika berbeda dari yang terakhir di-set
+        
+        Args:
+            key: Kunci cache teks label
+            label: Widget label
+            text: Teks baru
+        """
+        if self._shown_text.get(key) != text:
+            label.config(text=text)
+            self._shown_text[key] = text
     
     def _on_settings_changed(self):
         """Handler saat settings berubah"""
@@ -445,10 +532,11 @@ class MainWindow:
         settings = self.config_mgr.get_settings()
         
         # Update monitor
-        self.monitor.source_folders = settings.source_folders
-        self.monitor.extensions = settings.extensions
+        self.monitor.set_source_folders(settings.source_folders)
+        self.monitor.update_extensions(settings.extensions)
         
         # Update download manager
+        self.download_mgr.config = settings
         self.download_mgr.set_max_parallel(settings.max_download)
         
         # Update upload managers
@@ -501,8 +589,20 @@ Untuk file video besar (20-60GB)
         if self.after_id:
             self.root.after_cancel(self.after_id)
         
-        # Save state
-        self.state_mgr.save(self.queue_mgr.get_all_jobs())
+        # Sembunyikan window dulu supaya close langsung terasa
+        self.root.withdraw()
+        
+        # Save state: snapshot diambil di sini (queue sudah berhenti), penulisan file di thread lain.
+        # Thread bukan daemon, jadi kalau melewati timeout penulisan tetap selesai sebelum proses keluar.
+        try:
+            snapshot = self.state_mgr.build_snapshot(self.queue_mgr.get_all_jobs())
+            save_thread = threading.Thread(
+                target=self.state_mgr.write_snapshot, args=(snapshot,), name="StateSave"
+            )
+            save_thread.start()
+            save_thread.join(STATE_SAVE_CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Error saving state: {e}")
         
         # Destroy window
         self.root.quit()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Mixin bersama untuk panel GUI (jadwal refresh dan scroll mousewheel)
+"""
+
+from ..constants.settings import REFRESH_INTERVAL, REFRESH_INTERVAL_HIDDEN
+
+
+class RefreshScheduleMixin:
+    """
+    Jadwal refresh berkala panel lewat after(), dengan cadence sesuai visibilitas
+
+    Panel memanggil _init_refresh() di __init__, _cancel_refresh() di awal
+    _refresh_display() dan _schedule_refresh() di akhirnya.
+    """
+
+    def _init_refresh(self):
+        """Inisialisasi state jadwal refresh"""
+        self.after_id = None
+        self._interval = REFRESH_INTERVAL  # Lihat set_refresh_enabled
+
+    def set_refresh_enabled(self, enabled: bool):
+        """
+        Atur cadence refresh sesuai visibilitas panel
+
+        Args:
+            enabled: True jika panel terlihat (refresh normal), False jika tersembunyi (refresh jarang)
+        """
+        interval = REFRESH_INTERVAL if enabled else REFRESH_INTERVAL_HIDDEN
+        if interval == self._interval:
+            return
+        self._interval = interval
+        if enabled:
+            # Langsung tampilkan data terbaru, jangan tunggu jadwal refresh yang lambat
+            self._refresh_display()
+
+    def _cancel_refresh(self):
+        """Batalkan jadwal refresh yang tertunda"""
+        # _refresh_display dipanggil juga dari luar (Refresh All / panel terlihat lagi):
+        # jaga agar hanya ada satu jadwal
+        if self.after_id:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _schedule_refresh(self):
+        """Jadwalkan _refresh_display berikutnya"""
+        self.after_id = self.after(self._interval, self._refresh_display)
+
+
+class ScrollableCanvasMixin:
+    """
+    Scroll mousewheel untuk panel dengan self.canvas
+
+    Mousewheel global hanya dipasang selama kursor di atas canvas ini
+    (bind_all permanen membuat semua panel berebut satu binding global).
+    """
+
+    def _init_mousewheel(self):
+        """Pasang handler Enter/Leave di self.canvas (panggil setelah canvas dibuat)"""
+        self._wheel_funcid = None
+        self.canvas.bind('<Enter>', self._bind_mousewheel)
+        self.canvas.bind('<Leave>', self._unbind_mousewheel)
+
+    def _bind_mousewheel(self, event):
+        """Pasang mousewheel ke canvas ini saat kursor masuk"""
+        if self._wheel_funcid is None:
+            self._wheel_funcid = self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event):
+        """Lepas mousewheel saat kursor benar-benar keluar dari canvas"""
+        # Leave juga terjadi saat kursor pindah ke child (frame job) di dalam canvas
+        canvas = str(self.canvas)
+        path = str(self.tk.call('winfo', 'containing', event.x_root, event.y_root))
+        if path == canvas or path.startswith(canvas + '.'):
+            return
+        self._release_mousewheel()
+
+    def _release_mousewheel(self):
+        """Lepas binding mousewheel global (hanya jika masih milik panel ini) beserta command Tcl-nya"""
+        funcid, self._wheel_funcid = self._wheel_funcid, None
+        if funcid is None:
+            return
+        # Panel lain bisa sudah memasang binding-nya sendiri sejak itu
+        if funcid in self.canvas.bind_all("<MouseWheel>"):
+            self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.deletecommand(funcid)
+
+    def _on_mousewheel(self, event):
+        """Handler untuk mousewheel scrolling"""
+        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -5,15 +5,27 @@ Progress panel untuk menampilkan progress download aktif dengan scroll vertical
 
 import tkinter as tk
 from tkinter import ttk
+import gc
+import time
 import logging
+from collections import deque
 from typing import Optional, List
 from ..models.file_job import FileJob
 from ..core.download_manager import DownloadManager
-from ..constants.settings import REFRESH_INTERVAL
+from ..constants.settings import PROGRESS_FULL_REFRESH_MS
+from .panel_base import RefreshScheduleMixin, ScrollableCanvasMixin
+from .fonts import job_fonts
 
 logger = logging.getLogger(__name__)
 
-class ProgressPanel(ttk.Frame):
+# gc.collect() setiap sekian widget job yang di-destroy (panel berjalan berhari-hari)
+_GC_EVERY_DESTROYED = 50
+
+# Batas event progress yang menunggu di-drain (event tertua dibuang saat burst,
+# full refresh berkala tetap menampilkan nilai terbaru)
+_PROGRESS_EVENTS_MAX = 1024
+
+class ProgressPanel(RefreshScheduleMixin, ScrollableCanvasMixin, ttk.Frame):
     """
     Panel untuk menampilkan progress download aktif dengan scroll vertical
     """
@@ -29,9 +41,20 @@ class ProgressPanel(ttk.Frame):
         super().__init__(parent)
         
         self.download_manager = download_manager
-        self.after_id = None
+        self._init_refresh()
         self.progress_bars = {}  # Dictionary untuk menyimpan widget per job
         
+        self._fonts = job_fonts(self)
+        
+        # Nama job yang progress-nya berubah sejak tick terakhir (diisi dari thread worker).
+        # deque.append/popleft atomic, jadi worker tidak perlu lock
+        self._progress_events = deque(maxlen=_PROGRESS_EVENTS_MAX)
+        self._active_jobs = {}  # name -> FileJob yang sedang tampil
+        self._stats_version = None  # DownloadManager._stats_version saat daftar job terakhir diambil
+        self._last_full_refresh = 0.0
+        self._destroyed_count = 0
+        self.download_manager.register_progress_callback(self._on_progress)
+        
         # ===== CREATE SCROLLABLE FRAME =====
         self.canvas = tk.Canvas(self, highlightthickness=0, height=120)
         self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
@@ -45,8 +68,7 @@ class ProgressPanel(ttk.Frame):
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw", width=self.canvas.winfo_width())
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         
-        # Bind mousewheel untuk scroll
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self._init_mousewheel()
         
         # Pack canvas dan scrollbar
         self.canvas.pack(side='left', fill='both', expand=True)
@@ -62,34 +84,52 @@ class ProgressPanel(ttk.Frame):
         # Update lebar item di canvas
         self.canvas.itemconfig(1, width=event.width)
     
-    def _on_mousewheel(self, event):
-        """Handler untuk mousewheel scrolling"""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def _on_progress(self, job: FileJob):
+        """Callback progress dari DownloadManager (thread worker): cukup catat nama job"""
+        self._progress_events.append(job.name)
     
     def _refresh_display(self):
-        """Refresh tampilan progress"""
-        # Dapatkan active downloads
-        active_jobs = self.download_manager.get_active_downloads()
+        """Refresh tampilan progress (hanya job yang berubah)"""
+        self._cancel_refresh()
         
-        active_names = [job.name for job in active_jobs]
+        # Drain event progress, satu update per job walau event-nya banyak
+        events = self._progress_events
+        dirty = set()
+        while events:
+            dirty.add(events.popleft())
         
-        # Hapus progress bar untuk job yang sudah selesai
-        to_remove = []
-        for name, widgets in self.progress_bars.items():
-            if name not in active_names:
-                self._destroy_job_widgets(name)
-                to_remove.append(name)
+        # Daftar job aktif hanya diambil ulang jika status worker berubah
+        version = self.download_manager._stats_version
+        if version != self._stats_version:
+            self._stats_version = version
+            self._sync_active_jobs()
         
-        for name in to_remove:
-            del self.progress_bars[name]
+        # Speed/ETA tetap berjalan walau copy macet (tanpa event progress): refresh semua sesekali
+        now = time.monotonic()
+        if self._active_jobs and now - self._last_full_refresh >= PROGRESS_FULL_REFRESH_MS / 1000:
+            self._last_full_refresh = now
+            dirty = self._active_jobs.keys()
         
-        # Update atau buat progress bar untuk active jobs
-        for job in active_jobs:
-            if job.name in self.progress_bars:
-                # Update yang sudah ada
+        for name in dirty:
+            job = self._active_jobs.get(name)
+            if job is not None:
                 self._update_job_progress(job)
-            else:
-                # Buat yang baru
+        
+        # Schedule refresh berikutnya
+        self._schedule_refresh()
+    
+    def _sync_active_jobs(self):
+        """Buat / hapus widget progress sesuai daftar active downloads"""
+        active_jobs = self.download_manager.get_active_downloads()
+        self._active_jobs = {job.name: job for job in active_jobs}
+        
+        # Hapus progress bar untuk job yang sudah selesai
+        for name in [name for name in self.progress_bars if name not in self._active_jobs]:
+            self._destroy_job_widgets(name)
+        
+        # Buat progress bar untuk job baru (yang lama di-update lewat event progress)
+        for job in active_jobs:
+            if job.name not in self.progress_bars:
                 self._create_job_progress(job)
         
         # Jika tidak ada active jobs, tampilkan pesan
@@ -97,9 +137,6 @@ class ProgressPanel(ttk.Frame):
             self._show_no_active_message()
         else:
             self._hide_no_active_message()
-        
-        # Schedule refresh berikutnya
-        self.after_id = self.after(REFRESH_INTERVAL, self._refresh_display)
     
     def _create_job_progress(self, job: FileJob):
         """
@@ -113,18 +150,17 @@ class ProgressPanel(ttk.Frame):
         header_frame = ttk.Frame(frame)
         header_frame.pack(fill='x')
         
-        name_label = ttk.Label(header_frame, text=f"🎬 {job.name}", font=('Arial', 9, 'bold'))
+        name_label = ttk.Label(header_frame, text=f"🎬 {job.name}", font=self._fonts.name)
         name_label.pack(side='left')
         
         # ===== SPEED LABEL DI HEADER (INi YANG DITAMBAHKAN) =====
-        speed_label = ttk.Label(header_frame, text="", font=('Arial', 8))
+        speed_label = ttk.Label(header_frame, text="", font=self._fonts.info)
         speed_label.pack(side='right', padx=5)
         
-        # Progress bar
-        progress_var = tk.DoubleVar(value=job.progress)
+        # Progress bar (value di-set langsung, tanpa DoubleVar + trace per job)
         progress_bar = ttk.Progressbar(
             frame, 
-            variable=progress_var,
+            value=job.progress,
             maximum=100,
             length=400,
             mode='determinate'
@@ -135,19 +171,26 @@ class ProgressPanel(ttk.Frame):
         info_frame = ttk.Frame(frame)
         info_frame.pack(fill='x')
         
-        size_label = ttk.Label(info_frame, text="", font=('Arial', 8))
+        size_label = ttk.Label(info_frame, text="", font=self._fonts.info)
         size_label.pack(side='left')
         
-        eta_label = ttk.Label(info_frame, text="", font=('Arial', 8))
+        eta_label = ttk.Label(info_frame, text="", font=self._fonts.info)
         eta_label.pack(side='right')
         
         # Simpan semua widget
         self.progress_bars[job.name] = {
             'frame': frame,
-            'progress_var': progress_var,
+            'progress_bar': progress_bar,
             'speed_label': speed_label,  # <-- SIMPAN SPEED LABEL
             'size_label': size_label,
-            'eta_label': eta_label
+            'eta_label': eta_label,
+            # Path Tcl widget, untuk tk.call langsung tanpa lewat Widget.configure
+            'progress_w': str(progress_bar),
+            'speed_w': str(speed_label),
+            'size_w': str(size_label),
+            'eta_w': str(eta_label),
+            'key': None,  # Angka bulat (progress, speed, eta, copied) saat terakhir di-format
+            'shown': None  # (progress, speed, size, eta) terakhir yang di-set ke widget
         }
         
         # Initial update
@@ -161,39 +204,60 @@ class ProgressPanel(ttk.Frame):
         if not widgets:
             return
         
-        # Update progress bar
-        widgets['progress_var'].set(job.progress)
+        # Bandingkan angka sesuai presisi tampilan dulu; format teks hanya jika ada yang berubah
+        speed_mbps = job.speed_mbps
+        eta_seconds = job.eta_seconds
+        key = (int(job.progress * 10), int(speed_mbps * 10), int(eta_seconds), int(job.copied_gb * 100))
+        if key == widgets['key']:
+            return
+        widgets['key'] = key
         
-        # ===== UPDATE SPEED DENGAN ICON =====
-        if job.speed_mbps > 0:
-            speed_text = f"{job.speed_mbps:.1f} MB/s"
+        # ===== SPEED DENGAN ICON =====
+        if speed_mbps > 0:
+            speed_text = f"{speed_mbps:.1f} MB/s"
             # Icon berdasarkan kecepatan
-            if job.speed_mbps > 40:
-                widgets['speed_label'].config(text=f"⚡ {speed_text}", foreground='#27ae60')  # Hijau (cepat)
-            elif job.speed_mbps > 10:
-                widgets['speed_label'].config(text=f"📊 {speed_text}", foreground='#2980b9')  # Biru (sedang)
+            if speed_mbps > 40:
+                speed = (f"⚡ {speed_text}", '#27ae60')  # Hijau (cepat)
+            elif speed_mbps > 10:
+                speed = (f"📊 {speed_text}", '#2980b9')  # Biru (sedang)
             else:
-                widgets['speed_label'].config(text=f"🐢 {speed_text}", foreground='#e67e22')  # Oranye (lambat)
+                speed = (f"🐢 {speed_text}", '#e67e22')  # Oranye (lambat)
         else:
-            widgets['speed_label'].config(text="")
+            speed = ("", '')
         
-        # Update size info
+        # Size info dan ETA
         size_text = f"{job.copied_gb:.2f} GB / {job.size_gb:.2f} GB ({job.progress:.1f}%)"
-        widgets['size_label'].config(text=size_text)
+        eta_text = f"ETA: {job.eta_formatted}" if eta_seconds > 0 else ""
         
-        # Update ETA
-        if job.eta_seconds > 0:
-            widgets['eta_label'].config(text=f"ETA: {job.eta_formatted}")
-        else:
-            widgets['eta_label'].config(text="")
+        # Setiap configure adalah round-trip ke Tcl: hanya set yang berubah, langsung lewat tk.call
+        call = self.tk.call
+        progress = round(job.progress, 1)
+        shown = widgets['shown'] or (None, None, None, None)
+        if progress != shown[0]:
+            call(widgets['progress_w'], 'configure', '-value', progress)
+        if speed != shown[1]:
+            call(widgets['speed_w'], 'configure', '-text', speed[0], '-foreground', speed[1])
+        if size_text != shown[2]:
+            call(widgets['size_w'], 'configure', '-text', size_text)
+        if eta_text != shown[3]:
+            call(widgets['eta_w'], 'configure', '-text', eta_text)
+        widgets['shown'] = (progress, speed, size_text, eta_text)
     
     def _destroy_job_widgets(self, job_name: str):
         """
         Hapus widget untuk job yang selesai
         """
-        widgets = self.progress_bars.get(job_name)
-        if widgets:
-            widgets['frame'].destroy()
+        widgets = self.progress_bars.pop(job_name, None)
+        if not widgets:
+            return
+        
+        # Destroy frame (ikut semua child), lalu lepas referensi Python ke widget-widget-nya
+        widgets['frame'].destroy()
+        widgets.clear()
+        
+        self._destroyed_count += 1
+        if self._destroyed_count % _GC_EVERY_DESTROYED == 0:
+            gc.collect()
     
     def _show_no_active_message(self):
         """Tampilkan pesan ketika tidak ada active downloads"""
@@ -203,7 +267,7 @@ class ProgressPanel(ttk.Frame):
         self.no_active_label = ttk.Label(
             self.scrollable_frame, 
             text="✨ Tidak ada file yang sedang di-download",
-            font=('Arial', 9, 'italic'),
+            font=self._fonts.empty,
             foreground='#666666'
         )
         self.no_active_label.pack(pady=20)
@@ -216,7 +280,6 @@ class ProgressPanel(ttk.Frame):
     
     def destroy(self):
         """Cleanup saat panel di-destroy"""
-        if self.after_id:
-            self.after_cancel(self.after_id)
-        self.canvas.unbind_all("<MouseWheel>")
+        self._cancel_refresh()
+        self._release_mousewheel()
         super().destroy()
\ No newline at end of file
@@ -8,9 +8,12 @@ from tkinter import ttk
 from typing import Optional
 from ..models.file_job import FileJob
 from ..core.queue_manager import QueueManager
-from ..constants.settings import REFRESH_INTERVAL
+from .panel_base import RefreshScheduleMixin
 
-class QueuePanel(ttk.LabelFrame):
+# Jumlah row berubah di atas ini: detach semua row dulu, pasang lagi sekaligus
+_BULK_ROW_CHANGES = 5
+
+class QueuePanel(RefreshScheduleMixin, ttk.LabelFrame):
     """
     Panel untuk menampilkan antrian download
     """
@@ -26,7 +29,10 @@ class QueuePanel(ttk.LabelFrame):
         super().__init__(parent, text="📋 Download Queue", padding=5)
         
         self.queue_manager = queue_manager
-        self.after_id = None
+        self._init_refresh()
+        
+        # Row yang sedang tampil: iid (job.name) -> (values, tags), urut sesuai tree
+        self._rows = {}
         
         self._create_widgets()
         self._refresh_display()
@@ -56,6 +62,9 @@ class QueuePanel(ttk.LabelFrame):
         self.tree.column('speed', width=80, anchor='center')  # <-- KOLOM BARU
         self.tree.column('eta', width=80, anchor='center')
         
+        # Warna untuk active jobs
+        self.tree.tag_configure('active', background='#e8f5e9')  # Hijau muda
+        
         # Scrollbar
         scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -76,38 +85,81 @@ class QueuePanel(ttk.LabelFrame):
     
     def _refresh_display(self):
         """Refresh tampilan queue"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._cancel_refresh()
         
         # Get jobs dari queue manager
         waiting_jobs = self.queue_manager.get_waiting_jobs()
         active_jobs = self.queue_manager.get_active_jobs()
         
-        # Hitung statistik
-        total_waiting = len(waiting_jobs)
-        total_active = len(active_jobs)
-        total_size = sum(job.size_gb for job in waiting_jobs + active_jobs)
-        
-     
-        # Tampilkan active jobs dulu (dengan warna hijau)
+        # Active jobs dulu (dengan warna hijau), lalu waiting jobs
+        row_values = self._job_row_values
+        rows = {}
         for job in active_jobs:
-            self._insert_job_row(job, 'active')
-        
-        # Tampilkan waiting jobs
+            rows[job.name] = (row_values(job, 'active'), ('active',))
         for job in waiting_jobs:
-            self._insert_job_row(job, 'waiting')
+            name = job.name
+            if name not in rows:
+                rows[name] = (row_values(job, 'waiting'), ())
+        
+        self._apply_rows(rows)
         
         # Schedule refresh berikutnya
-        self.after_id = self.after(REFRESH_INTERVAL, self._refresh_display)
+        self._schedule_refresh()
+    
+    def _apply_rows(self, rows: dict):
+        """
+        Samakan isi treeview dengan rows (hanya row yang berubah yang disentuh)
+        
+        Args:
+            rows: iid (job.name) -> (values, tags), urut sesuai tampilan
+        """
+        tree = self.tree
+        shown = self._rows
+        
+        # Hapus job yang sudah tidak ada di antrian
+        removed = [iid for iid in shown if iid not in rows]
+        if removed:
+            tree.delete(*removed)
+        
+        changed = [(iid, row, shown.get(iid)) for iid, row in rows.items() if shown.get(iid) != row]
+        
+        # Banyak perubahan (misal burst file baru): lepas semua row dari tampilan
+        # supaya treeview tidak menggambar ulang per insert, lalu pasang lagi di bawah
+        bulk = len(removed) + len(changed) > _BULK_ROW_CHANGES
+        if bulk:
+            children = tree.get_children()
+            if children:
+                tree.detach(*children)
+        
+        # Insert job baru, update row yang nilainya berubah
+        insert = tree.insert
+        item = tree.item
+        for iid, row, old in changed:
+            if old is None:
+                insert('', 'end', iid=iid, values=row[0], tags=row[1])
+            else:
+                item(iid, values=row[0], tags=row[1])
+        
+        # Pindahkan row hanya jika urutan berubah (misal job waiting menjadi active)
+        # atau row sedang di-detach
+        order = list(rows)
+        if bulk or order != [iid for iid in shown if iid in rows] + [iid for iid in rows if iid not in shown]:
+            move = tree.move
+            for index, iid in enumerate(order):
+                move(iid, '', index)
+        
+        self._rows = rows
     
-    def _insert_job_row(self, job: FileJob, status_type: str):
+    def _job_row_values(self, job: FileJob, status_type: str) -> tuple:
         """
-        Insert satu row ke treeview
+        Nilai kolom treeview untuk satu job
         
         Args:
             job: FileJob object
             status_type: 'active' atau 'waiting'
+            
+        Returns:
+            Tuple nilai kolom (priority, filename, size, status, progress, speed, eta)
         """
         # Format size
         size_str = f"{job.size_gb:.1f} GB"
@@ -140,8 +192,8 @@ class QueuePanel(ttk.LabelFrame):
             pos = job.queue_position or 0
             priority = str(pos)
         
-        # Insert row dengan semua kolom termasuk speed
-        item_id = self.tree.insert('', 'end', values=(
+        # Semua kolom termasuk speed
+        return (
             priority,
             job.name,
             size_str,
@@ -149,12 +201,7 @@ class QueuePanel(ttk.LabelFrame):
             progress_str,
             speed_str,  # <-- KOLOM SPEED SEKARANG TERISI
             eta_str
-        ))
-        
-        # Warna untuk active jobs
-        if status_type == 'active':
-            self.tree.tag_configure('active', background='#e8f5e9')  # Hijau muda
-            self.tree.item(item_id, tags=('active',))
+        )
     
     def _show_job_details(self, event):
         """Show detail job saat double-click"""
@@ -220,8 +267,7 @@ class QueuePanel(ttk.LabelFrame):
     
     def destroy(self):
         """Cleanup saat panel di-destroy"""
-        if self.after_id:
-            self.after_cancel(self.after_id)
+        self._cancel_refresh()
         super().destroy()
 
 
@@ -8,9 +8,10 @@ from tkinter import ttk
 from typing import Optional
 from ..models.upload_job import UploadJob
 from ..core.upload_manager import UploadManager
-from ..constants.settings import REFRESH_INTERVAL
+from .panel_base import RefreshScheduleMixin, ScrollableCanvasMixin
+from .fonts import job_fonts
 
-class UploadPanel40(ttk.Frame):
+class UploadPanel40(RefreshScheduleMixin, ScrollableCanvasMixin, ttk.Frame):
     """
     Panel untuk menampilkan upload ke server 40 (LOWRES) - PRIORITAS NORMAL
     """
@@ -26,9 +27,11 @@ class UploadPanel40(ttk.Frame):
         super().__init__(parent)
         
         self.upload_manager = upload_manager
-        self.after_id = None
+        self._init_refresh()
         self.progress_bars = {}  # Dictionary untuk menyimpan widget per job
         
+        self._fonts = job_fonts(self)
+        
         self._create_widgets()
         self._refresh_display()
     
@@ -83,6 +86,9 @@ class UploadPanel40(ttk.Frame):
         self.tree.column('speed', width=80, anchor='center')  # <-- KOLOM BARU
         self.tree.column('eta', width=80, anchor='center')
         
+        # Warna untuk active jobs (sekali di sini, bukan per row)
+        self.tree.tag_configure('active', background='#e8f5e9')  # Hijau muda
+        
         # Scrollbar untuk table
         scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -109,8 +115,7 @@ class UploadPanel40(ttk.Frame):
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         
-        # Bind mousewheel untuk scroll
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self._init_mousewheel()
         
         # Pack canvas dan scrollbar
         self.canvas.pack(side='left', fill='both', expand=True)
@@ -123,15 +128,13 @@ class UploadPanel40(ttk.Frame):
         """Handler saat canvas diresize"""
         self.canvas.itemconfig(1, width=event.width)
     
-    def _on_mousewheel(self, event):
-        """Handler untuk mousewheel scrolling"""
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-    
     def _refresh_display(self):
         """Refresh tampilan panel"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._cancel_refresh()
+        
+        # Clear tree (satu delete untuk semua row)
+        tree = self.tree
+        tree.delete(*tree.get_children())
         
         # Dapatkan jobs dari upload manager
         active_jobs = self.upload_manager.get_active_uploads_40()
@@ -152,7 +155,7 @@ class UploadPanel40(ttk.Frame):
         self._update_progress_bars(active_jobs)
         
         # Schedule refresh berikutnya
-        self.after_id = self.after(REFRESH_INTERVAL, self._refresh_display)
+        self._schedule_refresh()
     
     # ===== METHOD UNTUK INSERT QUEUE ROW =====
     def _insert_queue_row(self, job: UploadJob, status_type: str, position: int = 0):
@@ -183,7 +186,7 @@ class UploadPanel40(ttk.Frame):
             pos_display = str(position)
         
         # Insert row ke treeview
-        item_id = self.tree.insert('', 'end', values=(
+        self.tree.insert('', 'end', values=(
             pos_display,
             job.file_name,
             size_str,
@@ -191,12 +194,7 @@ class UploadPanel40(ttk.Frame):
             progress_str,
             speed_str,  # <-- KOLOM SPEED
             eta_str
-        ))
-        
-        # Warna untuk active jobs
-        if status_type == 'active':
-            self.tree.tag_configure('active', background='#e8f5e9')  # Hijau muda
-            self.tree.item(item_id, tags=('active',))
+        ), tags=('active',) if status_type == 'active' else ())
     
     def _update_progress_bars(self, active_jobs: list):
         """Update progress bars untuk active jobs"""
@@ -240,19 +238,18 @@ class UploadPanel40(ttk.Frame):
         name_label = ttk.Label(
             header_frame, 
             text=f"🎬 {job.file_name}", 
-            font=('Arial', 9, 'bold')
+            font=self._fonts.name
         )
         name_label.pack(side='left')
         
         # ===== SPEED LABEL DI HEADER =====
-        speed_label = ttk.Label(header_frame, text="", font=('Arial', 8), foreground='#27ae60')
+        speed_label = ttk.Label(header_frame, text="", font=self._fonts.info, foreground='#27ae60')
         speed_label.pack(side='right', padx=5)
         
-        # Progress bar
-        progress_var = tk.DoubleVar(value=job.progress)
+        # Progress bar (value di-set langsung, tanpa DoubleVar + trace per job)
         progress_bar = ttk.Progressbar(
             frame, 
-            variable=progress_var,
+            value=job.progress,
             maximum=100,
             length=400,
             mode='determinate'
@@ -263,16 +260,16 @@ class UploadPanel40(ttk.Frame):
         info_frame = ttk.Frame(frame)
         info_frame.pack(fill='x')
         
-        size_label = ttk.Label(info_frame, text="", font=('Arial', 8))
+        size_label = ttk.Label(info_frame, text="", font=self._fonts.info)
         size_label.pack(side='left')
         
-        eta_label = ttk.Label(info_frame, text="", font=('Arial', 8), foreground='#27ae60')
+        eta_label = ttk.Label(info_frame, text="", font=self._fonts.info, foreground='#27ae60')
         eta_label.pack(side='right')
         
         # Simpan semua widget
         self.progress_bars[job.file_name] = {
             'frame': frame,
-            'progress_var': progress_var,
+            'progress_bar': progress_bar,
             'speed_label': speed_label,  # <-- SIMPAN SPEED LABEL
             'size_label': size_label,
             'eta_label': eta_label
@@ -290,7 +287,7 @@ class UploadPanel40(ttk.Frame):
             return
         
         # Update progress bar
-        widgets['progress_var'].set(job.progress)
+        widgets['progress_bar'].configure(value=job.progress)
         
         # ===== UPDATE SPEED DENGAN ICON =====
         if job.speed_mbps > 0:
@@ -323,7 +320,7 @@ class UploadPanel40(ttk.Frame):
         self.no_active_label = ttk.Label(
             self.scrollable_frame, 
             text="✨ Tidak ada upload ke LOWRES (40) saat ini",
-            font=('Arial', 9, 'italic'),
+            font=self._fonts.empty,
             foreground='#666666'
         )
         self.no_active_label.pack(pady=10)
@@ -336,10 +333,8 @@ class UploadPanel40(ttk.Frame):
     
     def destroy(self):
         """Cleanup saat panel di-destroy"""
-        if self.after_id:
-            self.after_cancel(self.after_id)
-        # Unbind mousewheel
-        self.canvas.unbind_all("<MouseWheel>")
+        self._cancel_refresh()
+        self._release_mousewheel()
         super().destroy()
 
 
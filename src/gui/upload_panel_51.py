@@ -8,9 +8,10 @@ from tkinter import ttk
 from typing import Optional
 from ..models.upload_job import UploadJob
 from ..core.upload_manager import UploadManager
-from ..constants.settings import REFRESH_INTERVAL
+from .panel_base import RefreshScheduleMixin, ScrollableCanvasMixin
+from .fonts import job_fonts
 
-class UploadPanel51(ttk.Frame):
+class UploadPanel51(RefreshScheduleMixin, ScrollableCanvasMixin, ttk.Frame):
     """
     Panel untuk menampilkan upload ke server 51 (HIRES) - PRIORITAS ⭐ HIGH
     """
@@ -19,9 +20,11 @@ class UploadPanel51(ttk.Frame):
         super().__init__(parent)
         
         self.upload_manager = upload_manager
-        self.after_id = None
+        self._init_refresh()
         self.progress_bars = {}
         
+        self._fonts = job_fonts(self)
+        
         self._create_widgets()
         self._refresh_display()
     
@@ -75,6 +78,9 @@ class UploadPanel51(ttk.Frame):
         self.tree.column('speed', width=80, anchor='center')
         self.tree.column('eta', width=80, anchor='center')
         
+        # Warna untuk active jobs (sekali di sini, bukan per row)
+        self.tree.tag_configure('active', background='#fff3e0')  # Oranye muda
+        
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
@@ -100,7 +106,7 @@ class UploadPanel51(ttk.Frame):
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self._init_mousewheel()
         self.canvas.pack(side='left', fill='both', expand=True)
         self.scrollbar.pack(side='right', fill='y')
         
@@ -109,14 +115,13 @@ class UploadPanel51(ttk.Frame):
     def _on_canvas_configure(self, event):
         self.canvas.itemconfig(1, width=event.width)
     
-    def _on_mousewheel(self, event):
-        self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-    
     def _refresh_display(self):
         """Refresh tampilan panel"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._cancel_refresh()
+        
+        # Clear tree (satu delete untuk semua row)
+        tree = self.tree
+        tree.delete(*tree.get_children())
         
         # Dapatkan jobs dari upload manager
         active_jobs = self.upload_manager.get_active_uploads_51()
@@ -136,7 +141,7 @@ class UploadPanel51(ttk.Frame):
         # Update progress bars
         self._update_progress_bars(active_jobs)
         
-        self.after_id = self.after(REFRESH_INTERVAL, self._refresh_display)
+        self._schedule_refresh()
     
     # ===== METHOD BARU: _insert_queue_row =====
     def _insert_queue_row(self, job: UploadJob, status_type: str, position: int = 0):
@@ -166,7 +171,7 @@ class UploadPanel51(ttk.Frame):
             pos_display = str(position)
         
         # Insert row
-        item_id = self.tree.insert('', 'end', values=(
+        self.tree.insert('', 'end', values=(
             pos_display,
             job.file_name,
             size_str,
@@ -174,12 +179,7 @@ class UploadPanel51(ttk.Frame):
             progress_str,
             speed_str,
             eta_str
-        ))
-        
-        # Warna untuk active jobs
-        if status_type == 'active':
-            self.tree.tag_configure('active', background='#fff3e0')  # Oranye muda
-            self.tree.item(item_id, tags=('active',))
+        ), tags=('active',) if status_type == 'active' else ())
     
     def _update_progress_bars(self, active_jobs: list):
         """Update progress bars untuk active jobs"""
@@ -217,32 +217,31 @@ class UploadPanel51(ttk.Frame):
         header_frame = ttk.Frame(frame)
         header_frame.pack(fill='x')
         
-        name_label = ttk.Label(header_frame, text=f"⭐ {job.file_name}", font=('Arial', 9, 'bold'))
+        name_label = ttk.Label(header_frame, text=f"⭐ {job.file_name}", font=self._fonts.name)
         name_label.pack(side='left')
         
         # Speed label
-        speed_label = ttk.Label(header_frame, text="", font=('Arial', 8), foreground='#f39c12')
+        speed_label = ttk.Label(header_frame, text="", font=self._fonts.info, foreground='#f39c12')
         speed_label.pack(side='right', padx=5)
         
-        # Progress bar
-        progress_var = tk.DoubleVar(value=job.progress)
-        progress_bar = ttk.Progressbar(frame, variable=progress_var, maximum=100, mode='determinate')
+        # Progress bar (value di-set langsung, tanpa DoubleVar + trace per job)
+        progress_bar = ttk.Progressbar(frame, value=job.progress, maximum=100, mode='determinate')
         progress_bar.pack(fill='x', pady=2)
         
         # Info frame
         info_frame = ttk.Frame(frame)
         info_frame.pack(fill='x')
         
-        size_label = ttk.Label(info_frame, text="", font=('Arial', 8))
+        size_label = ttk.Label(info_frame, text="", font=self._fonts.info)
         size_label.pack(side='left')
         
-        eta_label = ttk.Label(info_frame, text="", font=('Arial', 8), foreground='#f39c12')
+        eta_label = ttk.Label(info_frame, text="", font=self._fonts.info, foreground='#f39c12')
         eta_label.pack(side='right')
         
         # Simpan widget
         self.progress_bars[job.file_name] = {
             'frame': frame,
-            'progress_var': progress_var,
+            'progress_bar': progress_bar,
             'speed_label': speed_label,
             'size_label': size_label,
             'eta_label': eta_label
@@ -257,7 +256,7 @@ class UploadPanel51(ttk.Frame):
             return
         
         # Update progress bar
-        widgets['progress_var'].set(job.progress)
+        widgets['progress_bar'].configure(value=job.progress)
         
         # Update speed dengan icon
         if job.speed_mbps > 0:
@@ -289,7 +288,7 @@ class UploadPanel51(ttk.Frame):
         self.no_active_label = ttk.Label(
             self.scrollable_frame,
             text="✨ Tidak ada upload ke HIRES (51) saat ini",
-            font=('Arial', 9, 'italic'),
+            font=self._fonts.empty,
             foreground='#666666'
         )
         self.no_active_label.pack(pady=10)
@@ -302,7 +301,6 @@ class UploadPanel51(ttk.Frame):
     
     def destroy(self):
         """Cleanup"""
-        if self.after_id:
-            self.after_cancel(self.after_id)
-        self.canvas.unbind_all("<MouseWheel>")
+        self._cancel_refresh()
+        self._release_mousewheel()
         super().destroy()
\ No newline at end of file
@@ -4,6 +4,8 @@ Model untuk merepresentasikan satu file yang akan diproses
 """
 
 import os
+import time
+import uuid
 import logging  # <-- TAMBAHKAN INI
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -23,13 +25,16 @@ class FileJob:
     dest_path: str
     size_bytes: int
     
+    # ID stabil untuk lookup (lebih murah dari perbandingan field-wise dataclass)
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    
     # Status dan progress
     status: str = STATUS_WAITING
     progress: float = 0.0  # 0-100
     copied_bytes: int = 0
     
-    # Timestamps
-    detected_time: datetime = field(default_factory=datetime.now)
+    # Timestamps (waktu deteksi disimpan sebagai epoch ns, datetime dibuat saat dibaca)
+    detected_time_ns: int = field(default_factory=time.time_ns)
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     
@@ -46,11 +51,37 @@ class FileJob:
     last_checkpoint: int = 0  # bytes yang sudah di-copy saat checkpoint terakhir
     checkpoints: List[int] = field(default_factory=list)  # daftar checkpoint yang sudah dicapai
     
+    # Integritas (dihitung saat copy, tanpa baca ulang file)
+    hash_algo: Optional[str] = None  # 'crc32', 'sha256', ... (None = tidak dihitung)
+    checksum: Optional[str] = None  # hex digest hasil copy
+    
+    # Cache hasil os.stat source dari worker (tidak disimpan ke state)
+    _src_stat: Optional[os.stat_result] = field(default=None, repr=False, compare=False)
+    # True jika file dipindah dengan rename (source sudah tidak ada, tidak perlu dihapus)
+    _moved: bool = field(default=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Validasi setelah inisialisasi"""
         if not self.name:
             self.name = os.path.basename(self.source_path)
     
+    @property
+    def detected_time(self) -> Optional[datetime]:
+        """Waktu file terdeteksi sebagai datetime (None jika belum diisi)"""
+        if not self.detected_time_ns:
+            return None
+        return datetime.fromtimestamp(self.detected_time_ns / 1e9)
+    
+    @detected_time.setter
+    def detected_time(self, value):
+        """Set waktu deteksi dari datetime / epoch detik / None"""
+        if value is None:
+            self.detected_time_ns = 0
+        elif isinstance(value, datetime):
+            self.detected_time_ns = int(value.timestamp() * 1e9)
+        else:
+            self.detected_time_ns = int(value * 1e9)
+    
     @property
     def size_gb(self) -> float:
         """Ukuran file dalam GB"""
@@ -142,6 +173,7 @@ class FileJob:
     def to_dict(self) -> dict:
         """Konversi ke dictionary untuk disimpan ke JSON"""
         return {
+            'job_id': self.job_id,
             'name': self.name,
             'source_path': self.source_path,
             'dest_path': self.dest_path,
@@ -158,22 +190,24 @@ class FileJob:
             'max_retry': self.max_retry,
             'last_error': self.last_error,
             'last_checkpoint': self.last_checkpoint,
-            'checkpoints': self.checkpoints
+            'checkpoints': self.checkpoints,
+            'hash_algo': self.hash_algo,
+            'checksum': self.checksum
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'FileJob':
         """Buat FileJob dari dictionary"""
         # Parse datetime dengan handle untuk float/int
-        detected_time = None
+        detected_time_ns = 0
         if data.get('detected_time'):
             try:
                 if isinstance(data['detected_time'], (int, float)):
-                    detected_time = datetime.fromtimestamp(data['detected_time'])
+                    detected_time_ns = int(data['detected_time'] * 1e9)
                 else:
-                    detected_time = datetime.fromisoformat(data['detected_time'])
+                    detected_time_ns = int(datetime.fromisoformat(data['detected_time']).timestamp() * 1e9)
             except:
-                detected_time = datetime.now()
+                detected_time_ns = time.time_ns()
         
         start_time = None
         if data.get('start_time'):
@@ -200,10 +234,11 @@ class FileJob:
             source_path=data['source_path'],
             dest_path=data['dest_path'],
             size_bytes=data['size_bytes'],
+            job_id=data.get('job_id') or uuid.uuid4().hex,
             status=data.get('status', STATUS_WAITING),
             progress=data.get('progress', 0),
             copied_bytes=data.get('copied_bytes', 0),
-            detected_time=detected_time,
+            detected_time_ns=detected_time_ns,
             start_time=start_time,
             end_time=end_time,
             queue_position=data.get('queue_position'),
@@ -212,5 +247,7 @@ class FileJob:
             max_retry=data.get('max_retry', 3),
             last_error=data.get('last_error'),
             last_checkpoint=data.get('last_checkpoint', 0),
-            checkpoints=data.get('checkpoints', [])
+            checkpoints=data.get('checkpoints', []),
+            hash_algo=data.get('hash_algo'),
+            checksum=data.get('checksum')
         )
\ No newline at end of file
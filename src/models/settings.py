@@ -3,12 +3,14 @@
 Model untuk menyimpan konfigurasi aplikasi
 """
 
+import hashlib
 from dataclasses import dataclass, field
 from typing import List, Tuple
 from ..constants.settings import (
     DEFAULT_MAX_DOWNLOAD, DEFAULT_MAX_RETRY, 
     DEFAULT_EXTENSIONS,
-    DEFAULT_MAX_UPLOAD_51, DEFAULT_MAX_UPLOAD_40
+    DEFAULT_MAX_UPLOAD_51, DEFAULT_MAX_UPLOAD_40,
+    IO_BUFFER_SIZE
 )
 
 @dataclass
@@ -33,6 +35,10 @@ class Settings:
     max_upload_40: int = DEFAULT_MAX_UPLOAD_40
     max_retry: int = DEFAULT_MAX_RETRY
     
+    # Copy settings (sesuaikan dengan MTU / credit SMB)
+    io_buffer_size: int = IO_BUFFER_SIZE
+    hash_algo: str = ""  # Checksum saat copy: "", "crc32", "sha256", ...
+    
     def validate(self) -> Tuple[bool, str]:
         """Validasi settings"""
         if not self.source_folders:
@@ -62,6 +68,12 @@ class Settings:
         if self.max_retry < 0 or self.max_retry > 5:
             return False, "Max retry harus antara 0-5"
         
+        if self.io_buffer_size < 64 * 1024 or self.io_buffer_size > 64 * 1024 * 1024:
+            return False, "IO buffer size harus antara 64KB-64MB"
+        
+        if self.hash_algo and self.hash_algo != 'crc32' and self.hash_algo not in hashlib.algorithms_available:
+            return False, f"Hash algorithm tidak dikenal: {self.hash_algo}"
+        
         return True, "Settings valid"
     
     def to_dict(self) -> dict:
@@ -75,7 +87,9 @@ class Settings:
             'max_download': self.max_download,
             'max_upload_51': self.max_upload_51,
             'max_upload_40': self.max_upload_40,
-            'max_retry': self.max_retry
+            'max_retry': self.max_retry,
+            'io_buffer_size': self.io_buffer_size,
+            'hash_algo': self.hash_algo
         }
     
     @classmethod
@@ -90,7 +104,9 @@ class Settings:
             max_download=data.get('max_download', DEFAULT_MAX_DOWNLOAD),
             max_upload_51=data.get('max_upload_51', DEFAULT_MAX_UPLOAD_51),
             max_upload_40=data.get('max_upload_40', DEFAULT_MAX_UPLOAD_40),
-            max_retry=data.get('max_retry', DEFAULT_MAX_RETRY)
+            max_retry=data.get('max_retry', DEFAULT_MAX_RETRY),
+            io_buffer_size=data.get('io_buffer_size', IO_BUFFER_SIZE),
+            hash_algo=data.get('hash_algo', "")
         )
     
     def add_source_folder(self, folder: str) -> bool:
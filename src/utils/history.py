@@ -53,7 +53,8 @@ class HistoryLogger:
     
 # ===== LOG SUCCESS DENGAN DESTINATION =====
     def log_success(self, filename: str, size_bytes: int, duration_seconds: float, 
-                   retry_count: int = 0, destination: str = "70"):
+                   retry_count: int = 0, destination: str = "70",
+                   checksum: Optional[str] = None, hash_algo: Optional[str] = None):
         """
         Catat file yang sukses di-copy
         
@@ -63,8 +64,11 @@ class HistoryLogger:
             duration_seconds: Durasi copy dalam detik
             retry_count: Jumlah retry
             destination: Tujuan (70, 51, 40) - BARU!
+            checksum: Hex digest hasil copy (optional)
+            hash_algo: Nama algoritma checksum (optional)
         """
-        self._log_entry(filename, size_bytes, "SUCCESS", duration_seconds, retry_count, destination)
+        self.write_lines([self.format_success(filename, size_bytes, duration_seconds, retry_count,
+                                              destination, checksum, hash_algo)])
     
     # ===== LOG FAILED DENGAN DESTINATION =====
     def log_failed(self, filename: str, size_bytes: int, error_msg: str, 
@@ -79,47 +83,76 @@ class HistoryLogger:
             retry_count: Jumlah retry
             destination: Tujuan (70, 51, 40) - BARU!
         """
-        self._log_entry(filename, size_bytes, "FAILED", 0, retry_count, destination, error_msg)
+        self.write_lines([self.format_failed(filename, size_bytes, error_msg, retry_count, destination)])
     
-    # ===== UPDATE METHOD _log_entry DENGAN DESTINATION =====
-    def _log_entry(self, filename: str, size_bytes: int, status: str, 
-                   duration_seconds: float = 0, retry_count: int = 0, 
-                   destination: str = "70", error_msg: Optional[str] = None):
+    def format_success(self, filename: str, size_bytes: int, duration_seconds: float,
+                       retry_count: int = 0, destination: str = "70",
+                       checksum: Optional[str] = None, hash_algo: Optional[str] = None) -> str:
+        """Format entry sukses tanpa menulis ke file (untuk ditulis batch)"""
+        return self._format_entry(filename, size_bytes, "SUCCESS", duration_seconds, retry_count, destination,
+                                  checksum=checksum, hash_algo=hash_algo)
+    
+    def format_failed(self, filename: str, size_bytes: int, error_msg: str,
+                      retry_count: int = 3, destination: str = "70") -> str:
+        """Format entry gagal tanpa menulis ke file (untuk ditulis batch)"""
+        return self._format_entry(filename, size_bytes, "FAILED", 0, retry_count, destination, error_msg)
+    
+    def write_lines(self, lines: List[str]):
         """
-        Internal method untuk menulis entry ke history
+        Tulis beberapa entry sekaligus dengan satu kali append
+        
+        Args:
+            lines: List entry hasil format_success / format_failed
         """
+        if not lines:
+            return
+        
         try:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            size_gb = size_bytes / (1024**3)
-            
-            # Format durasi
-            if duration_seconds > 0:
-                hours = int(duration_seconds // 3600)
-                minutes = int((duration_seconds % 3600) // 60)
-                seconds = int(duration_seconds % 60)
-                duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            else:
-                duration_str = "-"
-            
-            # Potong filename jika terlalu panjang
-            display_filename = filename if len(filename) <= 38 else filename[:35] + "..."
-            
-            # ===== FORMAT LINE DENGAN DESTINATION =====
-            line = f"{timestamp:<20} {display_filename:<40} {size_gb:>11.2f} GB {status:<10} {duration_str:<10} {retry_count:<5} {destination:<5}\n"
-            
-            # Tambah error message jika ada
-            if error_msg:
-                line += f"{' ':<20} {'ERROR:':<40} {error_msg}\n"
-            
-            # Tulis ke file
             with open(self.history_path, 'a', encoding='utf-8') as f:
-                f.write(line)
+                f.write(''.join(lines))
             
-            logger.debug(f"History logged: {filename} - {status} - Dest: {destination}")
+            logger.debug(f"History logged: {len(lines)} entries")
             
         except Exception as e:
             logger.error(f"Error writing to history: {e}")
     
+    # ===== UPDATE METHOD _format_entry DENGAN DESTINATION =====
+    def _format_entry(self, filename: str, size_bytes: int, status: str, 
+                      duration_seconds: float = 0, retry_count: int = 0, 
+                      destination: str = "70", error_msg: Optional[str] = None,
+                      checksum: Optional[str] = None, hash_algo: Optional[str] = None) -> str:
+        """
+        Internal method untuk membentuk entry history (satu baris + baris lanjutan)
+        """
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        size_gb = size_bytes / (1024**3)
+        
+        # Format durasi
+        if duration_seconds > 0:
+            hours = int(duration_seconds // 3600)
+            minutes = int((duration_seconds % 3600) // 60)
+            seconds = int(duration_seconds % 60)
+            duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        else:
+            duration_str = "-"
+        
+        # Potong filename jika terlalu panjang
+        display_filename = filename if len(filename) <= 38 else filename[:35] + "..."
+        
+        # ===== FORMAT LINE DENGAN DESTINATION =====
+        line = f"{timestamp:<20} {display_filename:<40} {size_gb:>11.2f} GB {status:<10} {duration_str:<10} {retry_count:<5} {destination:<5}\n"
+        
+        # Tambah error message jika ada
+        if error_msg:
+            line += f"{' ':<20} {'ERROR:':<40} {error_msg}\n"
+        
+        # Tambah checksum jika ada (baris lanjutan, dilewati parser seperti baris ERROR)
+        if checksum:
+            label = f"{(hash_algo or 'CHECKSUM').upper()}:"
+            line += f"{' ':<20} {label:<40} {checksum}\n"
+        
+        return line
+    
     def get_recent(self, limit: int = 10) -> List[str]:
         """
         Ambil history terbaru
@@ -1,8 +1,13 @@
 # src/utils/path_utils.py
 import os
 import sys
+import logging
+import threading
+import subprocess
 from ..constants.settings import DATA_FOLDER
 
+logger = logging.getLogger(__name__)
+
 def get_base_path() -> str:
     if getattr(sys, 'frozen', False):
         return os.path.dirname(sys.executable)
@@ -29,4 +34,30 @@ def ensure_data_folder():
     """Memastikan folder data ada"""
     data_path = get_data_path()
     os.makedirs(data_path, exist_ok=True)
-    return data_path
\ No newline at end of file
+    return data_path
+
+def open_file(path: str) -> threading.Thread:
+    """
+    Buka file dengan aplikasi default OS di thread terpisah
+    
+    os.startfile / xdg-open bisa tertahan beberapa saat (aktivasi shell, scan antivirus),
+    jadi tidak dijalankan di thread Tk. Error hanya di-log (thread ini tidak boleh menyentuh Tk).
+    
+    Args:
+        path: Path file yang dibuka
+        
+    Returns:
+        Thread launcher (daemon, sudah di-start)
+    """
+    def _launch():
+        try:
+            if os.name == 'nt':
+                os.startfile(path)
+            else:
+                subprocess.call(['xdg-open', path])
+        except Exception as e:
+            logger.error(f"Error opening file {path}: {e}")
+    
+    thread = threading.Thread(target=_launch, daemon=True, name="OpenFile")
+    thread.start()
+    return thread
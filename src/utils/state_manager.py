@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """
 Manager untuk menyimpan state aplikasi (resume capability)
+
+State ditulis dengan orjson jika tersedia (jauh lebih cepat dari json bawaan).
+Isinya tetap JSON biasa (UTF-8, tanpa indentasi), jadi ekstensi .json tidak berubah
+dan file tetap bisa dibaca dengan json bawaan.
 """
 
 import json
@@ -12,6 +16,11 @@ from ..models.file_job import FileJob
 from ..constants.settings import STATE_FILE
 from .path_utils import get_data_path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class StateManager:
@@ -53,8 +62,12 @@ class StateManager:
             return self.state
         
         try:
-            with open(self.state_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(self.state_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             self.state.update(data)
             logger.info(f"State loaded from: {self.state_path}")
@@ -64,41 +77,67 @@ class StateManager:
             logger.error(f"Error loading state: {e}")
             return self.state
     
-    def save(self, jobs: List[FileJob] = None) -> bool:
+    def build_snapshot(self, jobs: List[FileJob] = None) -> Dict:
         """
-        Save state ke file
+        Update state di memory lalu ambil salinannya (cepat, tanpa IO)
         
         Args:
             jobs: List of FileJob objects (optional)
             
         Returns:
-            True jika berhasil, False jika gagal
+            Salinan state yang aman ditulis dari thread lain
         """
-        try:
-            self.state['last_update'] = datetime.now().isoformat()
+        self.state['last_update'] = datetime.now().isoformat()
+        
+        if jobs is not None:
+            jobs_dict = {}
+            active = []
+            queue = []
+            
+            for i, job in enumerate(jobs):
+                jobs_dict[job.name] = job.to_dict()
+                if job.status in ['downloading', 'waiting']:
+                    if job.status == 'downloading':
+                        active.append(job.name)
+                    else:
+                        queue.append(job.name)
             
-            if jobs is not None:
-                jobs_dict = {}
-                active = []
-                queue = []
-                
-                for i, job in enumerate(jobs):
-                    jobs_dict[job.name] = job.to_dict()
-                    if job.status in ['downloading', 'waiting']:
-                        if job.status == 'downloading':
-                            active.append(job.name)
-                        else:
-                            queue.append(job.name)
-                
-                self.state['jobs'] = jobs_dict
-                self.state['active_downloads'] = active
-                self.state['queue'] = queue
+            self.state['jobs'] = jobs_dict
+            self.state['active_downloads'] = active
+            self.state['queue'] = queue
+        
+        snapshot = dict(self.state)
+        snapshot['jobs'] = dict(self.state['jobs'])
+        snapshot['active_downloads'] = list(self.state['active_downloads'])
+        snapshot['queue'] = list(self.state['queue'])
+        return snapshot
+    
+    def write_snapshot(self, snapshot: Dict) -> bool:
+        """
+        Tulis snapshot ke file secara atomic (tulis ke .tmp lalu os.replace)
+        
+        Args:
+            snapshot: Dictionary dari build_snapshot()
             
+        Returns:
+            True jika berhasil, False jika gagal
+        """
+        tmp_path = self.state_path + '.tmp'
+        try:
             # Buat folder data jika belum ada
             os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
             
-            with open(self.state_path, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=4, ensure_ascii=False)
+            if orjson is not None:
+                payload = orjson.dumps(snapshot)
+            else:
+                payload = json.dumps(snapshot, ensure_ascii=False).encode('utf-8')
+            
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            os.replace(tmp_path, self.state_path)
             
             logger.info(f"State saved to: {self.state_path}")
             return True
@@ -107,6 +146,24 @@ class StateManager:
             logger.error(f"Error saving state: {e}")
             return False
     
+    def save(self, jobs: List[FileJob] = None) -> bool:
+        """
+        Save state ke file (sinkron)
+        
+        Args:
+            jobs: List of FileJob objects (optional)
+            
+        Returns:
+            True jika berhasil, False jika gagal
+        """
+        try:
+            snapshot = self.build_snapshot(jobs)
+        except Exception as e:
+            logger.error(f"Error saving state: {e}")
+            return False
+        
+        return self.write_snapshot(snapshot)
+    
     def update_job(self, job: FileJob) -> bool:
         """
         Update satu job dalam state